@@ -0,0 +1,101 @@
+"""
+Benchmark: legacy embed_texts vs length-bucketed float32 path.
+
+Embeds a ticker's full 10-K chunks plus all narrated structured reports
+(exactly what index_all_data sends to the embedder) and reports throughput
+and peak Python-heap memory (tracemalloc, which also tracks NumPy buffers).
+
+The embedding cache is bypassed so both variants do the same model work.
+
+Usage:
+    cd RAG
+    python -m src.benchmarks.bench_embed_texts AAPL
+    python -m src.benchmarks.bench_embed_texts AAPL --batch-size 64 --repeat 3
+"""
+
+import argparse
+import time
+import tracemalloc
+from pathlib import Path
+
+from src import jsonl
+from src.control_plane.config import BASE_DATA_DIR, EMBEDDING_BATCH_SIZE
+from src.indexing.chunking import chunk_document
+from src.embeddings import embedding_provider
+
+
+def load_texts(ticker: str) -> list[str]:
+    """Collect the chunk and financial-summary texts indexed for a ticker."""
+    base = Path(BASE_DATA_DIR) / ticker
+    texts: list[str] = []
+
+    doc_path = base / "unstructured" / "data.jsonl"
+    if jsonl.exists(doc_path):
+        texts.extend(c["text"] for c in chunk_document(jsonl.read_bundle(doc_path)))
+
+    grouped: dict[tuple, list[str]] = {}
+    components = {p.with_suffix(".jsonl") for p in (base / "structured").glob("*.json*")}
+    for path in sorted(components):
+        for record in jsonl.iter_records(path):
+            meta = record["metadata"]
+            grouped.setdefault((meta["report_type"], meta["date"]), []).append(record["text"])
+    texts.extend("\n".join(parts) for parts in grouped.values())
+
+    return texts
+
+
+def legacy_embed(texts: list[str]) -> list:
+    """The original implementation: one encode call, then nested lists."""
+    model = embedding_provider._load_model()
+    return model.encode(texts).tolist()
+
+
+def bucketed_embed(texts: list[str], batch_size: int):
+    return embedding_provider._encode(texts, batch_size)
+
+
+def measure(fn, repeat: int) -> tuple[float, int]:
+    """Best wall time over `repeat` runs and peak traced bytes of the last run."""
+    best = float("inf")
+    peak = 0
+    for _ in range(repeat):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del result
+        best = min(best, elapsed)
+    return best, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark embed_texts variants")
+    parser.add_argument("ticker", help="Ticker with data already on disk")
+    parser.add_argument("--batch-size", type=int, default=EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args()
+
+    texts = load_texts(args.ticker.upper())
+    if not texts:
+        print(f"No indexed texts found for {args.ticker} under {BASE_DATA_DIR}")
+        return
+
+    print(f"Loaded {len(texts)} texts ({sum(map(len, texts)):,} chars)")
+    embedding_provider._load_model().encode(texts[:4])  # warm up model and tokenizer
+
+    rows = [
+        ("legacy encode().tolist()", lambda: legacy_embed(texts)),
+        (f"bucketed float32 (bs={args.batch_size})", lambda: bucketed_embed(texts, args.batch_size)),
+    ]
+
+    print(f"\n{'variant':<36} {'seconds':>9} {'texts/s':>9} {'peak MiB':>9}")
+    print("-" * 66)
+    for name, fn in rows:
+        seconds, peak = measure(fn, args.repeat)
+        print(f"{name:<36} {seconds:>9.2f} {len(texts) / seconds:>9.1f} {peak / 2**20:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""
+Benchmark: embedding backends (parity, query latency, bulk throughput).
+
+For every backend, embeds the same corpus and reports:
+- parity: cosine similarity of each vector against the torch fp32 vector
+  (mean and worst case); a backend passes when the minimum is >= --min-cosine
+- query latency: p50/p95 of single-query embed_query-style calls
+- throughput: texts/s for the whole corpus in length-bucketed batches
+
+Usage:
+    cd RAG
+    python -m src.benchmarks.bench_embedding_backends AAPL
+    python -m src.benchmarks.bench_embedding_backends AAPL --backends torch onnx-int8
+"""
+
+import argparse
+import statistics
+import time
+
+import numpy as np
+
+from src.control_plane.config import EMBEDDING_BATCH_SIZE
+from src.embeddings.embedding_provider import EMBEDDING_BACKENDS, build_model
+from src.benchmarks.bench_embed_texts import load_texts
+
+SAMPLE_QUERIES = [
+    "What was the Net Income in 2024?",
+    "What are the recent risk factors mentioned in the 10-K?",
+    "Revenue trends over the last four quarters",
+    "How much cash did operating activities generate?",
+    "risk factors",
+]
+
+
+def encode_corpus(model, texts: list[str], batch_size: int) -> np.ndarray:
+    """Length-sorted batched encode, rows returned in input order."""
+    order = np.argsort([-len(t) for t in texts], kind="stable")
+    out = np.empty((len(texts), model.get_sentence_embedding_dimension()), dtype=np.float32)
+    for start in range(0, len(texts), batch_size):
+        idx = order[start:start + batch_size]
+        out[idx] = model.encode([texts[i] for i in idx], batch_size=batch_size, show_progress_bar=False)
+    return out
+
+
+def cosine_rows(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Row-wise cosine similarity of two equally shaped matrices."""
+    a = a / np.linalg.norm(a, axis=1, keepdims=True)
+    b = b / np.linalg.norm(b, axis=1, keepdims=True)
+    return np.einsum("ij,ij->i", a, b)
+
+
+def query_latencies(model, rounds: int) -> list[float]:
+    latencies = []
+    for _ in range(rounds):
+        for q in SAMPLE_QUERIES:
+            start = time.perf_counter()
+            model.encode(q)
+            latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare embedding backends")
+    parser.add_argument("ticker", help="Ticker with data already on disk")
+    parser.add_argument("--backends", nargs="+", default=list(EMBEDDING_BACKENDS), choices=EMBEDDING_BACKENDS)
+    parser.add_argument("--batch-size", type=int, default=EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--query-rounds", type=int, default=20)
+    parser.add_argument("--min-cosine", type=float, default=0.99)
+    args = parser.parse_args()
+
+    texts = load_texts(args.ticker.upper())
+    if not texts:
+        print(f"No indexed texts found for {args.ticker}")
+        return
+    queries = SAMPLE_QUERIES * 4
+    print(f"Corpus: {len(texts)} texts, {len(queries)} parity queries")
+
+    reference = build_model("torch")
+    ref_corpus = encode_corpus(reference, texts, args.batch_size)
+    ref_queries = reference.encode(queries, show_progress_bar=False)
+    del reference
+
+    print(f"\n{'backend':<12} {'load s':>7} {'cos mean':>9} {'cos min':>8} {'parity':>7} "
+          f"{'q p50 ms':>9} {'q p95 ms':>9} {'texts/s':>9}")
+    print("-" * 80)
+
+    for backend in args.backends:
+        start = time.perf_counter()
+        try:
+            model = build_model(backend)
+        except Exception as e:
+            print(f"{backend:<12} unavailable: {e}")
+            continue
+        load_s = time.perf_counter() - start
+
+        model.encode(texts[:4])  # warm up
+        start = time.perf_counter()
+        corpus = encode_corpus(model, texts, args.batch_size)
+        throughput = len(texts) / (time.perf_counter() - start)
+
+        cos = np.concatenate([
+            cosine_rows(corpus, ref_corpus),
+            cosine_rows(model.encode(queries, show_progress_bar=False), ref_queries),
+        ])
+        latencies = sorted(query_latencies(model, args.query_rounds))
+        p95 = latencies[int(0.95 * (len(latencies) - 1))]
+        parity = "ok" if cos.min() >= args.min_cosine else "FAIL"
+
+        print(f"{backend:<12} {load_s:>7.2f} {cos.mean():>9.5f} {cos.min():>8.5f} {parity:>7} "
+              f"{statistics.median(latencies):>9.2f} {p95:>9.2f} {throughput:>9.1f}")
+        del model
+
+
+if __name__ == "__main__":
+    main()
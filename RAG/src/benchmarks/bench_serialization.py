@@ -0,0 +1,176 @@
+"""
+Benchmark: row-wise (iterrows) vs column-wise structured-data serialization.
+
+Serializes the given tickers' partitions of the structured dataset, or
+synthetic yfinance-shaped frames (price: ~63 trading days x OHLCV columns,
+statements: a few periods x many line items) written to a throwaway
+dataset when no tickers are given. Both implementations must produce
+identical documents; the run aborts on the first mismatch. Also times
+per-file reads (serialize_many) against one dataset scan per report type
+(serialize_dataset).
+
+Usage:
+    cd RAG
+    python -m src.benchmarks.bench_serialization
+    python -m src.benchmarks.bench_serialization AAPL MSFT --repeat 20
+"""
+
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from src.control_plane.config import BASE_DATA_DIR
+from src.structured.data_serialization import serialize_dataset, serialize_frame, serialize_many
+from src.structured.dataset import partition_dir, to_ticker_frame, write_report
+
+REPORT_TYPES = ["price", "income_stmt", "balance_sheet", "cash_flow", "info"]
+
+
+def legacy_serialize(df: pd.DataFrame) -> list[dict]:
+    """The original seralize_paraquet body: one Series per row via iterrows."""
+    docs = []
+
+    ticker = df["_meta_ticker"].iloc[0]
+    report_type = df["_meta_report_type"].iloc[0]
+    source = df["_meta_source"].iloc[0]
+    fetched_at = df["_meta_fetched_at"].iloc[0]
+
+    for index, row in df.iterrows():
+        content_data = row.drop([c for c in row.index if c.startswith("_meta")])
+
+        if "Date" in row and pd.notna(row["Date"]):
+            date_str = str(row["Date"])
+        else:
+            date_str = "As of fetch time"
+
+        text_parts = [
+            f"Financial Report for {ticker} ({report_type}) on {date_str}:"
+        ]
+
+        for col, val in content_data.items():
+            if pd.isna(val):
+                continue
+
+            if isinstance(val, (int, float)) and abs(val) > 1_000_000:
+                val_str = f"{val:.0f}"
+            else:
+                val_str = str(val)
+
+            text_parts.append(f"- {col}: {val_str}")
+
+        docs.append({
+            "id": f"{ticker}_{report_type}_{index}",
+            "text": "\n".join(text_parts),
+            "metadata": {
+                "ticker": ticker,
+                "report_type": report_type,
+                "date": date_str,
+                "source": source,
+                "fetched_at": fetched_at
+            }
+        })
+
+    return docs
+
+
+def _with_meta(df: pd.DataFrame, ticker: str, report_type: str) -> pd.DataFrame:
+    df["_meta_ticker"] = ticker
+    df["_meta_report_type"] = report_type
+    df["_meta_source"] = "yfinance"
+    df["_meta_fetched_at"] = "2024-06-28T21:00:00+00:00"
+    df["_meta_data_version"] = "v1.0"
+    return df
+
+
+def synthetic_frames(ticker: str, rng: np.random.Generator) -> dict[str, pd.DataFrame]:
+    """Frames shaped like fetch_and_store_stock_data output."""
+    days = pd.bdate_range("2024-04-01", periods=63, tz="America/New_York")
+    close = 100 + rng.standard_normal(len(days)).cumsum()
+    price = pd.DataFrame({
+        "Date": days,
+        "Open": close + rng.standard_normal(len(days)),
+        "High": close + 2,
+        "Low": close - 2,
+        "Close": close,
+        "Volume": rng.integers(10_000_000, 90_000_000, len(days)),
+        "Dividends": 0.0,
+        "Stock Splits": 0.0,
+    })
+
+    periods = pd.to_datetime(["2023-09-30", "2022-09-30", "2021-09-30", "2020-09-30"])
+    items = [f"Line Item {i}" for i in range(40)]
+    values = rng.standard_normal((len(periods), len(items))) * 1e9
+    values[rng.random(values.shape) < 0.1] = np.nan
+    statement = pd.DataFrame(values, columns=items)
+    statement.insert(0, "Date", periods)
+
+    return {
+        "price": _with_meta(price, ticker, "price"),
+        "income_stmt": _with_meta(statement.copy(), ticker, "income_stmt"),
+        "balance_sheet": _with_meta(statement.copy(), ticker, "balance_sheet"),
+        "cash_flow": _with_meta(statement.copy(), ticker, "cash_flow"),
+    }
+
+
+def best_of(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark structured-data serialization")
+    parser.add_argument("tickers", nargs="*", help="Tickers with parquet data on disk (default: synthetic)")
+    parser.add_argument("--synthetic-tickers", type=int, default=20)
+    parser.add_argument("--repeat", type=int, default=10)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        if args.tickers:
+            base_dir, tickers = Path(BASE_DATA_DIR), [t.upper() for t in args.tickers]
+            paths = [
+                p for t in tickers for rt in REPORT_TYPES
+                for p in sorted(partition_dir(rt, t, base_dir).rglob("part-*.parquet"))
+            ]
+        else:
+            base_dir, tickers = Path(tmp), None
+            rng = np.random.default_rng(0)
+            paths = [
+                write_report(df, report_type, f"T{i:03d}", base_dir)
+                for i in range(args.synthetic_tickers)
+                for report_type, df in synthetic_frames(f"T{i:03d}", rng).items()
+            ]
+
+        if not paths:
+            print(f"No structured dataset files found for {args.tickers} under {BASE_DATA_DIR}")
+            return
+
+        frames = [to_ticker_frame(pq.read_table(p)) for p in paths]
+        for path, df in zip(paths, frames):
+            if legacy_serialize(df) != serialize_frame(df):
+                raise SystemExit(f"Output mismatch for {path}")
+
+        rows = sum(len(df) for df in frames)
+        print(f"{len(paths)} files, {rows} rows; outputs identical\n")
+        print(f"{'variant':<34} {'ms':>9} {'rows/s':>11}")
+        print("-" * 56)
+        for name, fn in [
+            ("legacy iterrows (in memory)", lambda: [legacy_serialize(df) for df in frames]),
+            ("column-wise (in memory)", lambda: [serialize_frame(df) for df in frames]),
+            ("serialize_many (read + serialize)", lambda: serialize_many(paths)),
+            ("serialize_dataset (one scan/type)", lambda: [serialize_dataset(rt, tickers, base_dir=base_dir) for rt in REPORT_TYPES]),
+        ]:
+            seconds = best_of(fn, args.repeat)
+            print(f"{name:<34} {seconds * 1000:>9.1f} {rows / seconds:>11.0f}")
+
+
+if __name__ == "__main__":
+    main()
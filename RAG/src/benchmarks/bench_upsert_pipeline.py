@@ -0,0 +1,100 @@
+"""
+Benchmark: serial embed-then-upsert vs the pipelined indexer.
+
+Runs against LatencyIndex, a local stand-in for the Pinecone data plane that
+sleeps for a round trip plus payload transfer time on each upsert, so results
+need no API key and do not write to a real namespace. Embedding is real
+(embed_texts on a ticker's indexed texts), with the embedding cache bypassed.
+
+Usage:
+    cd RAG
+    python -m src.benchmarks.bench_upsert_pipeline AAPL
+    python -m src.benchmarks.bench_upsert_pipeline AAPL --rtt-ms 120 --mbps 20 --in-flight 8
+"""
+
+import argparse
+import json
+import threading
+import time
+
+from src.control_plane.config import PINECONE_UPSERT_CONCURRENCY
+from src.embeddings import embedding_provider
+from src.indexing.pipeline import UpsertPipeline
+from src.benchmarks.bench_embed_texts import load_texts
+
+LEGACY_BATCH_SIZE = 32
+
+
+class LatencyIndex:
+    """In-process stand-in for a remote index: each upsert costs RTT + bytes / bandwidth."""
+
+    def __init__(self, rtt_ms: float, mbps: float):
+        self.rtt = rtt_ms / 1000
+        self.bytes_per_s = mbps * 1e6 / 8
+        self.requests = 0
+        self.vectors = 0
+        self.sent_bytes = 0
+        self._lock = threading.Lock()
+
+    def upsert(self, vectors, namespace):
+        size = len(json.dumps({"vectors": vectors, "namespace": namespace}))
+        time.sleep(self.rtt + size / self.bytes_per_s)
+        with self._lock:
+            self.requests += 1
+            self.vectors += len(vectors)
+            self.sent_bytes += size
+
+
+def rows_for(texts: list[str]) -> list[tuple[str, str, dict]]:
+    return [(f"BENCH_{i}", t, {"ticker": "BENCH", "text": t}) for i, t in enumerate(texts)]
+
+
+def run_serial(index: LatencyIndex, rows: list[tuple]) -> None:
+    """The original flow: embed everything, then upsert batches of 32 one by one."""
+    ids, texts, metas = (list(col) for col in zip(*rows))
+    vectors = embedding_provider._encode_many(texts)
+    for i in range(0, len(ids), LEGACY_BATCH_SIZE):
+        batch = list(zip(ids[i:i + LEGACY_BATCH_SIZE], vectors[i:i + LEGACY_BATCH_SIZE].tolist(),
+                         metas[i:i + LEGACY_BATCH_SIZE]))
+        index.upsert(vectors=batch, namespace="BENCH")
+
+
+def run_pipelined(index: LatencyIndex, rows: list[tuple], in_flight: int) -> None:
+    pipeline = UpsertPipeline(index, "BENCH", embed_fn=embedding_provider._encode_many, max_in_flight=in_flight)
+    pipeline.run(rows, label="texts")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark pipelined upserts")
+    parser.add_argument("ticker", help="Ticker with data already on disk")
+    parser.add_argument("--rtt-ms", type=float, default=80.0, help="Simulated request round trip")
+    parser.add_argument("--mbps", type=float, default=50.0, help="Simulated upload bandwidth")
+    parser.add_argument("--in-flight", type=int, default=PINECONE_UPSERT_CONCURRENCY)
+    args = parser.parse_args()
+
+    texts = load_texts(args.ticker.upper())
+    if not texts:
+        print(f"No indexed texts found for {args.ticker}")
+        return
+    rows = rows_for(texts)
+    embedding_provider._encode_many(texts[:8])  # load + warm up the model
+
+    print(f"{len(texts)} texts, RTT {args.rtt_ms:.0f} ms, {args.mbps:.0f} Mbit/s\n")
+    print(f"{'variant':<22} {'seconds':>8} {'requests':>9} {'MB sent':>8} {'vectors/s':>10}")
+    print("-" * 62)
+
+    variants = [
+        ("serial (batch 32)", lambda idx: run_serial(idx, rows)),
+        (f"pipelined x{args.in_flight}", lambda idx: run_pipelined(idx, rows, args.in_flight)),
+    ]
+    for name, fn in variants:
+        index = LatencyIndex(args.rtt_ms, args.mbps)
+        start = time.perf_counter()
+        fn(index)
+        elapsed = time.perf_counter() - start
+        print(f"{name:<22} {elapsed:>8.2f} {index.requests:>9} {index.sent_bytes / 1e6:>8.2f} "
+              f"{index.vectors / elapsed:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark: local vector store, exact brute force vs HNSW.
+
+Fills a throwaway LocalVectorStore with random unit vectors (MiniLM's 384
+dimensions by default) and reports per-query latency and, for HNSW,
+recall@k against the exact result. HNSW rows are skipped when hnswlib is
+not installed. Random vectors have no cluster structure, so recall here is
+a lower bound for real embeddings at the same --ef.
+
+Usage:
+    cd RAG
+    python -m src.benchmarks.bench_vector_store
+    python -m src.benchmarks.bench_vector_store --sizes 10000 100000 --top-k 5 --ef 200
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+
+import numpy as np
+
+from src.vector_store import local_store
+from src.vector_store.local_store import LocalVectorStore
+
+
+def timed_queries(store: LocalVectorStore, queries: np.ndarray, top_k: int) -> tuple[list[list[str]], list[float]]:
+    results, latencies = [], []
+    for q in queries:
+        start = time.perf_counter()
+        response = store.query(vector=q, top_k=top_k, namespace="BENCH", include_metadata=False)
+        latencies.append((time.perf_counter() - start) * 1000)
+        results.append([m["id"] for m in response["matches"]])
+    return results, latencies
+
+
+def run_size(store: LocalVectorStore, size: int, queries: np.ndarray, top_k: int) -> None:
+    local_store.LOCAL_HNSW_MIN_VECTORS = size + 1     # force exact search
+    exact, latencies = timed_queries(store, queries, top_k)
+    latencies.sort()
+    print(f"{size:>9} {'exact':<7} {'-':>8} {statistics.median(latencies):>8.2f} "
+          f"{latencies[int(0.95 * (len(latencies) - 1))]:>8.2f} {1.0:>7.3f}")
+
+    if local_store._hnswlib() is None:
+        print(f"{size:>9} {'hnsw':<7} hnswlib not installed")
+        return
+
+    local_store.LOCAL_HNSW_MIN_VECTORS = 0
+    start = time.perf_counter()
+    store._ns("BENCH")._ensure_ann()
+    build_s = time.perf_counter() - start
+    approx, latencies = timed_queries(store, queries, top_k)
+    latencies.sort()
+    recall = np.mean([len(set(a) & set(e)) / len(e) for a, e in zip(approx, exact)])
+    print(f"{size:>9} {'hnsw':<7} {build_s:>8.2f} {statistics.median(latencies):>8.2f} "
+          f"{latencies[int(0.95 * (len(latencies) - 1))]:>8.2f} {recall:>7.3f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark the local vector store")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2_000, 20_000, 100_000])
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--ef", type=int, default=local_store.HNSW_EF_SEARCH, help="HNSW search breadth")
+    args = parser.parse_args()
+    local_store.HNSW_EF_SEARCH = args.ef
+
+    rng = np.random.default_rng(0)
+    print(f"{'vectors':>9} {'search':<7} {'build s':>8} {'p50 ms':>8} {'p95 ms':>8} {'recall':>7}")
+    print("-" * 52)
+
+    for size in args.sizes:
+        data = rng.standard_normal((size, args.dim), dtype=np.float32)
+        queries = rng.standard_normal((args.queries, args.dim), dtype=np.float32)
+
+        with tempfile.TemporaryDirectory() as root:
+            store = LocalVectorStore(root)
+            store.upsert([(f"v{i}", row, {}) for i, row in enumerate(data)], namespace="BENCH")
+            run_size(store, size, queries, args.top_k)
+            store._namespaces.clear()   # nothing to persist at exit; the directory is gone
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,332 @@
+"""
+Bulk Onboarding - Run the control plane for a whole watchlist in parallel.
+
+Each ticker is resolved through the company registry and handed to a
+worker process that runs the normal ControlPlaneManager flow (fetch,
+serialize, chunk, embed, upsert). Stages take a slot from a cross-process
+semaphore before they start:
+
+- upstream slots: "yfinance" (one per report request), "sec" (10-K), "bse" (filings)
+- stage slot: "index" (chunk + embed + upsert, the CPU-heavy part)
+
+A slow upstream therefore only holds its own slots: other tickers keep
+fetching from the remaining upstreams and indexing what they already have.
+A ticker still running after BULK_TICKER_TIMEOUT seconds is abandoned and
+reported as failed, so one hung upstream cannot hold a worker for the rest
+of the run.
+
+With the embedding server running, workers share its warm model (and its
+embedding cache) instead of each loading one. Workers never open the
+on-disk embedding cache themselves, since it has a single writer, and
+always embed in-process rather than starting a pool per worker.
+
+Watchlist file: one ticker per line, optional identifier, "#" comments:
+
+    AAPL
+    NVDA cik=0001045810
+    TCS scrip=532540
+
+Usage:
+    cd RAG
+    python -m src.bulk_onboard watchlist.txt
+    python -m src.bulk_onboard watchlist.txt --workers 8 --sec 1 --index 2 --force
+    python -m src.bulk_onboard watchlist.txt --timeout 600
+"""
+
+import multiprocessing as mp
+import os
+import signal
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from src.control_plane.config import BULK_CONCURRENCY_LIMITS, BULK_TICKER_TIMEOUT, BULK_WORKERS, Jurisdiction
+from src.control_plane.company_registry import CompanyInfo, resolve_company
+from src.control_plane.manager import ControlPlaneManager
+
+
+@dataclass
+class WatchlistEntry:
+    """One watchlist line."""
+    ticker: str
+    cik: Optional[str] = None
+    scrip_code: Optional[str] = None
+
+
+@dataclass
+class OnboardSummary:
+    """Outcome and timings for one ticker."""
+    ticker: str
+    ok: bool
+    seconds: float = 0.0
+    stage_seconds: dict[str, float] = field(default_factory=dict)   # stage → time spent working
+    wait_seconds: float = 0.0                                       # time spent waiting for slots
+    components_updated: list[str] = field(default_factory=list)
+    components_indexed: list[str] = field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+
+
+def parse_watchlist(path: Path) -> list[WatchlistEntry]:
+    """Read a watchlist file (see module docstring for the format)."""
+    entries: list[WatchlistEntry] = []
+    seen: set[str] = set()
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.split("#", 1)[0].strip()
+            if not line:
+                continue
+
+            ticker, *options = line.replace(",", " ").split()
+            entry = WatchlistEntry(ticker=ticker.upper())
+            for option in options:
+                key, _, value = option.partition("=")
+                if key == "cik":
+                    entry.cik = value
+                elif key == "scrip":
+                    entry.scrip_code = value
+                else:
+                    raise ValueError(f"{path}:{line_no}: unknown option {option!r} (expected cik= or scrip=)")
+
+            if entry.ticker not in seen:
+                seen.add(entry.ticker)
+                entries.append(entry)
+
+    return entries
+
+
+# ---------------------------------------------------------------- worker side
+
+_limits: dict = {}
+_ticker_timeout = 0.0
+
+
+class TickerTimeout(BaseException):
+    """
+    A ticker ran past its time limit.
+
+    A BaseException, so the manager's per-stage `except Exception` handling
+    cannot swallow it and carry on with the next stage.
+    """
+
+
+@contextmanager
+def _deadline(seconds: float):
+    """Raise TickerTimeout in the worker's main thread after `seconds` (0 = no limit)."""
+    if seconds <= 0:
+        yield
+        return
+
+    def expire(signum, frame):
+        raise TickerTimeout(f"gave up after {seconds:.0f}s (BULK_TICKER_TIMEOUT)")
+
+    previous = signal.signal(signal.SIGALRM, expire)
+    signal.setitimer(signal.ITIMER_REAL, seconds)
+    try:
+        yield
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
+
+
+def _init_worker(limits: dict, threads_per_worker: int, ticker_timeout: float) -> None:
+    global _limits, _ticker_timeout
+    _limits = limits
+    _ticker_timeout = ticker_timeout
+    # Set before torch is imported so concurrent index stages do not oversubscribe the CPU
+    os.environ.setdefault("OMP_NUM_THREADS", str(threads_per_worker))
+
+    # The on-disk embedding cache has a single writer; concurrent index stages
+    # appending to it would map texts to each other's vectors
+    from src.embeddings.embedding_provider import disable_embedding_cache, disable_embedding_pool
+    disable_embedding_cache()
+    # Workers are the parallelism: a pool per worker would multiply processes and models
+    disable_embedding_pool()
+
+
+class LimitedManager(ControlPlaneManager):
+    """ControlPlaneManager whose fetch and index stages take a bulk-run slot."""
+
+    def __init__(self, limits: dict, base_dir: Optional[Path] = None):
+        super().__init__(base_dir)
+        self.limits = limits
+        self.stage_seconds: dict[str, float] = defaultdict(float)
+        self.wait_seconds = 0.0
+        self._timing_lock = threading.Lock()   # report requests take slots from several threads
+
+    @contextmanager
+    def _slot(self, limit: str, stage: str):
+        semaphore = self.limits.get(limit)
+        start = time.perf_counter()
+        if semaphore is not None:
+            semaphore.acquire()
+        acquired = time.perf_counter()
+        try:
+            yield
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+            with self._timing_lock:
+                self.wait_seconds += acquired - start
+                self.stage_seconds[stage] += time.perf_counter() - acquired
+
+    def _report_slot(self):
+        # One slot per yfinance request: a ticker's reports are fetched concurrently
+        return self._slot("yfinance", "fetch")
+
+    def _fetch_unstructured(self, ticker: str, info: CompanyInfo) -> None:
+        upstream = "sec" if info.jurisdiction == Jurisdiction.US else "bse"
+        with self._slot(upstream, "fetch"):
+            super()._fetch_unstructured(ticker, info)
+
+    def _index_all(self, ticker: str) -> None:
+        with self._slot("index", "index"):
+            super()._index_all(ticker)
+
+    def _index_component(self, ticker: str, component: str) -> None:
+        with self._slot("index", "index"):
+            super()._index_component(ticker, component)
+
+
+def onboard_one(entry: WatchlistEntry, force_refresh: bool = False) -> OnboardSummary:
+    """Run the control plane for one ticker (inside a worker process)."""
+    start = time.perf_counter()
+    manager = LimitedManager(_limits)
+    try:
+        with _deadline(_ticker_timeout):
+            result = manager.ensure_data_ready(
+                ticker=entry.ticker,
+                cik=entry.cik,
+                scrip_code=entry.scrip_code,
+                force_refresh=force_refresh
+            )
+    except (Exception, TickerTimeout) as e:
+        return OnboardSummary(
+            ticker=entry.ticker,
+            ok=False,
+            seconds=time.perf_counter() - start,
+            stage_seconds=dict(manager.stage_seconds),
+            wait_seconds=manager.wait_seconds,
+            errors=[f"{type(e).__name__}: {e}"]
+        )
+
+    return OnboardSummary(
+        ticker=entry.ticker,
+        ok=not result.errors,
+        seconds=time.perf_counter() - start,
+        stage_seconds=dict(manager.stage_seconds),
+        wait_seconds=manager.wait_seconds,
+        components_updated=result.components_updated,
+        components_indexed=result.components_indexed,
+        errors=result.errors
+    )
+
+
+# ---------------------------------------------------------------- parent side
+
+def bulk_onboard(
+    entries: list[WatchlistEntry],
+    workers: int = BULK_WORKERS,
+    limits: Optional[dict[str, int]] = None,
+    force_refresh: bool = False,
+    ticker_timeout: float = BULK_TICKER_TIMEOUT
+) -> list[OnboardSummary]:
+    """
+    Onboard every watchlist entry across a pool of worker processes.
+
+    Args:
+        entries: Tickers (with optional identifiers) to onboard
+        workers: Worker processes (tickers in progress at once)
+        limits: Concurrent slots per upstream/stage (default BULK_CONCURRENCY_LIMITS)
+        force_refresh: Refetch every component regardless of freshness
+        ticker_timeout: Seconds a worker spends on one ticker before giving up (0 = no limit)
+
+    Returns:
+        One OnboardSummary per entry, in completion order
+    """
+    limits = {**BULK_CONCURRENCY_LIMITS, **(limits or {})}
+    summaries: list[OnboardSummary] = []
+
+    runnable = []
+    for entry in entries:
+        if resolve_company(entry.ticker, entry.cik, entry.scrip_code) is None:
+            summaries.append(OnboardSummary(
+                ticker=entry.ticker,
+                ok=False,
+                errors=["Unknown ticker: add cik=... (US) or scrip=... (India) to the watchlist line"]
+            ))
+            _print_progress(summaries[-1], len(summaries), len(entries))
+        else:
+            runnable.append(entry)
+
+    if not runnable:
+        return summaries
+
+    ctx = mp.get_context("spawn")
+    semaphores = {name: ctx.BoundedSemaphore(max(1, n)) for name, n in limits.items()}
+    threads_per_worker = max(1, (os.cpu_count() or 1) // max(1, limits["index"]))
+
+    with ProcessPoolExecutor(
+        max_workers=max(1, min(workers, len(runnable))),
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(semaphores, threads_per_worker, ticker_timeout)
+    ) as pool:
+        futures = {pool.submit(onboard_one, entry, force_refresh): entry for entry in runnable}
+        for future in as_completed(futures):
+            try:
+                summary = future.result()
+            except Exception as e:   # worker process died
+                summary = OnboardSummary(ticker=futures[future].ticker, ok=False, errors=[f"{type(e).__name__}: {e}"])
+            summaries.append(summary)
+            _print_progress(summary, len(summaries), len(entries))
+
+    return summaries
+
+
+def _print_progress(summary: OnboardSummary, done: int, total: int) -> None:
+    status = "ok" if summary.ok else "FAILED"
+    print(f"[BulkOnboard] ({done}/{total}) {summary.ticker}: {status} in {summary.seconds:.1f}s")
+
+
+def print_summary(summaries: list[OnboardSummary]) -> None:
+    """Per-ticker table of outcome and timings."""
+    print(f"\n{'ticker':<12} {'status':<7} {'total s':>8} {'fetch s':>8} {'index s':>8} {'wait s':>7} "
+          f"{'updated':>8}  errors")
+    print("-" * 90)
+    for s in sorted(summaries, key=lambda s: s.ticker):
+        print(f"{s.ticker:<12} {'ok' if s.ok else 'FAILED':<7} {s.seconds:>8.1f} "
+              f"{s.stage_seconds.get('fetch', 0.0):>8.1f} {s.stage_seconds.get('index', 0.0):>8.1f} "
+              f"{s.wait_seconds:>7.1f} {len(s.components_updated):>8}  {'; '.join(s.errors)[:60]}")
+
+    failed = sum(not s.ok for s in summaries)
+    print(f"\n{len(summaries) - failed} succeeded, {failed} failed")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Onboard a watchlist of tickers in parallel")
+    parser.add_argument("watchlist", type=Path, help="File with one ticker per line")
+    parser.add_argument("--workers", type=int, default=BULK_WORKERS, help="Worker processes")
+    for name, default in BULK_CONCURRENCY_LIMITS.items():
+        parser.add_argument(f"--{name}", type=int, default=default, help=f"Concurrent {name} slots")
+    parser.add_argument("--force", action="store_true", help="Force refresh data")
+    parser.add_argument("--timeout", type=float, default=BULK_TICKER_TIMEOUT, help="Seconds per ticker (0 = no limit)")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = bulk_onboard(
+        parse_watchlist(args.watchlist),
+        workers=args.workers,
+        limits={name: getattr(args, name) for name in BULK_CONCURRENCY_LIMITS},
+        force_refresh=args.force,
+        ticker_timeout=args.timeout
+    )
+    print_summary(results)
+    print(f"Wall time: {time.perf_counter() - start:.1f}s")
@@ -8,6 +8,8 @@ Defines:
 - Base paths and constants
 """
 
+import os
+import tempfile
 from datetime import timedelta
 from pathlib import Path
 from enum import Enum
@@ -27,6 +29,7 @@ DataComponent = Literal[
     "balance_sheet",
     "cash_flow",
     "info",
+    "derived",
     "unstructured"
 ]
 
@@ -36,7 +39,8 @@ STRUCTURED_COMPONENTS: list[str] = [
     "income_stmt",
     "balance_sheet",
     "cash_flow",
-    "info"
+    "info",
+    "derived"       # computed from the stored statements and price history, see structured/derived.py
 ]
 
 # Freshness policies: max age before component is considered stale
@@ -46,12 +50,83 @@ FRESHNESS_POLICIES: dict[str, timedelta] = {
     "balance_sheet": timedelta(days=90),
     "cash_flow": timedelta(days=90),
     "info": timedelta(days=7),              # Company info weekly
+    "derived": timedelta(hours=24),         # Recomputed with price (and whenever an input is refetched)
     "unstructured": timedelta(days=365),    # 10-K filings yearly
 }
 
 # Base data directory (resolves to project_root/data)
 BASE_DATA_DIR = Path(__file__).resolve().parents[3] / "data"
 
+# Daily price history (data/_structured/report_type=price/ticker={TICKER}/year=YYYY/): years
+# retained, and part files per year before they are compacted into one. price.jsonl keeps the
+# trailing PRICE_WINDOW_MONTHS that is narrated and indexed.
+PRICE_HISTORY_YEARS = int(os.getenv("PRICE_HISTORY_YEARS", "5"))
+PRICE_WINDOW_MONTHS = int(os.getenv("PRICE_WINDOW_MONTHS", "3"))
+PRICE_COMPACT_PARTS = 32
+
+# 10-K sections kept by SEC ingestion (chunk metadata "section")
+TEN_K_SECTIONS: dict[str, str] = {
+    "business": "Item 1. Business",
+    "risk_factors": "Item 1A. Risk Factors",
+    "mdna": "Item 7. Management's Discussion and Analysis",
+    "market_risk": "Item 7A. Quantitative and Qualitative Disclosures About Market Risk",
+}
+
 # Pinecone configuration
 PINECONE_INDEX_NAME = "financial-rag"
-EMBEDDING_BATCH_SIZE = 32
+PINECONE_UPSERT_CONCURRENCY = int(os.getenv("PINECONE_UPSERT_CONCURRENCY", "4"))      # upsert requests in flight
+PINECONE_POOL_THREADS = int(os.getenv("PINECONE_POOL_THREADS", "8"))                    # shared client's connection pool
+PINECONE_UPSERT_MAX_BYTES = int(os.getenv("PINECONE_UPSERT_MAX_BYTES", "1800000"))    # under Pinecone's 2 MB request cap
+PINECONE_UPSERT_MAX_VECTORS = 1000                                                     # Pinecone max vectors per upsert
+
+# Vector store backend: "pinecone" or "local" (in-process, persisted under data/_vector_store)
+VECTOR_STORE_BACKEND = os.getenv("VECTOR_STORE_BACKEND", "pinecone")
+LOCAL_VECTOR_STORE_DIR = Path(os.getenv("LOCAL_VECTOR_STORE_DIR", str(BASE_DATA_DIR / "_vector_store")))
+LOCAL_HNSW_MIN_VECTORS = int(os.getenv("LOCAL_HNSW_MIN_VECTORS", "20000"))   # smaller namespaces use exact search
+
+# Bulk onboarding (python -m src.bulk_onboard): worker processes and concurrent-slot limits
+# per upstream (yfinance, sec, bse) and for the CPU-bound index stage (chunk + embed + upsert).
+# The yfinance limit counts report requests in flight across all workers, not tickers.
+BULK_WORKERS = int(os.getenv("BULK_WORKERS", str(min(4, os.cpu_count() or 1))))
+BULK_TICKER_TIMEOUT = float(os.getenv("BULK_TICKER_TIMEOUT", "1800"))   # seconds per ticker; 0 = no limit
+BULK_CONCURRENCY_LIMITS: dict[str, int] = {
+    "yfinance": int(os.getenv("BULK_LIMIT_YFINANCE", "4")),
+    "sec": int(os.getenv("BULK_LIMIT_SEC", "2")),           # SEC asks for <= 10 requests/s per client
+    "bse": int(os.getenv("BULK_LIMIT_BSE", "2")),
+    "index": int(os.getenv("BULK_LIMIT_INDEX", "2")),
+}
+
+# Local docstore (data/{TICKER}/_index/docstore.sqlite): keep chunk text out of Pinecone metadata
+DOCSTORE_ENABLED = os.getenv("DOCSTORE_ENABLED", "0") != "0"
+EMBEDDING_BATCH_SIZE = int(os.getenv("EMBEDDING_BATCH_SIZE", "32"))   # texts per forward pass
+
+# Embedding cache: content-addressed vectors keyed by (model, text hash)
+EMBEDDING_CACHE_ENABLED = os.getenv("EMBEDDING_CACHE_ENABLED", "1") != "0"
+EMBEDDING_CACHE_DIR = Path(os.getenv("EMBEDDING_CACHE_DIR", str(BASE_DATA_DIR / "_cache" / "embeddings")))
+EMBEDDING_CACHE_MAX_BYTES = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+EMBEDDING_CACHE_DTYPE = os.getenv("EMBEDDING_CACHE_DTYPE", "float16")    # float16 | float32
+
+# Multi-process embedding: 0/1 = in-process, N > 1 = pool of N worker processes
+EMBEDDING_NUM_WORKERS = int(os.getenv("EMBEDDING_NUM_WORKERS", "0"))
+EMBEDDING_POOL_MIN_TEXTS = int(os.getenv("EMBEDDING_POOL_MIN_TEXTS", "256"))   # smaller calls stay in-process
+
+# Embedding inference backend: torch | torch-int8 | onnx | onnx-int8
+EMBEDDING_BACKEND = os.getenv("EMBEDDING_BACKEND", "torch")
+EMBEDDING_ONNX_INT8_FILE = os.getenv("EMBEDDING_ONNX_INT8_FILE", "onnx/model_quint8_avx2.onnx")
+
+# Resident embedding server (python -m src.embeddings.embedding_server), used when running.
+# The socket lives in a per-user directory: $XDG_RUNTIME_DIR, else a 0700 temp subdirectory
+EMBEDDING_SERVER_ENABLED = os.getenv("EMBEDDING_SERVER_ENABLED", "1") != "0"
+EMBEDDING_SERVER_SOCKET = os.getenv(
+    "EMBEDDING_SERVER_SOCKET",
+    os.path.join(os.environ["XDG_RUNTIME_DIR"], "financial-rag-embedder.sock") if os.getenv("XDG_RUNTIME_DIR")
+    else os.path.join(tempfile.gettempdir(), f"financial-rag-{os.getuid()}", "embedder.sock"),
+)
+
+# In-memory LRU of query embeddings (embed_query / embed_queries)
+QUERY_CACHE_SIZE = int(os.getenv("QUERY_CACHE_SIZE", "1024"))
+QUERY_CACHE_TTL_SECONDS = float(os.getenv("QUERY_CACHE_TTL_SECONDS", "0"))   # 0 = no expiry
+
+# Chunking: "chars" (800-char recursive splits), "tokens" (fits the embedder's window)
+# or "cdc" (content-defined boundaries; IDs survive edits elsewhere in the filing)
+CHUNKING_MODE = os.getenv("CHUNKING_MODE", "chars")
@@ -9,7 +9,6 @@ from datetime import datetime, timezone, timedelta
 from pathlib import Path
 from typing import Optional
 import pandas as pd
-import json
 import os
 
 from .config import Jurisdiction, FRESHNESS_POLICIES, DataComponent
@@ -35,7 +34,7 @@ class FreshnessResult:
 
 def get_fetched_at_from_parquet(parquet_path: Path) -> Optional[datetime]:
     """
-    Read _meta_fetched_at from a structured parquet file.
+    Read _meta_fetched_at from a structured parquet file (that column only).
 
     Args:
         parquet_path: Path to the parquet file
@@ -44,11 +43,8 @@ def get_fetched_at_from_parquet(parquet_path: Path) -> Optional[datetime]:
         datetime of when data was fetched, or None if not found
     """
     try:
-        df = pd.read_parquet(parquet_path)
-        if "_meta_fetched_at" not in df.columns:
-            return None
-
-        fetched_at_str = df["_meta_fetched_at"].iloc[0]
+        df = pd.read_parquet(parquet_path, columns=["_meta_fetched_at"])
+        fetched_at_str = df["_meta_fetched_at"].max()
         return datetime.fromisoformat(fetched_at_str)
     except Exception:
         return None
@@ -56,19 +52,20 @@ def get_fetched_at_from_parquet(parquet_path: Path) -> Optional[datetime]:
 
 def get_fetched_at_from_json(json_path: Path) -> Optional[datetime]:
     """
-    Read fetched_at from a JSON file (unstructured data).
+    Read fetched_at from the header line of a JSON Lines bundle (unstructured data).
+
+    Only the header is parsed, never the document body.
 
     Args:
-        json_path: Path to the JSON file
+        json_path: Path to the .jsonl file (a legacy .json is read if it is missing)
 
     Returns:
         datetime of when data was fetched, or None if not found
     """
-    try:
-        with open(json_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+    from src.jsonl import read_header
 
-        fetched_at_str = data.get("fetched_at")
+    try:
+        fetched_at_str = read_header(json_path).get("fetched_at")
         if not fetched_at_str:
             return None
 
@@ -140,10 +137,12 @@ def check_structured_freshness(
     Returns:
         FreshnessResult with existence and freshness status
     """
-    parquet_path = base_dir / ticker / "structured" / f"{component}.parquet"
+    from src.structured.dataset import latest_part
+
+    parquet_path = latest_part(component, ticker, base_dir)
     policy = FRESHNESS_POLICIES.get(component, timedelta(hours=24))
 
-    if not parquet_path.exists():
+    if parquet_path is None:
         return FreshnessResult(
             component=component,
             exists=False,
@@ -187,7 +186,7 @@ def check_unstructured_freshness(
     """
     Check freshness of unstructured data.
 
-    For US: Checks data.json fetched_at
+    For US: Checks the data.jsonl header's fetched_at
     For India: Checks latest PDF file date
 
     Args:
@@ -201,9 +200,11 @@ def check_unstructured_freshness(
     policy = FRESHNESS_POLICIES.get("unstructured", timedelta(days=365))
 
     if jurisdiction == Jurisdiction.US:
-        json_path = base_dir / ticker / "unstructured" / "data.json"
+        from src.jsonl import exists as jsonl_exists
+
+        json_path = base_dir / ticker / "unstructured" / "data.jsonl"
 
-        if not json_path.exists():
+        if not jsonl_exists(json_path):
             return FreshnessResult(
                 component="unstructured",
                 exists=False,
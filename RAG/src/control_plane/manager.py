@@ -13,9 +13,10 @@ Invariant: Disk is source of truth, Pinecone mirrors it exactly.
 
 import os
 import sys
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import ContextManager, Optional
 
 # Add parent path for imports
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
@@ -70,7 +71,9 @@ class ControlPlaneManager:
     Manages data lifecycle for a ticker.
 
     Ensures Pinecone is exact mirror of disk (disk is source of truth).
-    Uses stable vector IDs so upserts overwrite existing vectors.
+    Uses stable vector IDs so upserts overwrite existing vectors; the
+    per-ticker vector manifest (data/{TICKER}/_index/manifest.json) lets
+    the indexer skip unchanged vectors and delete orphaned ones.
     """
 
     def __init__(self, base_dir: Optional[Path] = None):
@@ -182,14 +185,12 @@ class ControlPlaneManager:
         indexed: list[str] = []
         errors: list[str] = []
 
-        # Fetch structured data
-        for component in checklist.structured:
-            try:
-                print(f"  Fetching {component}...")
-                self._fetch_structured(ticker, component)
-                updated.append(component)
-            except Exception as e:
-                errors.append(f"Error fetching {component}: {str(e)}")
+        # Fetch structured data (one batched yfinance session)
+        if checklist.structured:
+            print(f"  Fetching {', '.join(checklist.structured)}...")
+            fetched, fetch_errors = self._fetch_structured(ticker, checklist.structured)
+            updated.extend(fetched)
+            errors.extend(fetch_errors)
 
         # Fetch unstructured data
         if checklist.unstructured:
@@ -221,7 +222,8 @@ class ControlPlaneManager:
         """
         Incremental update: only fetch and index stale components.
 
-        Uses same vector IDs to overwrite existing vectors in Pinecone.
+        Each refetched component is re-indexed on its own; vectors from
+        components that were still fresh are not touched.
 
         Returns:
             dict with "updated", "indexed", "errors" lists
@@ -230,16 +232,19 @@ class ControlPlaneManager:
         indexed: list[str] = []
         errors: list[str] = []
 
-        # Process structured components
-        for component in checklist.structured:
-            result = freshness.get(component)
-            if result and (not result.exists or not result.is_fresh):
-                try:
-                    print(f"  Fetching stale {component}...")
-                    self._fetch_structured(ticker, component)
-                    updated.append(component)
-                except Exception as e:
-                    errors.append(f"Error fetching {component}: {str(e)}")
+        # Process structured components (stale ones fetched in one batched session)
+        stale = [
+            component for component in checklist.structured
+            if (result := freshness.get(component)) and (not result.exists or not result.is_fresh)
+        ]
+        # Derived metrics are recomputed whenever one of their inputs is refetched
+        if stale and "derived" in checklist.structured and "derived" not in stale:
+            stale.append("derived")
+        if stale:
+            print(f"  Fetching stale {', '.join(stale)}...")
+            fetched, fetch_errors = self._fetch_structured(ticker, stale)
+            updated.extend(fetched)
+            errors.extend(fetch_errors)
 
         # Process unstructured
         if checklist.unstructured:
@@ -252,23 +257,48 @@ class ControlPlaneManager:
                 except Exception as e:
                     errors.append(f"Error fetching unstructured: {str(e)}")
 
-        # Index updated components
-        if updated:
+        # Index updated components, plus fresh ones whose last index run was interrupted
+        from src.indexing.journal import pending_components
+        interrupted = [
+            c for c in pending_components(ticker, self.base_dir)
+            if c in checklist.get_all_components() and c not in updated
+        ]
+        if interrupted:
+            print(f"  Resuming interrupted indexing: {interrupted}")
+
+        for component in updated + interrupted:
             try:
-                print(f"  Indexing updated components to Pinecone...")
-                # For incremental updates, we re-index all to ensure consistency
-                # The stable IDs ensure overwrites, not duplicates
-                self._index_all(ticker)
-                indexed = updated.copy()
+                print(f"  Indexing {component} to Pinecone...")
+                self._index_component(ticker, component)
+                indexed.append(component)
             except Exception as e:
-                errors.append(f"Error indexing: {str(e)}")
+                errors.append(f"Error indexing {component}: {str(e)}")
 
         return {"updated": updated, "indexed": indexed, "errors": errors}
 
-    def _fetch_structured(self, ticker: str, component: str) -> None:
-        """Fetch structured data via yfinance and serialize to JSON."""
-        from src.structured.data import fetch_and_store_stock_data
-        fetch_and_store_stock_data(ticker, component)
+    def _fetch_structured(self, ticker: str, components: list[str]) -> tuple[list[str], list[str]]:
+        """
+        Fetch structured components via yfinance and serialize to JSON.
+
+        All components share one yfinance handle and are requested
+        concurrently.
+
+        Returns:
+            (components that were stored, error messages for the rest)
+        """
+        from src.structured.data import fetch_and_store_components
+        try:
+            _, failures = fetch_and_store_components(ticker, components, slot=self._report_slot)
+        except Exception as e:
+            failures = {component: str(e) for component in components}
+
+        fetched = [c for c in components if c not in failures]
+        errors = [f"Error fetching {c}: {failures[c]}" for c in components if c in failures]
+        return fetched, errors
+
+    def _report_slot(self) -> ContextManager:
+        """Entered around each structured report request (no limit by default)."""
+        return nullcontext()
 
     def _fetch_unstructured(self, ticker: str, info: CompanyInfo) -> None:
         """Fetch unstructured data (SEC 10-K for US, BSE filings for India)."""
@@ -286,14 +316,14 @@ class ControlPlaneManager:
     def _index_all(self, ticker: str) -> None:
         """Index all data for a ticker to Pinecone."""
         from src.indexing.upsert_pinecone import index_all_data
-        index_all_data(ticker)
+        index_all_data(ticker, str(Path(self.base_dir) / ticker))
 
     def _index_component(self, ticker: str, component: str) -> None:
         """
         Index a single component to Pinecone.
 
-        Uses stable vector IDs so this overwrites existing vectors.
+        Re-embeds and upserts only that component's vectors and deletes the
+        ones it no longer produces (tracked in the ticker's vector manifest).
         """
-        # For now, delegate to index_all. In future, could add
-        # component-specific indexing for better efficiency.
-        self._index_all(ticker)
+        from src.indexing.index_components import index_component
+        index_component(ticker, component, self.base_dir)
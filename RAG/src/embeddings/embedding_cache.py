@@ -0,0 +1,434 @@
+"""
+Embedding Cache - Persistent, content-addressed store of embedding vectors.
+
+Vectors are keyed by (model name, SHA-1 of the text), so an unchanged chunk or
+financial summary is never re-embedded, whatever its vector ID or position.
+
+On-disk layout (one directory per model):
+    {cache_dir}/{model_slug}/
+        ├── meta.json       # dim, dtype, row count (written last: the commit point)
+        ├── index.bin       # raw records: key (20-byte digest), last_used
+        └── vectors.bin     # row-major matrix, memory-mapped (float16 or float32)
+
+Row i of vectors.bin belongs to record i of index.bin. flush() appends only the
+rows stored since the last flush; recency (last_used) updates from lookups stay
+in memory until close() or the next eviction, so an all-hit batch writes
+nothing. Eviction is LRU against a byte budget on vectors.bin.
+
+One process writes a cache directory at a time: the first to open it takes an
+exclusive lock (.lock, flock) and every other process opens it read-only - it
+serves hits from what was on disk when it opened and stores nothing.
+"""
+
+import hashlib
+import json
+import os
+import re
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:     # Windows: no advisory locks, the single writer is not enforced
+    fcntl = None
+
+_INDEX_DTYPE = np.dtype([("key", np.uint8, (20,)), ("last_used", np.int64)])
+_COMPACT_ROWS = 4096
+
+
+def text_digest(text: str) -> bytes:
+    """Content address of a text (20-byte SHA-1 digest)."""
+    return hashlib.sha1(text.encode("utf-8")).digest()
+
+
+def _model_slug(model_name: str) -> str:
+    return re.sub(r"[^A-Za-z0-9._-]+", "__", model_name)
+
+
+class EmbeddingCache:
+    """
+    Memory-mapped embedding cache for one model.
+
+    Usage:
+        cache = EmbeddingCache(MODEL_NAME, cache_dir, max_bytes=256 << 20)
+        vectors, missing = cache.lookup(texts)
+        # ... embed texts[i] for i in missing, fill vectors[missing] ...
+        cache.store([texts[i] for i in missing], new_vectors)
+        cache.flush()       # appends the new rows
+        cache.close()       # at exit: recency, writer lock
+    """
+
+    def __init__(
+        self,
+        model_name: str,
+        cache_dir: Path,
+        max_bytes: int,
+        dtype: str = "float16"
+    ):
+        self.model_name = model_name
+        self.dir = Path(cache_dir) / _model_slug(model_name)
+        self.max_bytes = max_bytes
+        self.dtype = np.dtype(dtype)
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._dim: Optional[int] = None
+        self._count = 0
+        self._capacity = 0
+        self._index = np.zeros(0, dtype=_INDEX_DTYPE)
+        self._rows: dict[bytes, int] = {}
+        self._vectors: Optional[np.memmap] = None
+        self._clock = 0
+        self._generation = 0     # bumped when rows move (eviction); readers check it
+        self._persisted = 0      # rows whose index records are on disk
+        self._dirty = False      # rows stored since the last flush
+        self._rewrite = False    # index.bin must be rewritten whole (eviction, legacy index.npy)
+        self._recency_dirty = False
+
+        self._lock_file = None
+        self.readonly = not self._acquire_lock()
+        if self.readonly:
+            print(f"[EmbeddingCache] {self.dir} is locked by another process; opening read-only")
+
+        self._load()
+
+    # ------------------------------------------------------------------ paths
+
+    @property
+    def _meta_path(self) -> Path:
+        return self.dir / "meta.json"
+
+    @property
+    def _index_path(self) -> Path:
+        return self.dir / "index.bin"
+
+    @property
+    def _legacy_index_path(self) -> Path:
+        return self.dir / "index.npy"
+
+    @property
+    def _vectors_path(self) -> Path:
+        return self.dir / "vectors.bin"
+
+    # ---------------------------------------------------------------- locking
+
+    def _acquire_lock(self) -> bool:
+        """Take the directory's writer lock; False if another process holds it."""
+        if fcntl is None:
+            return True
+        self.dir.mkdir(parents=True, exist_ok=True)
+        lock_file = open(self.dir / ".lock", "a")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except OSError:
+            lock_file.close()
+            return False
+        self._lock_file = lock_file
+        return True
+
+    def close(self) -> None:
+        """Persist pending changes (including recency) and release the writer lock."""
+        self.flush(recency=True)
+        self._vectors = None
+        if self._lock_file is not None:
+            fcntl.flock(self._lock_file, fcntl.LOCK_UN)
+            self._lock_file.close()
+            self._lock_file = None
+
+    # ------------------------------------------------------------ persistence
+
+    def _read_meta(self) -> Optional[dict]:
+        try:
+            with open(self._meta_path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+
+    def _load(self) -> None:
+        """Open an existing cache directory, discarding it if incompatible."""
+        if not self._meta_path.exists():
+            return
+
+        try:
+            meta = self._read_meta()
+            if np.dtype(meta["dtype"]) != self.dtype:
+                print(f"[EmbeddingCache] dtype changed ({meta['dtype']} -> {self.dtype}), resetting cache")
+                self.clear()
+                return
+
+            # The index is written before meta.json, so it may hold rows meta does not count yet
+            count = int(meta["count"])
+            if self._index_path.exists():
+                index = np.fromfile(self._index_path, dtype=_INDEX_DTYPE, count=count)
+            else:
+                index = np.load(self._legacy_index_path)
+                self._rewrite = True
+            if len(index) < count:
+                raise ValueError("index/meta row count mismatch")
+            index = index[:count]
+
+            self._dim = int(meta["dim"])
+            self._count = count
+            self._index = np.zeros(max(count, 1), dtype=_INDEX_DTYPE)
+            self._index[:count] = index
+            self._rows = {bytes(k): i for i, k in enumerate(index["key"])}
+            self._clock = int(index["last_used"].max()) + 1 if count else 0
+            self._generation = int(meta.get("generation", 0))
+            self._persisted = 0 if self._rewrite else count
+            self._open_vectors(max(count, 1))
+
+            # A writer compacting concurrently replaces vectors.bin between
+            # removing and rewriting meta.json; the mapping must match the index
+            if self.readonly and (self._read_meta() or {}).get("generation") != self._generation:
+                raise ValueError("cache changed while opening")
+        except Exception as e:
+            print(f"[EmbeddingCache] Unreadable cache at {self.dir} ({e}), resetting")
+            self.clear()
+
+    def _open_vectors(self, capacity: int) -> None:
+        """(Re)map vectors.bin with room for at least `capacity` rows."""
+        row_bytes = self._dim * self.dtype.itemsize
+        if self.readonly:
+            self._capacity = self._count
+            if self._count:
+                self._vectors = np.memmap(self._vectors_path, dtype=self.dtype, mode="r", shape=(self._count, self._dim))
+            return
+
+        self.dir.mkdir(parents=True, exist_ok=True)
+
+        if self._vectors is not None:
+            self._vectors.flush()
+            self._vectors = None
+
+        with open(self._vectors_path, "ab") as f:
+            if f.tell() < capacity * row_bytes:
+                f.truncate(capacity * row_bytes)
+
+        self._capacity = os.path.getsize(self._vectors_path) // row_bytes
+        self._vectors = np.memmap(
+            self._vectors_path,
+            dtype=self.dtype,
+            mode="r+",
+            shape=(self._capacity, self._dim),
+        )
+
+        if len(self._index) < self._capacity:
+            grown = np.zeros(self._capacity, dtype=_INDEX_DTYPE)
+            grown[:self._count] = self._index[:self._count]
+            self._index = grown
+
+    def flush(self, recency: bool = False) -> None:
+        """
+        Persist rows stored since the last flush.
+
+        Only their index records are appended to index.bin; meta.json, written
+        last, commits them. index.bin is rewritten whole after an eviction, or
+        with recency=True when lookups changed last_used (close() does this).
+        """
+        if self.readonly or self._dim is None:
+            return
+        rewrite = self._rewrite or (recency and self._recency_dirty)
+        if not self._dirty and not rewrite:
+            return
+
+        if self._vectors is not None:
+            self._vectors.flush()
+
+        if rewrite:
+            tmp_index = self._index_path.with_suffix(".tmp")
+            self._index[:self._count].tofile(tmp_index)
+            os.replace(tmp_index, self._index_path)
+            self._legacy_index_path.unlink(missing_ok=True)
+        else:
+            with open(self._index_path, "r+b" if self._index_path.exists() else "wb") as f:
+                f.seek(self._persisted * _INDEX_DTYPE.itemsize)
+                f.write(self._index[self._persisted:self._count].tobytes())
+
+        tmp_meta = self._meta_path.with_suffix(".tmp")
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump({
+                "model": self.model_name,
+                "dim": self._dim,
+                "dtype": self.dtype.name,
+                "count": self._count,
+                "generation": self._generation,
+            }, f)
+        os.replace(tmp_meta, self._meta_path)
+
+        self._persisted = self._count
+        self._dirty = False
+        if rewrite:
+            self._rewrite = False
+            self._recency_dirty = False
+
+    def clear(self) -> None:
+        """Drop every cached vector (on disk too, unless read-only)."""
+        self._vectors = None
+        if not self.readonly:
+            for path in (self._meta_path, self._index_path, self._legacy_index_path, self._vectors_path):
+                if path.exists():
+                    path.unlink()
+
+        self._dim = None
+        self._count = 0
+        self._capacity = 0
+        self._index = np.zeros(0, dtype=_INDEX_DTYPE)
+        self._rows = {}
+        self._clock = 0
+        self._persisted = 0
+        self._dirty = False
+        self._rewrite = False
+        self._recency_dirty = False
+
+    # ----------------------------------------------------------------- access
+
+    def _tick(self) -> int:
+        self._clock += 1
+        return self._clock
+
+    def lookup(self, texts: list[str]) -> tuple[Optional[np.ndarray], list[int]]:
+        """
+        Bulk lookup of cached vectors.
+
+        Args:
+            texts: Texts to look up
+
+        Returns:
+            (vectors, missing): float32 matrix of shape (len(texts), dim) with
+            hit rows filled in (None if the cache is empty), and the positions
+            of texts that were not cached.
+        """
+        if self._dim is None or self._count == 0:
+            self.misses += len(texts)
+            return None, list(range(len(texts)))
+
+        rows = np.fromiter(
+            (self._rows.get(text_digest(t), -1) for t in texts),
+            dtype=np.int64,
+            count=len(texts),
+        )
+        hit = rows >= 0
+        missing = np.flatnonzero(~hit).tolist()
+
+        vectors = np.zeros((len(texts), self._dim), dtype=np.float32)
+        if hit.any():
+            hit_rows = rows[hit]
+            vectors[hit] = self._vectors[hit_rows]
+            self._index["last_used"][hit_rows] = self._tick()
+            self._recency_dirty = True
+
+        self.hits += int(hit.sum())
+        self.misses += len(missing)
+        return vectors, missing
+
+    def store(self, texts: list[str], vectors: np.ndarray) -> None:
+        """
+        Insert freshly computed vectors, evicting least recently used rows
+        when the byte budget would be exceeded.
+
+        Args:
+            texts: Texts that were embedded
+            vectors: Matrix of shape (len(texts), dim), same order as texts
+        """
+        if not texts or self.readonly:
+            return
+
+        vectors = np.asarray(vectors)
+        dim = self._dim or int(vectors.shape[1])
+        max_rows = max(self.max_bytes // (dim * self.dtype.itemsize), 0)
+
+        new_keys: dict[bytes, int] = {}
+        for i, t in enumerate(texts):
+            key = text_digest(t)
+            if key not in self._rows:
+                new_keys[key] = i
+
+        incoming = list(new_keys.items())[-max_rows:] if max_rows else []
+        if not incoming:
+            return
+
+        if self._dim is None:
+            self._dim = dim
+            self._index = np.zeros(0, dtype=_INDEX_DTYPE)
+            self._open_vectors(len(incoming))
+
+        if self._count + len(incoming) > max_rows:
+            self._evict(max_rows - len(incoming))
+
+        needed = self._count + len(incoming)
+        if needed > self._capacity:
+            self._open_vectors(min(max(needed, self._capacity * 2), max_rows))
+
+        start = self._count
+        positions = [i for _, i in incoming]
+        self._vectors[start:needed] = vectors[positions].astype(self.dtype, copy=False)
+
+        clock = self._tick()
+        for row, (key, _) in enumerate(incoming, start):
+            self._index["key"][row] = np.frombuffer(key, dtype=np.uint8)
+            self._rows[key] = row
+        self._index["last_used"][start:needed] = clock
+
+        self._count = needed
+        self._dirty = True
+
+    def _evict(self, keep: int) -> None:
+        """
+        Keep the `keep` most recently used rows, compacting them to the front.
+
+        The survivors are copied to a new vectors file that replaces the old
+        one, and meta.json is removed first: a crash part-way leaves an empty
+        cache, never an index that points at rows which have moved. Readers
+        that mapped the old file keep reading it.
+        """
+        keep = max(keep, 0)
+        last_used = self._index["last_used"][:self._count]
+        survivors = np.sort(np.argsort(last_used, kind="stable")[self._count - keep:])
+
+        self._meta_path.unlink(missing_ok=True)
+
+        tmp_vectors = self._vectors_path.with_suffix(".tmp")
+        compacted = np.memmap(tmp_vectors, dtype=self.dtype, mode="w+", shape=(max(keep, 1), self._dim))
+        for start in range(0, keep, _COMPACT_ROWS):
+            src = survivors[start:start + _COMPACT_ROWS]
+            compacted[start:start + len(src)] = self._vectors[src]
+        compacted.flush()
+        del compacted
+
+        self._vectors = None
+        os.replace(tmp_vectors, self._vectors_path)
+        self._index[:keep] = self._index[survivors]
+
+        self.evictions += self._count - keep
+        self._count = keep
+        self._rows = {bytes(k): i for i, k in enumerate(self._index["key"][:keep])}
+        self._generation += 1
+        self._open_vectors(max(keep, 1))
+        self._rewrite = True
+        self.flush()
+
+    # ------------------------------------------------------------------ stats
+
+    def __len__(self) -> int:
+        return self._count
+
+    @property
+    def size_bytes(self) -> int:
+        return self._count * (self._dim or 0) * self.dtype.itemsize
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current footprint."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": self._count,
+            "size_bytes": self.size_bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
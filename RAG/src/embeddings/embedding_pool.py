@@ -0,0 +1,87 @@
+"""
+Embedding Pool - Multi-process sentence embedding for bulk indexing.
+
+Each worker process loads the model once and runs with its own share of the
+CPU cores (torch intra-op threads = cores // workers), so large embed_texts
+calls scale across cores instead of contending for one PyTorch thread pool.
+
+Inputs are split into contiguous shards; results are reassembled in the
+original order.
+"""
+
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing as mp
+from typing import Optional
+
+import numpy as np
+
+
+def _init_worker(threads: int) -> None:
+    """Pin the worker's torch thread pool and load the model up front."""
+    import torch
+    torch.set_num_threads(threads)
+
+    from src.embeddings.embedding_provider import _load_model
+    _load_model()
+
+
+def _encode_shard(texts: list[str], batch_size: Optional[int]) -> np.ndarray:
+    from src.embeddings.embedding_provider import _encode
+    return _encode(texts, batch_size)
+
+
+class EmbeddingPool:
+    """
+    Pool of embedding worker processes.
+
+    Usage:
+        pool = EmbeddingPool(num_workers=4)
+        vectors = pool.encode(texts)   # float32 matrix, input order
+        pool.close()
+    """
+
+    def __init__(self, num_workers: int, threads_per_worker: Optional[int] = None):
+        cores = os.cpu_count() or 1
+        self.num_workers = max(1, num_workers)
+        self.threads_per_worker = threads_per_worker or max(1, cores // self.num_workers)
+
+        # spawn: forking a process that already initialised torch is unsafe
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.num_workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(self.threads_per_worker,),
+        )
+        print(f"[EmbeddingPool] Started {self.num_workers} workers x {self.threads_per_worker} threads")
+
+    def encode(
+        self,
+        texts: list[str],
+        batch_size: Optional[int] = None,
+        shard_size: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Embed texts across the worker processes.
+
+        Args:
+            texts: Texts to embed
+            batch_size: Texts per forward pass inside each worker
+            shard_size: Texts per task (default: spread evenly, 4 shards per worker)
+
+        Returns:
+            float32 matrix of shape (len(texts), dim), same order as texts
+        """
+        if not texts:
+            return _encode_shard(texts, batch_size)
+
+        shard_size = shard_size or max(1, math.ceil(len(texts) / (self.num_workers * 4)))
+        shards = [texts[i:i + shard_size] for i in range(0, len(texts), shard_size)]
+
+        # Executor.map yields results in submission order
+        results = self._executor.map(_encode_shard, shards, [batch_size] * len(shards))
+        return np.concatenate(list(results), axis=0)
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
@@ -1,24 +1,330 @@
-from sentence_transformers import SentenceTransformer
+import atexit
+from typing import Optional
+
+import numpy as np
+
+from src.control_plane.config import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_CACHE_ENABLED,
+    EMBEDDING_CACHE_DIR,
+    EMBEDDING_CACHE_MAX_BYTES,
+    EMBEDDING_CACHE_DTYPE,
+    EMBEDDING_NUM_WORKERS,
+    EMBEDDING_POOL_MIN_TEXTS,
+    EMBEDDING_BACKEND,
+    EMBEDDING_ONNX_INT8_FILE,
+    EMBEDDING_SERVER_ENABLED,
+    QUERY_CACHE_SIZE,
+    QUERY_CACHE_TTL_SECONDS,
+)
+from src.embeddings.embedding_cache import EmbeddingCache
+from src.embeddings.query_cache import QueryEmbeddingCache, normalize_query
 
 MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+EMBEDDING_DIM = 384     # output size of MODEL_NAME
+MAX_SEQ_LENGTH = 256    # word-pieces per input, including [CLS] and [SEP]; the rest is truncated
+
+# Same model weights, different CPU inference runtimes
+EMBEDDING_BACKENDS = ("torch", "torch-int8", "onnx", "onnx-int8")
 
 _model = None
+_cache = None
+_cache_enabled = EMBEDDING_CACHE_ENABLED
+_pool = None
+_pool_enabled = True
+_client = None
+_tokenizer = None
+_query_cache = QueryEmbeddingCache(QUERY_CACHE_SIZE, QUERY_CACHE_TTL_SECONDS)
+
+
+def build_model(backend: str = "torch"):
+    """
+    Load MODEL_NAME with the given inference backend.
+
+    Args:
+        backend: "torch" (fp32), "torch-int8" (CPU, dynamic int8 Linear
+            layers), "onnx" (CPU, ONNX Runtime fp32) or "onnx-int8" (CPU, int8
+            ONNX export from the model repo). ONNX needs optimum[onnxruntime].
+
+    Returns:
+        SentenceTransformer exposing the usual encode() API
+    """
+    # Imported here so processes served by the embedding daemon never load torch
+    from sentence_transformers import SentenceTransformer
+
+    if backend == "torch":
+        return SentenceTransformer(MODEL_NAME)
+
+    if backend == "torch-int8":
+        import torch
+        model = SentenceTransformer(MODEL_NAME, device="cpu")
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    if backend == "onnx":
+        return SentenceTransformer(MODEL_NAME, device="cpu", backend="onnx")
+
+    if backend == "onnx-int8":
+        return SentenceTransformer(
+            MODEL_NAME,
+            device="cpu",
+            backend="onnx",
+            model_kwargs={"file_name": EMBEDDING_ONNX_INT8_FILE},
+        )
+
+    raise ValueError(f"Unknown embedding backend: {backend}. Expected one of {EMBEDDING_BACKENDS}")
+
+
+def model_key(backend: str = EMBEDDING_BACKEND) -> str:
+    """Identity of the vectors a backend produces (embedding cache namespace)."""
+    return MODEL_NAME if backend == "torch" else f"{MODEL_NAME}@{backend}"
 
 
 def _load_model():
     global _model
     if _model is None:
-        _model = SentenceTransformer(MODEL_NAME)
+        _model = build_model(EMBEDDING_BACKEND)
     return _model
 
 
-def embed_texts(texts):
+def get_tokenizer():
+    """
+    The embedder's own fast (Rust) tokenizer, loaded without the model weights.
+
+    Chunkers use it to measure text in model tokens.
+    """
+    global _tokenizer
+    if _tokenizer is None:
+        from transformers import AutoTokenizer
+        _tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME, use_fast=True)
+    return _tokenizer
+
+
+def get_embedding_cache():
+    """Process-wide embedding cache for the active model/backend (None when disabled)."""
+    global _cache
+    if _cache is None and _cache_enabled:
+        _cache = EmbeddingCache(
+            model_key(),
+            EMBEDDING_CACHE_DIR,
+            max_bytes=EMBEDDING_CACHE_MAX_BYTES,
+            dtype=EMBEDDING_CACHE_DTYPE,
+        )
+        atexit.register(_cache.close)
+    return _cache
+
+
+def disable_embedding_cache() -> None:
+    """
+    Turn the on-disk embedding cache off for this process.
+
+    The cache has a single writer; processes running next to the one that
+    owns it (e.g. bulk onboarding workers) call this before embedding.
+    """
+    global _cache, _cache_enabled
+    _cache_enabled = False
+    if _cache is not None:
+        _cache.close()
+    _cache = None
+
+
+def get_query_cache() -> QueryEmbeddingCache:
+    """Process-wide LRU of query embeddings (see .stats() for hit rate)."""
+    return _query_cache
+
+
+def _server_client():
+    """Client for the resident embedding server, if one is running for this model."""
+    global _client
+    if _client is None and EMBEDDING_SERVER_ENABLED:
+        from src.embeddings.embedding_server import connect
+        client = connect()
+        if client is not None:
+            if client.model_key == model_key():
+                _client = client
+            else:
+                print(f"[Embeddings] Server runs {client.model_key}, expected {model_key()}; embedding in-process")
+                client.close()
+    return _client
+
+
+def _drop_server_client(error: Exception) -> None:
+    global _client
+    print(f"[Embeddings] Embedding server unavailable ({error}); falling back to in-process model")
+    if _client is not None:
+        _client.close()
+    _client = None
+
+
+def start_embedding_pool(num_workers: Optional[int] = None):
+    """
+    Start the process-wide embedding pool (idempotent).
+
+    Large embed_texts calls are sharded across its workers until
+    stop_embedding_pool() is called or the process exits.
+    """
+    global _pool
+    if _pool is None:
+        from src.embeddings.embedding_pool import EmbeddingPool
+        _pool = EmbeddingPool(num_workers or EMBEDDING_NUM_WORKERS or 2)
+        atexit.register(stop_embedding_pool)
+    return _pool
+
+
+def stop_embedding_pool() -> None:
+    global _pool
+    if _pool is not None:
+        _pool.close()
+        _pool = None
+
+
+def disable_embedding_pool() -> None:
+    """
+    Always embed in-process in this process, whatever EMBEDDING_NUM_WORKERS says.
+
+    Processes that are already one of several parallel workers (bulk
+    onboarding) call this so each does not start a pool of its own.
+    """
+    global _pool_enabled
+    _pool_enabled = False
+    stop_embedding_pool()
+
+
+def token_lengths(texts: list[str]) -> np.ndarray:
+    """Token count of each text (capped at the model window) via the fast tokenizer."""
     model = _load_model()
-    embeddings = model.encode(texts)
-    return embeddings.tolist()
+    encoded = model.tokenizer(
+        texts,
+        truncation=True,
+        max_length=model.max_seq_length,
+        return_attention_mask=False,
+        return_token_type_ids=False,
+    )
+    return np.fromiter((len(ids) for ids in encoded["input_ids"]), dtype=np.int64, count=len(texts))
+
+
+def _encode(texts: list[str], batch_size: Optional[int] = None) -> np.ndarray:
+    """
+    Encode texts in length-sorted batches into a contiguous float32 matrix.
+
+    Sorting by token length groups similarly sized inputs, so each forward
+    pass pads to a near-uniform length. Rows come back in input order.
+    """
+    model = _load_model()
+    batch_size = batch_size or EMBEDDING_BATCH_SIZE
+    out = np.empty((len(texts), model.get_sentence_embedding_dimension()), dtype=np.float32)
+    if not texts:
+        return out
+
+    order = np.argsort(-token_lengths(texts), kind="stable")
+    for start in range(0, len(texts), batch_size):
+        idx = order[start:start + batch_size]
+        out[idx] = model.encode(
+            [texts[i] for i in idx],
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            show_progress_bar=False,
+        )
+    return out
+
+
+def _encode_many(texts: list[str], batch_size: Optional[int] = None) -> np.ndarray:
+    """Route large workloads to the worker pool, everything else in-process."""
+    if _pool_enabled and len(texts) >= EMBEDDING_POOL_MIN_TEXTS and (_pool is not None or EMBEDDING_NUM_WORKERS > 1):
+        return start_embedding_pool().encode(texts, batch_size)
+    return _encode(texts, batch_size)
+
+
+def embed_texts(texts: list[str], batch_size: Optional[int] = None) -> np.ndarray:
+    """
+    Embed a list of texts.
+
+    Uses the resident embedding server when one is running, otherwise the
+    in-process model.
+
+    Args:
+        texts: Texts to embed
+        batch_size: Texts per forward pass (default: EMBEDDING_BATCH_SIZE)
+
+    Returns:
+        C-contiguous float32 matrix of shape (len(texts), dim). Convert rows
+        to lists only at the vector-store boundary.
+    """
+    client = _server_client() if texts else None
+    if client is not None:
+        try:
+            return client.embed_texts(texts, batch_size)
+        except Exception as e:
+            _drop_server_client(e)
+    return _embed_texts_local(texts, batch_size)
+
+
+def _embed_texts_local(texts: list[str], batch_size: Optional[int] = None) -> np.ndarray:
+    cache = get_embedding_cache()
+    if cache is None or not texts:
+        return _encode_many(texts, batch_size)
+
+    vectors, missing = cache.lookup(texts)
+    if missing:
+        # Embed each distinct missing text once, then scatter back
+        unique = list(dict.fromkeys(texts[i] for i in missing))
+        fresh = _encode_many(unique, batch_size)
+        cache.store(unique, fresh)
+
+        if vectors is None:
+            vectors = np.empty((len(texts), fresh.shape[1]), dtype=np.float32)
+        position = {t: i for i, t in enumerate(unique)}
+        vectors[missing] = fresh[[position[texts[i]] for i in missing]]
+
+        print(f"[Embeddings] {len(texts) - len(missing)} cached, {len(unique)} embedded")
+
+    cache.flush()
+    return vectors
 
 
 def embed_query(text):
+    return embed_queries([text])[0].tolist()
+
+
+def embed_queries(texts: list[str]) -> np.ndarray:
+    """
+    Embed user queries through the LRU query cache.
+
+    Cache misses are deduplicated and embedded together in one forward pass.
+
+    Args:
+        texts: Query strings
+
+    Returns:
+        float32 matrix of shape (len(texts), dim), same order as texts
+    """
+    if not texts:
+        return np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+
+    keys = [normalize_query(t) for t in texts]
+    cached = [_query_cache.get(k) for k in keys]
+
+    missing = list(dict.fromkeys(k for k, v in zip(keys, cached) if v is None))
+    if missing:
+        fresh = _embed_queries_uncached(missing)
+        for key, vector in zip(missing, fresh):
+            _query_cache.put(key, vector)
+        computed = dict(zip(missing, fresh))
+        cached = [v if v is not None else computed[k] for k, v in zip(keys, cached)]
+
+    return np.stack(cached).astype(np.float32, copy=False)
+
+
+def _embed_queries_uncached(texts: list[str]) -> np.ndarray:
+    client = _server_client()
+    if client is not None:
+        try:
+            return client.embed_queries(texts)
+        except Exception as e:
+            _drop_server_client(e)
+    return _embed_queries_local(texts)
+
+
+def _embed_queries_local(texts: list[str]) -> np.ndarray:
     model = _load_model()
-    embeddings = model.encode(text)
-    return embeddings.tolist()
+    vectors = model.encode(texts, batch_size=len(texts), convert_to_numpy=True, show_progress_bar=False)
+    return np.asarray(vectors, dtype=np.float32)
@@ -0,0 +1,294 @@
+"""
+Embedding Server - Long-lived local daemon that keeps the embedder warm.
+
+One-shot CLI runs (orchestrate, cron refreshes) otherwise pay for importing
+torch and loading MiniLM before a single query is embedded. When this daemon
+is running, embed_texts/embed_query forward requests over a Unix socket and
+fall back to in-process loading when it is not.
+
+The daemon is also the single writer of the embedding cache while it runs.
+
+One forward pass runs at a time. Bulk embed_texts requests are split into
+slices of a few batches, and query requests waiting for the model go ahead
+of the next bulk slice, so an interactive query is not stuck behind an
+onboarding run's thousands of chunks.
+
+Usage:
+    cd RAG
+    python -m src.embeddings.embedding_server            # start (foreground)
+    python -m src.embeddings.embedding_server --status
+    python -m src.embeddings.embedding_server --stop
+
+Wire format (both directions): 8-byte header (!II = JSON length, payload
+length), a JSON object, then an optional binary payload. Embedding responses
+carry a float32 row-major matrix as payload.
+
+The socket is only trusted when the current user owns it: clients do not
+connect to, and the server does not unlink, a socket someone else created.
+The server creates its directory 0700 and the socket 0600.
+"""
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import struct
+import threading
+from contextlib import contextmanager
+from typing import Optional
+
+import numpy as np
+
+from src.control_plane.config import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_NUM_WORKERS,
+    EMBEDDING_POOL_MIN_TEXTS,
+    EMBEDDING_SERVER_SOCKET,
+)
+
+_FRAME = struct.Struct("!II")
+BULK_SLICE_BATCHES = 4  # batches per embed_texts slice; queries can run between slices
+
+
+class EmbeddingServerError(RuntimeError):
+    """The daemon returned an error or spoke an unexpected protocol."""
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    buf = bytearray()
+    while len(buf) < size:
+        part = sock.recv(size - len(buf))
+        if not part:
+            raise ConnectionError("Embedding server closed the connection")
+        buf.extend(part)
+    return bytes(buf)
+
+
+def _send_message(sock: socket.socket, header: dict, payload: bytes = b"") -> None:
+    data = json.dumps(header).encode("utf-8")
+    sock.sendall(_FRAME.pack(len(data), len(payload)) + data + payload)
+
+
+def _recv_message(sock: socket.socket) -> tuple[dict, bytes]:
+    header_len, payload_len = _FRAME.unpack(_recv_exact(sock, _FRAME.size))
+    header = json.loads(_recv_exact(sock, header_len))
+    payload = _recv_exact(sock, payload_len) if payload_len else b""
+    return header, payload
+
+
+# ---------------------------------------------------------------- client side
+
+class EmbeddingClient:
+    """Connection to a running embedding daemon (thread-safe)."""
+
+    def __init__(self, socket_path: str = EMBEDDING_SERVER_SOCKET, timeout: float = 300.0):
+        self._lock = threading.Lock()
+        self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._sock.settimeout(timeout)
+        self._sock.connect(socket_path)
+
+        info, _ = self._call({"op": "info"})
+        self.model_key: str = info["model_key"]
+        self.dim: int = info["dim"]
+
+    def _call(self, request: dict) -> tuple[dict, bytes]:
+        with self._lock:
+            _send_message(self._sock, request)
+            header, payload = _recv_message(self._sock)
+        if not header.get("ok"):
+            raise EmbeddingServerError(header.get("error", "unknown error"))
+        return header, payload
+
+    def _matrix(self, request: dict) -> np.ndarray:
+        header, payload = self._call(request)
+        return np.frombuffer(payload, dtype=np.float32).reshape(header["shape"]).copy()
+
+    def embed_texts(self, texts: list[str], batch_size: Optional[int] = None) -> np.ndarray:
+        return self._matrix({"op": "embed_texts", "texts": texts, "batch_size": batch_size})
+
+    def embed_queries(self, texts: list[str]) -> np.ndarray:
+        return self._matrix({"op": "embed_queries", "texts": texts})
+
+    def shutdown(self) -> None:
+        self._call({"op": "shutdown"})
+
+    def close(self) -> None:
+        self._sock.close()
+
+
+def _owned_by_user(path: str) -> bool:
+    return os.stat(path).st_uid == os.getuid()
+
+
+def connect(socket_path: str = EMBEDDING_SERVER_SOCKET) -> Optional[EmbeddingClient]:
+    """Connect to the daemon if it is running as this user, else return None."""
+    if not os.path.exists(socket_path):
+        return None
+    if not _owned_by_user(socket_path):
+        print(f"[EmbeddingServer] Ignoring {socket_path}: owned by another user")
+        return None
+    try:
+        return EmbeddingClient(socket_path)
+    except (OSError, ValueError, EmbeddingServerError):
+        return None
+
+
+# ---------------------------------------------------------------- server side
+
+class _PriorityLock:
+    """Mutex whose waiting query requests are granted before waiting bulk requests."""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._held = False
+        self._queries_waiting = 0
+
+    @contextmanager
+    def hold(self, query: bool):
+        with self._cond:
+            if query:
+                self._queries_waiting += 1
+            try:
+                while self._held or (not query and self._queries_waiting):
+                    self._cond.wait()
+            finally:
+                if query:
+                    self._queries_waiting -= 1
+            self._held = True
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._held = False
+                self._cond.notify_all()
+
+
+class _Handler(socketserver.BaseRequestHandler):
+    def handle(self) -> None:
+        while True:
+            try:
+                request, _ = _recv_message(self.request)
+            except (ConnectionError, OSError):
+                return
+
+            try:
+                header, payload = self.server.dispatch(request)
+            except Exception as e:
+                header, payload = {"ok": False, "error": f"{type(e).__name__}: {e}"}, b""
+            _send_message(self.request, header, payload)
+
+            if request.get("op") == "shutdown":
+                threading.Thread(target=self.server.shutdown, daemon=True).start()
+                return
+
+
+class EmbeddingServer(socketserver.ThreadingUnixStreamServer):
+    """Serves embed requests from the warm in-process model."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: str = EMBEDDING_SERVER_SOCKET):
+        from src.embeddings import embedding_provider
+
+        self.provider = embedding_provider
+        self.model_key = embedding_provider.model_key()
+        self.dim = embedding_provider._load_model().get_sentence_embedding_dimension()
+        embedding_provider.get_embedding_cache()
+
+        # One forward pass at a time (torch already parallelises within a batch);
+        # queries go ahead of the next bulk slice
+        self._model_lock = _PriorityLock()
+
+        socket_dir = os.path.dirname(socket_path) or "."
+        os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+        if not _owned_by_user(socket_dir):
+            raise RuntimeError(f"Socket directory {socket_dir} is owned by another user")
+
+        if os.path.exists(socket_path):
+            if not _owned_by_user(socket_path):
+                raise RuntimeError(f"{socket_path} is owned by another user; refusing to replace it")
+            if connect(socket_path) is not None:
+                raise RuntimeError(f"Embedding server already running on {socket_path}")
+            os.unlink(socket_path)  # stale socket from a dead daemon
+
+        self.socket_path = socket_path
+        super().__init__(socket_path, _Handler)
+
+    def server_bind(self) -> None:
+        super().server_bind()
+        os.chmod(self.socket_path, 0o600)
+
+    def dispatch(self, request: dict) -> tuple[dict, bytes]:
+        op = request.get("op")
+
+        if op == "info":
+            return {"ok": True, "model_key": self.model_key, "dim": self.dim}, b""
+
+        if op == "shutdown":
+            return {"ok": True}, b""
+
+        if op == "embed_queries":
+            with self._model_lock.hold(query=True):
+                vectors = self.provider._embed_queries_local(request["texts"])
+            vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+            return {"ok": True, "shape": list(vectors.shape)}, vectors.tobytes()
+
+        if op == "embed_texts":
+            vectors = self._embed_texts(request["texts"], request.get("batch_size"))
+            return {"ok": True, "shape": list(vectors.shape)}, vectors.tobytes()
+
+        raise ValueError(f"Unknown op: {op}")
+
+    def _embed_texts(self, texts: list[str], batch_size: Optional[int]) -> np.ndarray:
+        """embed_texts in slices, releasing the model between them."""
+        size = (batch_size or EMBEDDING_BATCH_SIZE) * BULK_SLICE_BATCHES
+        if EMBEDDING_NUM_WORKERS > 1:
+            size = max(size, EMBEDDING_POOL_MIN_TEXTS)   # keep slices large enough for the pool
+
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), size):
+            with self._model_lock.hold(query=False):
+                out[start:start + size] = self.provider._embed_texts_local(texts[start:start + size], batch_size)
+        return out
+
+    def server_close(self) -> None:
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.unlink(self.socket_path)
+
+
+def serve(socket_path: str = EMBEDDING_SERVER_SOCKET) -> None:
+    """Run the daemon in the foreground until stopped."""
+    server = EmbeddingServer(socket_path)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown, daemon=True).start())
+    print(f"[EmbeddingServer] {server.model_key} (dim {server.dim}) listening on {socket_path}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("[EmbeddingServer] Stopped")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Resident embedding server")
+    parser.add_argument("--socket", default=EMBEDDING_SERVER_SOCKET, help="Unix socket path")
+    parser.add_argument("--stop", action="store_true", help="Stop a running server")
+    parser.add_argument("--status", action="store_true", help="Report whether a server is running")
+    args = parser.parse_args()
+
+    if args.stop or args.status:
+        client = connect(args.socket)
+        if client is None:
+            print(f"No embedding server on {args.socket}")
+        elif args.stop:
+            client.shutdown()
+            print(f"Stopped embedding server on {args.socket}")
+        else:
+            print(f"Embedding server running on {args.socket}: {client.model_key} (dim {client.dim})")
+    else:
+        serve(args.socket)
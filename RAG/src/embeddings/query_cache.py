@@ -0,0 +1,84 @@
+"""
+Query Cache - Bounded in-memory LRU of query embeddings with optional TTL.
+
+Keys are normalized query text: whitespace collapsed and lower-cased. MiniLM's
+tokenizer is uncased and splits on whitespace, so normalization never changes
+the resulting embedding, only how often repeated questions hit.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional
+
+import numpy as np
+
+
+def normalize_query(text: str) -> str:
+    """Canonical cache key for a query."""
+    return " ".join(text.split()).lower()
+
+
+class QueryEmbeddingCache:
+    """
+    Thread-safe LRU cache: normalized query -> embedding vector.
+
+    Args:
+        max_size: Maximum number of cached queries (0 disables caching)
+        ttl_seconds: Entry lifetime; None or 0 means entries never expire
+    """
+
+    def __init__(self, max_size: int = 1024, ttl_seconds: Optional[float] = None):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds or None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, tuple[float, np.ndarray]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[np.ndarray]:
+        """Return the cached vector for a normalized key, or None."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, vector = entry
+                if self.ttl_seconds is None or time.monotonic() - stored_at < self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return vector
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key: str, vector: np.ndarray) -> None:
+        if self.max_size <= 0:
+            return
+        vector = np.array(vector, dtype=np.float32)
+        vector.setflags(write=False)
+        with self._lock:
+            self._entries[key] = (time.monotonic(), vector)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        """Hit/miss counters and occupancy."""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_size": self.max_size,
+            "ttl_seconds": self.ttl_seconds,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+        }
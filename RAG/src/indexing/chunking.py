@@ -1,10 +1,27 @@
 import hashlib
+from typing import Iterator, Optional
+
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
+from src.control_plane.config import CHUNKING_MODE
+from src.embeddings.embedding_provider import MAX_SEQ_LENGTH, get_tokenizer
+
 
 CHUNK_SIZE = 800
 CHUNK_OVERLAP = 100
-MAX_CHUNKS_PER_DOC = 50 
+MAX_CHUNKS_PER_DOC: Optional[int] = None   # None = index the whole document
+
+# Token mode: every chunk fits the embedder's window ([CLS] + chunk + [SEP])
+CHUNK_TOKENS = MAX_SEQ_LENGTH - 2
+CHUNK_TOKEN_OVERLAP = 32
+
+# Content-defined mode: boundaries come from a rolling (gear) hash of the last
+# 64 characters, so an edit only moves the boundaries next to it
+CDC_MIN_CHARS = 300
+CDC_MAX_CHARS = 1000
+CDC_MASK_BITS = 6           # cut at ~1 in 64 whitespace positions past the minimum (~700 chars avg)
+_GEAR = [int.from_bytes(hashlib.sha256(bytes([i])).digest()[:8], "big") for i in range(256)]
+_MASK64 = (1 << 64) - 1
 
 splitter = RecursiveCharacterTextSplitter(
     chunk_size=CHUNK_SIZE,
@@ -15,22 +32,290 @@ def stable_chunk_id(ticker: str, idx: int, text: str) -> str:
     h = hashlib.sha1(text.encode("utf-8")).hexdigest()[:12]
     return f"{ticker}_{idx}_{h}"
 
-def chunk_document(doc: dict) -> list[dict]:
+def content_chunk_id(ticker: str, text: str) -> str:
+    """Position-independent ID: depends only on the chunk's own text."""
+    h = hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+    return f"{ticker}_c{h}"
+
+
+def token_offsets(texts: list[str]) -> list[list[tuple[int, int]]]:
+    """Character span of every model token, for a batch of texts in one tokenizer call."""
+    encoded = get_tokenizer()(
+        texts,
+        add_special_tokens=False,
+        return_offsets_mapping=True,
+        return_attention_mask=False,
+        return_token_type_ids=False,
+        verbose=False,
+    )
+    return encoded["offset_mapping"]
+
+
+def _continues_word(text: str, offsets: list, k: int) -> bool:
+    """True if token k is a word-piece glued to token k-1 (cutting there splits a word)."""
+    start = offsets[k][0]
+    return (
+        k > 0
+        and start == offsets[k - 1][1]
+        and text[start].isalnum()
+        and text[start - 1].isalnum()
+    )
+
+
+def _pick_cut(text: str, offsets: list, lo: int, hi: int) -> int:
+    """
+    Choose the token index in (lo, hi] that starts the next chunk.
+
+    Prefers a paragraph break, then a sentence end, then any word boundary.
+    """
+    for k in range(hi, lo, -1):
+        if "\n" in text[offsets[k - 1][1]:offsets[k][0]]:
+            return k
+    for k in range(hi, lo, -1):
+        end = offsets[k - 1][1]
+        if text[end - 1] in ".?!;" and offsets[k][0] > end:
+            return k
+    for k in range(hi, lo, -1):
+        if not _continues_word(text, offsets, k):
+            return k
+    return hi
+
+
+def token_spans(
+    text: str,
+    offsets: list,
+    max_tokens: int = CHUNK_TOKENS,
+    overlap: int = CHUNK_TOKEN_OVERLAP
+) -> list[tuple[int, int]]:
+    """
+    Split a tokenized text into (start, end) character spans of at most
+    `max_tokens` model tokens, overlapping by about `overlap` tokens.
+    """
+    spans = []
+    n = len(offsets)
+    i = 0
+    while i < n:
+        end = i + max_tokens
+        k = n if end >= n else _pick_cut(text, offsets, i + max_tokens // 2, end)
+        spans.append((offsets[i][0], offsets[k - 1][1]))
+        if k >= n:
+            break
+
+        nxt = max(k - overlap, i + 1)
+        while nxt < k and _continues_word(text, offsets, nxt):
+            nxt += 1
+        i = nxt
+
+    return spans
+
+
+def cdc_spans(text: str) -> list[tuple[int, int]]:
+    """
+    Content-defined (start, end) character spans.
+
+    A gear hash rolls over the text; a chunk ends after a whitespace
+    character once it is CDC_MIN_CHARS long and the hash's top bits are
+    zero. Chunks longer than CDC_MAX_CHARS are cut at their last whitespace.
+    """
+    spans = []
+    start = 0
+    last_space = -1
+    h = 0
+    shift = 64 - CDC_MASK_BITS
+
+    for i, ch in enumerate(text):
+        h = ((h << 1) + _GEAR[ord(ch) & 0xFF]) & _MASK64
+        size = i + 1 - start
+        if ch.isspace():
+            last_space = i
+            if size >= CDC_MIN_CHARS and (h >> shift) == 0:
+                spans.append((start, i + 1))
+                start = i + 1
+                continue
+        if size >= CDC_MAX_CHARS:
+            cut = last_space + 1 if last_space >= start + CDC_MIN_CHARS else i + 1
+            spans.append((start, cut))
+            start = cut
+
+    if start < len(text):
+        spans.append((start, len(text)))
+    return spans
+
+
+def iter_spans(raw_text: str, mode: str = None) -> Iterator[tuple[int, int, str]]:
+    """
+    Yield (start, end, chunk) with chunk == raw_text[start:end].
+
+    Modes: "chars", "tokens" or "cdc" (default CHUNKING_MODE).
+    """
+    mode = mode or CHUNKING_MODE
+    if mode == "chars":
+        # The splitter returns stripped substrings; recover their offsets in order
+        cursor = 0
+        for chunk in splitter.split_text(raw_text):
+            start = raw_text.find(chunk, cursor)
+            if start < 0:
+                start = raw_text.find(chunk)
+            yield start, start + len(chunk), chunk
+            cursor = start + 1
+    elif mode == "tokens":
+        offsets = token_offsets([raw_text])[0]
+        for s, e in token_spans(raw_text, offsets):
+            yield s, e, raw_text[s:e]
+    elif mode == "cdc":
+        for s, e in cdc_spans(raw_text):
+            chunk = raw_text[s:e]
+            stripped = chunk.strip()
+            if stripped:
+                s += len(chunk) - len(chunk.lstrip())
+                yield s, s + len(stripped), stripped
+    else:
+        raise ValueError(f"Unknown chunking mode: {mode}")
+
+
+def iter_splits(raw_text: str, mode: str = None) -> Iterator[str]:
+    """Yield chunk strings ("chars", "tokens" or "cdc" mode, default CHUNKING_MODE)."""
+    for _, _, chunk in iter_spans(raw_text, mode):
+        yield chunk
+
+
+def split_text(raw_text: str, mode: str = None) -> list[str]:
+    return list(iter_splits(raw_text, mode))
+
+
+def _iter_section_spans(doc: dict, mode: str) -> Iterator[tuple[Optional[str], int, int, str]]:
+    """
+    Yield (section, start, end, chunk) over a document.
+
+    When the document carries "sections" ({"section", "start", "end"} offsets
+    into its text), each section is chunked on its own so no chunk straddles
+    two sections; offsets are always relative to the full document text.
+    """
     raw_text = doc["text"]
+    sections = doc.get("sections") or []
+    if not sections:
+        for s, e, chunk in iter_spans(raw_text, mode):
+            yield None, s, e, chunk
+        return
+
+    for sec in sections:
+        base = sec["start"]
+        for s, e, chunk in iter_spans(raw_text[base:sec["end"]], mode):
+            yield sec["section"], base + s, base + e, chunk
+
+
+def iter_chunks(doc: dict, mode: str = None) -> Iterator[dict]:
+    """
+    Lazily chunk a document.
+
+    Chunk IDs are prefixed with doc["doc_id"] when present (one ticker can
+    have many documents, e.g. BSE PDFs), otherwise with the ticker. In "cdc"
+    mode IDs depend only on chunk content, and repeated chunks are emitted once.
+
+    Each chunk records its character span (char_start/char_end) in the
+    document text and, for sectioned 10-Ks, its section name.
+    """
     ticker = doc.get("ticker") or doc.get("company")
     if not ticker:
         raise KeyError("Document must contain either 'ticker' or 'company' key")
-    splits = splitter.split_text(raw_text)
+    prefix = doc.get("doc_id") or ticker
+    mode = mode or CHUNKING_MODE
+    seen: set[str] = set()
 
-    chunks = []
-    for i, chunk in enumerate(splits[:MAX_CHUNKS_PER_DOC]):
-        chunks.append({
-            "id": stable_chunk_id(ticker, i, chunk),
+    for i, (section, start, end, chunk) in enumerate(_iter_section_spans(doc, mode)):
+        if MAX_CHUNKS_PER_DOC is not None and i >= MAX_CHUNKS_PER_DOC:
+            break
+        if mode == "cdc":
+            chunk_id = content_chunk_id(prefix, chunk)
+            if chunk_id in seen:
+                continue
+            seen.add(chunk_id)
+        else:
+            chunk_id = stable_chunk_id(prefix, i, chunk)
+
+        chunk_record = {
+            "id": chunk_id,
             "ticker": ticker,
             "text": chunk,
             "source": doc["source"],
             "jurisdiction": doc["jurisdiction"],
-            "fetched_at": doc["fetched_at"]
-        })
+            "fetched_at": doc["fetched_at"],
+            "char_start": start,
+            "char_end": end,
+        }
+        if section:
+            chunk_record["section"] = section
+        if doc.get("title"):
+            chunk_record["title"] = doc["title"]
+        yield chunk_record
+
+
+def chunk_document(doc: dict, mode: str = None) -> list[dict]:
+    return list(iter_chunks(doc, mode))
+
+
+def truncation_report(chunks: list[str], max_seq_length: int = MAX_SEQ_LENGTH) -> dict:
+    """
+    Measure how much chunk text the embedder silently drops.
+
+    The model keeps only `max_seq_length` word-pieces (special tokens
+    included); anything after that never reaches the embedding.
+
+    Args:
+        chunks: Chunk texts as they would be embedded
+        max_seq_length: Model window in tokens
+
+    Returns:
+        Dict with truncated chunk count/fraction and characters lost
+    """
+    budget = max_seq_length - 2
+    truncated = 0
+    chars_lost = 0
+    token_counts = []
+
+    for text, offsets in zip(chunks, token_offsets(chunks)):
+        token_counts.append(len(offsets) + 2)
+        if len(offsets) > budget:
+            truncated += 1
+            chars_lost += len(text) - offsets[budget - 1][1]
+
+    chars_total = sum(len(t) for t in chunks)
+    return {
+        "chunks": len(chunks),
+        "truncated": truncated,
+        "truncated_fraction": truncated / len(chunks) if chunks else 0.0,
+        "chars_total": chars_total,
+        "chars_lost": chars_lost,
+        "chars_lost_fraction": chars_lost / chars_total if chars_total else 0.0,
+        "tokens_mean": sum(token_counts) / len(token_counts) if token_counts else 0.0,
+        "tokens_max": max(token_counts, default=0),
+    }
+
+
+if __name__ == "__main__":
+    import sys
+    import time
+
+    from src.control_plane.config import BASE_DATA_DIR
+    from src.jsonl import read_bundle
+
+    if len(sys.argv) != 2:
+        print("Usage: python -m src.indexing.chunking <TICKER>")
+        sys.exit(1)
+
+    path = BASE_DATA_DIR / sys.argv[1].upper() / "unstructured" / "data.jsonl"
+    text = read_bundle(path)["text"]
+    print(f"{path}: {len(text):,} chars")
 
-    return chunks
+    get_tokenizer()
+    for mode in ("chars", "tokens", "cdc"):
+        start = time.perf_counter()
+        splits = split_text(text, mode)
+        elapsed = (time.perf_counter() - start) * 1000
+        report = truncation_report(splits)
+        print(
+            f"\n[{mode}] {len(splits)} chunks in {elapsed:.1f} ms\n"
+            f"  truncated: {report['truncated']} ({report['truncated_fraction']:.1%}), "
+            f"chars lost: {report['chars_lost']:,} ({report['chars_lost_fraction']:.1%}), "
+            f"tokens mean/max: {report['tokens_mean']:.0f}/{report['tokens_max']}"
+        )
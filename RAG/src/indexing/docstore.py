@@ -0,0 +1,85 @@
+"""
+DocStore - Local SQLite store of chunk text keyed by vector ID.
+
+With DOCSTORE_ENABLED=1 the indexer writes each vector's text here instead
+of into Pinecone metadata, so upserts and query responses carry only small
+filterable fields. The reader fills RetrievalMatch.text from this store
+in one bulk read per query.
+
+One file per ticker namespace, next to the vector manifest:
+    data/{TICKER}/_index/docstore.sqlite
+"""
+
+import sqlite3
+from pathlib import Path
+from typing import Iterable, Optional
+
+from src.control_plane.config import BASE_DATA_DIR
+
+_MAX_PARAMS = 900   # stay under SQLite's bound-parameter limit per statement
+
+
+def docstore_path(ticker: str, base_dir: Optional[Path] = None) -> Path:
+    return Path(base_dir or BASE_DATA_DIR) / ticker.upper() / "_index" / "docstore.sqlite"
+
+
+class DocStore:
+    """
+    Vector ID -> text for one ticker namespace.
+
+    Args:
+        path: SQLite file
+        readonly: Open without write access (the file must exist)
+    """
+
+    def __init__(self, path: Path, readonly: bool = False):
+        self.path = Path(path)
+        if readonly:
+            self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True)
+        else:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("CREATE TABLE IF NOT EXISTS docs (id TEXT PRIMARY KEY, text TEXT NOT NULL)")
+
+    @classmethod
+    def for_ticker(cls, ticker: str, base_dir: Optional[Path] = None, readonly: bool = False) -> Optional["DocStore"]:
+        """Open a ticker's store; read-only opens return None when there is no store yet."""
+        path = docstore_path(ticker, base_dir)
+        if readonly and not path.exists():
+            return None
+        return cls(path, readonly=readonly)
+
+    def put(self, vector_id: str, text: str) -> None:
+        self._conn.execute("INSERT OR REPLACE INTO docs (id, text) VALUES (?, ?)", (vector_id, text))
+
+    def put_many(self, items: Iterable[tuple[str, str]]) -> None:
+        """Insert or replace (id, text) pairs (committed on commit()/close())."""
+        self._conn.executemany("INSERT OR REPLACE INTO docs (id, text) VALUES (?, ?)", items)
+
+    def get_many(self, ids: list[str]) -> dict[str, str]:
+        """Bulk read; IDs that are not stored are absent from the result."""
+        found: dict[str, str] = {}
+        for i in range(0, len(ids), _MAX_PARAMS):
+            part = ids[i:i + _MAX_PARAMS]
+            rows = self._conn.execute(
+                f"SELECT id, text FROM docs WHERE id IN ({','.join('?' * len(part))})", part
+            )
+            found.update(rows)
+        return found
+
+    def delete_many(self, ids: Iterable[str]) -> None:
+        self._conn.executemany("DELETE FROM docs WHERE id = ?", ((vid,) for vid in ids))
+
+    def commit(self) -> None:
+        self._conn.commit()
+
+    def close(self) -> None:
+        self._conn.commit()
+        self._conn.close()
+
+    def __enter__(self) -> "DocStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -1,80 +1,53 @@
-import json
 from pathlib import Path
-from src.indexing.chunking import chunk_document
-from src.indexing.upsert_pinecone import (valid_text, upsert_to_namespace)
-from src.embeddings.embedding_provider import embed_texts
+from src.control_plane.config import STRUCTURED_COMPONENTS
+from src.indexing.upsert_pinecone import (
+    index_all_data,
+    index_structured_component,
+    index_unstructured,
+    purge_outdated_namespace,
+)
 
 DATA_DIR = Path(__file__).resolve().parents[3] / "data"
 
 
 
 
-def index_component(ticker: str, report_type:str):
-    ticker= ticker.upper()
-    ids, texts, metas =[],[],[]
+def index_component(ticker: str, report_type: str, base_dir: Path = None):
+    """
+    Index a single component, touching only the vectors it owns.
 
-    if report_type =="unstructured":
-        path = DATA_DIR/ticker/"unstructured"/"data.json"
-        if not path.exists():
-            print(f"Skipping Unstructured: File not found at {path}")
-            return
-        
-        with open(path) as f:
-            bundle = json.load(f)
+    If the ticker's manifest is missing or outdated the namespace is purged
+    and every component is re-indexed instead.
 
-        for doc in bundle.get("documents",[]):
-            raw_text=doc.get("text","")
-            if not valid_text(raw_text):
-                continue
+    Args:
+        ticker: Stock ticker symbol (Pinecone namespace)
+        report_type: "unstructured" or one of STRUCTURED_COMPONENTS
+        base_dir: Optional data root override (default: project_root/data)
+    """
+    ticker = ticker.upper()
+    base_path = str(Path(base_dir or DATA_DIR) / ticker)
 
-            chunks = chunk_document(raw_text)
+    if report_type != "unstructured" and report_type not in STRUCTURED_COMPONENTS:
+        raise ValueError(f"Unknown component: {report_type}")
 
-            for i,chunk in enumerate(chunks):
-                if not valid_text(chunk):
-                    continue
-
-                ids.append(f"{doc['id']}_chunk_{i}")
-                texts.append(chunk)
-                metas.append({
-                    **doc["metadata"],
-                    "ticker": ticker,
-                    "text": chunk,
-                })
-        
-    else :
-
-        struct_dir = DATA_DIR/ticker/"structured"/f"{report_type}.json"
-
-        if not struct_dir.exists():
-            print(f"Skipping Structured: File not found at {struct_dir}")
-            return
-        
-        with open(struct_dir) as f:
-            records=json.load(f)
-
-
-        for record in records:
-            raw_text=record.get("text","")
-            if not valid_text(raw_text):
-                continue
-
-            ids.append(record["id"])
-            texts.append(raw_text)
-            metas.append({
-                **record["metadata"],
-                "ticker": ticker,
-                "text": raw_text,
-            })
-
-
-    if not texts:
-        print(f"No valid text found in {report_type} data for {ticker}.")
+    # A namespace without a trustworthy manifest is purged, so every component is rebuilt
+    if purge_outdated_namespace(ticker, base_path):
+        index_all_data(ticker, base_path)
         return
-    
 
-    vectors=embed_texts(texts)
-    upsert_to_namespace(ids,vectors,metas,ticker)
+    if report_type == "unstructured":
+        index_unstructured(ticker, base_path)
+    else:
+        index_structured_component(ticker, base_path, report_type)
+
     print(f"{report_type.capitalize()} indexing complete for {ticker}.")
 
 
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) != 3:
+        print("Usage: python -m src.indexing.index_components <TICKER> <COMPONENT>")
+        sys.exit(1)
 
+    index_component(sys.argv[1], sys.argv[2])
@@ -0,0 +1,95 @@
+"""
+Index Journal - Write-ahead record of an in-progress component index run.
+
+While a component is being indexed, data/{TICKER}/_index/journal/{component}.jsonl
+exists and gets one line per upsert request the vector store acknowledged:
+
+    {"component": "unstructured", "started_at": "..."}      # header
+    {"acked": {"<vector id>": "<vector hash>", ...}}        # one per request
+
+The file is removed once the manifest has been saved. If the run dies
+first, the next run treats acked (id, hash) pairs as already indexed and
+only sends the rest; embeddings computed before the crash come back from
+the persistent embedding cache. A journal left on disk also tells the
+control plane that the component still needs indexing.
+"""
+
+import json
+import os
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+from src.control_plane.config import BASE_DATA_DIR
+
+
+def journal_dir(ticker: str, base_dir: Optional[Path] = None) -> Path:
+    return Path(base_dir or BASE_DATA_DIR) / ticker.upper() / "_index" / "journal"
+
+
+def pending_components(ticker: str, base_dir: Optional[Path] = None) -> list[str]:
+    """Components whose last index run did not finish."""
+    path = journal_dir(ticker, base_dir)
+    if not path.exists():
+        return []
+    return sorted(p.stem for p in path.glob("*.jsonl"))
+
+
+def discard_journals(ticker: str, base_dir: Optional[Path] = None) -> None:
+    """Drop every unfinished journal of a ticker (its namespace was purged)."""
+    path = journal_dir(ticker, base_dir)
+    if path.exists():
+        for journal in path.glob("*.jsonl"):
+            os.unlink(journal)
+
+
+class IndexJournal:
+    """Append-only journal for one (ticker, component) index run."""
+
+    def __init__(self, path: Path, component: str, acked: dict[str, str]):
+        self.path = path
+        self.component = component
+        self.acked = acked
+        self._lock = threading.Lock()
+
+    @classmethod
+    def open(cls, ticker: str, component: str, base_dir: Optional[Path] = None) -> "IndexJournal":
+        """Resume the component's unfinished journal, or start a new one."""
+        path = journal_dir(ticker, base_dir) / f"{component}.jsonl"
+        acked: dict[str, str] = {}
+
+        if path.exists():
+            with open(path, "r", encoding="utf-8") as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        break   # torn last line from the crash
+                    acked.update(entry.get("acked", {}))
+            print(f"[Journal] Resuming {ticker}/{component}: {len(acked)} vectors already acknowledged")
+        else:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "w", encoding="utf-8") as f:
+                header = {"component": component, "started_at": datetime.now(timezone.utc).isoformat()}
+                f.write(json.dumps(header) + "\n")
+
+        return cls(path, component, acked)
+
+    def is_acked(self, vector_id: str, vector_hash: str) -> bool:
+        return self.acked.get(vector_id) == vector_hash
+
+    def record(self, entries: dict[str, str]) -> None:
+        """Durably append vectors the store acknowledged (thread-safe)."""
+        line = json.dumps({"acked": entries}) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+                f.flush()
+                os.fsync(f.fileno())
+            self.acked.update(entries)
+
+    def complete(self) -> None:
+        """The run finished and the manifest is saved: drop the journal."""
+        if self.path.exists():
+            os.unlink(self.path)
@@ -0,0 +1,136 @@
+"""
+Vector Manifest - Local record of which vectors a ticker namespace holds.
+
+Stored at data/{TICKER}/_index/manifest.json:
+    {
+        "scheme": 1,
+        "namespace": "AAPL",
+        "model": "sentence-transformers/all-MiniLM-L6-v2@onnx",
+        "vectors": {"<vector id>": {"component": "unstructured", "hash": "<sha1>"}}
+    }
+
+The hash covers a vector's text, metadata and the embedding model key
+(model_key(): model + backend), so switching EMBEDDING_BACKEND re-embeds
+every vector. Positional metadata (VOLATILE_METADATA_KEYS) is left out: an
+edit early in a filing shifts the character offsets of every later chunk,
+and those unchanged chunks must not be re-embedded for it.
+
+The indexer diffs each fresh build against the manifest: only new or
+changed vectors are upserted, and IDs whose source disappeared are deleted
+in bulk.
+
+A manifest is only trusted when it carries the current MANIFEST_SCHEME. A
+missing, legacy (unversioned) or other-scheme manifest cannot say which IDs
+the namespace holds, so the indexer purges the namespace and rebuilds it.
+"""
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from src.control_plane.config import BASE_DATA_DIR
+from src.embeddings.embedding_provider import model_key
+
+# Bump when vector IDs or the manifest layout change: older namespaces are purged and rebuilt
+MANIFEST_SCHEME = 1
+
+# Metadata that changes with a chunk's position, not its content
+VOLATILE_METADATA_KEYS = ("char_start", "char_end")
+
+
+def vector_hash(text: str, metadata: dict) -> str:
+    """Hash of a vector's text, stable metadata and the model that embeds it."""
+    stable = {k: v for k, v in metadata.items() if k not in VOLATILE_METADATA_KEYS}
+    payload = json.dumps(stable, sort_keys=True, default=str)
+    return hashlib.sha1(f"{model_key()}\x00{text}\x00{payload}".encode("utf-8")).hexdigest()
+
+
+def manifest_path(ticker: str, base_dir: Optional[Path] = None) -> Path:
+    return Path(base_dir or BASE_DATA_DIR) / ticker.upper() / "_index" / "manifest.json"
+
+
+@dataclass
+class VectorManifest:
+    """Vector ID -> {component, hash} for one ticker namespace."""
+    namespace: str
+    path: Path
+    vectors: dict[str, dict] = field(default_factory=dict)
+    model: Optional[str] = None
+    scheme: Optional[int] = MANIFEST_SCHEME
+
+    @property
+    def current(self) -> bool:
+        """Written with MANIFEST_SCHEME, so it accounts for every vector in the namespace."""
+        return self.scheme == MANIFEST_SCHEME
+
+    @classmethod
+    def load(cls, ticker: str, base_dir: Optional[Path] = None) -> "VectorManifest":
+        """Load the manifest for a ticker (empty, with no scheme, if none was written yet)."""
+        ticker = ticker.upper()
+        path = manifest_path(ticker, base_dir)
+        vectors: dict[str, dict] = {}
+        model = scheme = None
+        if path.exists():
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                vectors, model, scheme = data.get("vectors", {}), data.get("model"), data.get("scheme")
+            except (OSError, ValueError) as e:
+                print(f"[Manifest] Ignoring unreadable manifest {path}: {e}")
+        if vectors and model != model_key():
+            # Hashes include the model key, so every vector is re-embedded on this run
+            print(f"[Manifest] {ticker} was embedded with {model or 'an unrecorded model'}, now {model_key()}")
+        return cls(namespace=ticker, path=path, vectors=vectors, model=model, scheme=scheme)
+
+    def save(self) -> None:
+        """Write atomically (temp file + rename)."""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            self.model, self.scheme = model_key(), MANIFEST_SCHEME
+            json.dump({
+                "scheme": self.scheme,
+                "namespace": self.namespace,
+                "model": self.model,
+                "vectors": self.vectors,
+            }, f)
+        os.replace(tmp, self.path)
+
+    def ids(self, component: str) -> set[str]:
+        """IDs currently recorded for a component."""
+        return {vid for vid, entry in self.vectors.items() if entry.get("component") == component}
+
+    def components(self) -> set[str]:
+        """Components that currently own at least one vector."""
+        return {entry.get("component") for entry in self.vectors.values()}
+
+    def hash_of(self, vector_id: str) -> Optional[str]:
+        entry = self.vectors.get(vector_id)
+        return entry.get("hash") if entry else None
+
+    def diff(self, component: str, entries: dict[str, str]) -> tuple[set[str], set[str]]:
+        """
+        Compare a fresh build of a component against the manifest.
+
+        Args:
+            component: Component name (e.g. "price", "unstructured")
+            entries: Vector ID -> hash for the fresh build
+
+        Returns:
+            (ids to upsert: new or changed, ids to delete: no longer built)
+        """
+        changed = {vid for vid, h in entries.items() if self.hash_of(vid) != h}
+        removed = self.ids(component) - entries.keys()
+        return changed, removed
+
+    def replace_component(self, component: str, entries: dict[str, str]) -> None:
+        """
+        Make `entries` (vector ID -> hash) the full set for a component.
+        """
+        for vid in self.ids(component):
+            del self.vectors[vid]
+        for vid, vhash in entries.items():
+            self.vectors[vid] = {"component": component, "hash": vhash}
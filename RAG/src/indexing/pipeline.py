@@ -0,0 +1,177 @@
+"""
+Indexing Pipeline - Overlaps embedding with concurrent vector upserts.
+
+The calling thread embeds one batch of texts at a time (the model already
+uses every core); finished vectors are cut into upsert requests sized by
+estimated payload bytes and handed to a small thread pool, so embedding
+batch N+1 runs while batch N is on the network. At most `max_in_flight`
+requests are outstanding; when they are all busy the embedder waits,
+which keeps memory bounded.
+"""
+
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Callable, Iterable, Optional
+
+import numpy as np
+
+from src.control_plane.config import (
+    PINECONE_UPSERT_CONCURRENCY,
+    PINECONE_UPSERT_MAX_BYTES,
+    PINECONE_UPSERT_MAX_VECTORS,
+)
+
+EMBED_BATCH_SIZE = 256     # texts embedded per step
+FLOAT_JSON_BYTES = 20      # a float32 serialized in a JSON request body, roughly
+
+
+@dataclass
+class UpsertStats:
+    vectors: int = 0
+    requests: int = 0
+    payload_bytes: int = 0
+
+
+def estimate_vector_bytes(vector_id: str, dim: int, metadata: dict) -> int:
+    """Approximate serialized size of one vector in an upsert request."""
+    return len(vector_id) + dim * FLOAT_JSON_BYTES + len(json.dumps(metadata, default=str)) + 32
+
+
+def payload_batches(
+    ids: list[str],
+    vectors: np.ndarray,
+    metas: list[dict],
+    max_bytes: int = PINECONE_UPSERT_MAX_BYTES,
+    max_vectors: int = PINECONE_UPSERT_MAX_VECTORS
+) -> Iterable[tuple[list[tuple], int]]:
+    """
+    Cut vectors into upsert payloads under both a byte and a count limit.
+
+    Yields:
+        (list of (id, values, metadata), estimated payload bytes)
+    """
+    dim = vectors.shape[1] if vectors.ndim == 2 else 0
+    batch: list[tuple] = []
+    size = 0
+    for vid, row, meta in zip(ids, vectors, metas):
+        row_bytes = estimate_vector_bytes(vid, dim, meta)
+        if batch and (size + row_bytes > max_bytes or len(batch) >= max_vectors):
+            yield batch, size
+            batch, size = [], 0
+        batch.append((vid, row.tolist(), meta))
+        size += row_bytes
+    if batch:
+        yield batch, size
+
+
+class UpsertPipeline:
+    """
+    Embed-and-upsert pipeline for one namespace.
+
+    Args:
+        index: Object with upsert(vectors=..., namespace=...) (a Pinecone Index)
+        namespace: Target namespace (the ticker)
+        embed_fn: texts -> float32 matrix (default: embed_texts)
+        max_in_flight: Concurrent upsert requests
+        max_bytes: Estimated payload bytes per upsert request
+        on_ack: Called with the vector IDs of each request the index accepted
+            (from a worker thread)
+    """
+
+    def __init__(
+        self,
+        index,
+        namespace: str,
+        embed_fn: Optional[Callable[[list[str]], np.ndarray]] = None,
+        max_in_flight: int = PINECONE_UPSERT_CONCURRENCY,
+        max_bytes: int = PINECONE_UPSERT_MAX_BYTES,
+        on_ack: Optional[Callable[[list[str]], None]] = None
+    ):
+        if embed_fn is None:
+            from src.embeddings.embedding_provider import embed_texts
+            embed_fn = embed_texts
+
+        self.index = index
+        self.namespace = namespace
+        self.embed_fn = embed_fn
+        self.max_bytes = max_bytes
+        self.on_ack = on_ack
+        self.stats = UpsertStats()
+
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_in_flight), thread_name_prefix="upsert")
+        self._slots = threading.BoundedSemaphore(max(1, max_in_flight))
+        self._futures: list[Future] = []
+
+    def _upsert(self, batch: list[tuple]) -> None:
+        try:
+            self.index.upsert(vectors=batch, namespace=self.namespace)
+            if self.on_ack is not None:
+                self.on_ack([v[0] for v in batch])
+        finally:
+            self._slots.release()
+
+    def _raise_failures(self) -> None:
+        pending = []
+        for future in self._futures:
+            if future.done():
+                future.result()   # re-raises an upsert error in the caller
+            else:
+                pending.append(future)
+        self._futures = pending
+
+    def submit(self, ids: list[str], vectors: np.ndarray, metas: list[dict]) -> None:
+        """Queue already-embedded vectors; blocks while all upsert slots are busy."""
+        for batch, size in payload_batches(ids, vectors, metas, self.max_bytes):
+            self._slots.acquire()
+            self._futures.append(self._executor.submit(self._upsert, batch))
+            self.stats.requests += 1
+            self.stats.payload_bytes += size
+        self.stats.vectors += len(ids)
+        self._raise_failures()
+
+    def run(
+        self,
+        rows: Iterable[tuple[str, str, dict]],
+        batch_size: int = EMBED_BATCH_SIZE,
+        label: str = "vectors"
+    ) -> UpsertStats:
+        """
+        Embed and upsert (id, text, metadata) rows, pulling them lazily.
+
+        Returns:
+            UpsertStats for everything sent
+        """
+        it = iter(rows)
+        try:
+            while batch := list(islice(it, batch_size)):
+                ids, texts, metas = (list(col) for col in zip(*batch))
+                self.submit(ids, self.embed_fn(texts), metas)
+                print(f"  Embedded {self.stats.vectors} {label}, {self.stats.requests} upsert requests queued "
+                      f"(Namespace: {self.namespace})")
+        finally:
+            self.close()
+        return self.stats
+
+    def close(self) -> None:
+        """Wait for outstanding upserts and surface the first failure."""
+        try:
+            for future in self._futures:
+                future.result()
+        finally:
+            self._futures = []
+            self._executor.shutdown(wait=True)
+
+
+def pipelined_upsert(
+    index,
+    namespace: str,
+    rows: Iterable[tuple[str, str, dict]],
+    label: str = "vectors",
+    embed_fn: Optional[Callable[[list[str]], np.ndarray]] = None,
+    on_ack: Optional[Callable[[list[str]], None]] = None
+) -> UpsertStats:
+    """Convenience wrapper: UpsertPipeline(index, namespace).run(rows)."""
+    return UpsertPipeline(index, namespace, embed_fn=embed_fn, on_ack=on_ack).run(rows, label=label)
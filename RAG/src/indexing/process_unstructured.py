@@ -1,12 +1,12 @@
 import os
-import json
-from chunking import chunk_document 
+from src.indexing.chunking import chunk_document
+from src.jsonl import exists as jsonl_exists, read_bundle
 
 BASE_DIR = "../../../data"
 
 def process_all_unstructured_data():
     """
-    Iterates through all company folders to find and chunk unstructured data.json.
+    Iterates through all company folders to find and chunk unstructured data.jsonl.
     """
     
     tickers = [d for d in os.listdir(BASE_DIR) if os.path.isdir(os.path.join(BASE_DIR, d))]
@@ -15,14 +15,13 @@ def process_all_unstructured_data():
 
     for ticker in tickers:
      
-        file_path = os.path.join(BASE_DIR, ticker, "unstructured", "data.json")
+        file_path = os.path.join(BASE_DIR, ticker, "unstructured", "data.jsonl")
         
-        if not os.path.exists(file_path):
-            print(f"Skipping {ticker}: No unstructured data.json found.")
+        if not jsonl_exists(file_path):
+            print(f"Skipping {ticker}: No unstructured data.jsonl found.")
             continue
 
-        with open(file_path, "r", encoding="utf-8") as f:
-            raw_doc = json.load(f)
+        raw_doc = read_bundle(file_path)
 
        
         doc_for_chunking = {
@@ -30,7 +29,8 @@ def process_all_unstructured_data():
             "text": raw_doc["text"],
             "source": raw_doc["source"],
             "jurisdiction": raw_doc["jurisdiction"],
-            "fetched_at": raw_doc["fetched_at"]
+            "fetched_at": raw_doc["fetched_at"],
+            "sections": raw_doc.get("sections", [])
         }
 
  
@@ -3,29 +3,31 @@ from dotenv import load_dotenv
 load_dotenv()
 import os
 import sys
-import json
-
-from pinecone import Pinecone
-
+from pathlib import Path
 
-from src.indexing.chunking import chunk_document
-from src.embeddings.embedding_provider import embed_texts
+from src.control_plane.config import DOCSTORE_ENABLED
+from src.indexing.chunking import iter_chunks
+from src.indexing.docstore import DocStore, docstore_path
+from src.indexing.journal import IndexJournal, discard_journals
+from src.indexing.manifest import VectorManifest, vector_hash
+from src.indexing.pipeline import UpsertPipeline, pipelined_upsert
+from src.jsonl import exists as jsonl_exists, iter_records, read_bundle
+from src.vector_store import get_vector_store
+from src.unstructured_data.ingestion_unstructured_indian import iter_pdf_documents
 
 
 
 
 INDEX_NAME = "financial-rag"
 BATCH_SIZE = 32
+DELETE_BATCH_SIZE = 1000  # Pinecone max IDs per delete request
 
 
 
-api_key = os.getenv("PINECONE_API_KEY")
-if not api_key:
-    print("ERROR: PINECONE_API_KEY not found in environment.")
-    sys.exit(1)
+def get_index():
+    """The shared VectorStore (Pinecone or local); connects on first request."""
+    return get_vector_store()
 
-pc = Pinecone(api_key=api_key)
-index = pc.Index(INDEX_NAME)
 
 def valid_text(text: str) -> bool:
     return isinstance(text, str) and len(text.strip()) > 50
@@ -38,67 +40,192 @@ def batched(items, size):
 #  Bulk upsert (S + U data)
 
 #  S
-def index_unstructured(ticker: str, base_path: str):
-    path = os.path.join(base_path, "unstructured", "data.json")
-    if not os.path.exists(path):
-        print(f"Skipping Unstructured: File not found at {path}")
-        return
+def iter_unstructured_documents(ticker: str, base_path: str):
+    """Yield every unstructured document for a ticker: the SEC 10-K bundle and/or BSE PDFs."""
+    path = os.path.join(base_path, "unstructured", "data.jsonl")
+    if jsonl_exists(path):
+        print(f"Reading unstructured data for {ticker}...")
+        yield read_bundle(path)
 
-    print(f"Reading unstructured data for {ticker}...")
-    with open(path, "r") as f:
-        doc = json.load(f)
+    yield from iter_pdf_documents(ticker, Path(base_path).parent)
 
-    print(f"Chunking unstructured document...")
-    chunks = chunk_document(doc)
-    
-    ids, texts, metas = [], [], []
-    for chunk in chunks:
-        text = chunk.get("text", "")
-        if not valid_text(text):
-            continue
 
-        ids.append(chunk["id"])
-        texts.append(text)
-        metas.append({
-            "ticker": ticker,
-            "text": text,
-            "source": chunk.get("source"),
-            "data_category": "narrative"
-        })
+def iter_unstructured_chunks(ticker: str, base_path: str):
+    for doc in iter_unstructured_documents(ticker, base_path):
+        for chunk in iter_chunks(doc):
+            if valid_text(chunk.get("text", "")):
+                yield chunk
 
-    if not texts:
-        print("No valid text found in unstructured data.")
-        return
 
-    print(f"Generating embeddings for {len(texts)} chunks...")
-    vectors = embed_texts(texts)
+def delete_ids(ids, ticker, store=None):
+    """Delete vectors from a namespace (and their docstore text) in bulk."""
+    ids = list(ids)
+    for batch in batched(ids, DELETE_BATCH_SIZE):
+        get_index().delete(ids=batch, namespace=ticker)
+    if store is not None:
+        store.delete_many(ids)
 
-    print(f"Upserting {len(vectors)} vectors to Pinecone (Namespace: {ticker})")
-    for batch in batched(list(zip(ids, vectors, metas)), BATCH_SIZE):
-        index.upsert(vectors=batch, namespace=ticker)
-    print("Unstructured indexing complete.")
 
+def open_docstore(ticker: str, base_path: str, existing: bool = False):
+    """
+    The ticker's DocStore when DOCSTORE_ENABLED (else None).
 
-#  U
-def index_narrated_financials(ticker: str, base_path: str):
-    struct_dir = os.path.join(base_path, "structured")
-    if not os.path.exists(struct_dir):
-        print(f"Skipping Structured: Directory not found at {struct_dir}")
+    With existing=True a store left over from an earlier run is opened
+    even when the flag is off, so deletions still reach it.
+    """
+    base_dir = Path(base_path).parent
+    if DOCSTORE_ENABLED or (existing and docstore_path(ticker, base_dir).exists()):
+        return DocStore.for_ticker(ticker, base_dir)
+    return None
+
+
+def purge_outdated_namespace(ticker: str, base_path: str) -> bool:
+    """
+    Empty a namespace whose manifest is missing, unversioned or from another scheme.
+
+    Such a manifest cannot account for the namespace's vectors, so diffing
+    against it would leave orphans behind. Every ID in the namespace is
+    deleted (with its docstore text), unfinished journals are dropped and
+    an empty current-scheme manifest is saved.
+
+    Returns:
+        True if the namespace was purged; the caller must re-index every component
+    """
+    manifest = VectorManifest.load(ticker, Path(base_path).parent)
+    if manifest.current:
+        return False
+
+    state = "missing" if not manifest.path.exists() else f"scheme {manifest.scheme or 'unversioned'}"
+    ids = list(get_index().list_ids(ticker))
+    print(f"  Manifest for {ticker} is {state}; purging {len(ids)} vectors before a full re-index...")
+    store = open_docstore(ticker, base_path, existing=True)
+    delete_ids(ids, ticker, store)
+    if store is not None:
+        store.close()
+    get_index().flush()
+
+    discard_journals(ticker, Path(base_path).parent)
+    VectorManifest(namespace=ticker.upper(), path=manifest.path).save()
+    return True
+
+
+def journal_acks(journal: IndexJournal, hashes: dict[str, str]):
+    """
+    Pipeline on_ack callback that journals acknowledged IDs with their hashes.
+
+    None for stores whose upserts are not durable until flush() (local):
+    for those an interrupted run resumes from the manifest instead.
+    """
+    if not get_index().durable_upserts:
+        return None
+    return lambda ids: journal.record({vid: hashes[vid] for vid in ids})
+
+
+def chunk_metadata(ticker: str, chunk: dict) -> dict:
+    meta = {
+        "ticker": ticker,
+        "text": chunk["text"],
+        "source": chunk.get("source"),
+        "data_category": "narrative"
+    }
+    if chunk.get("section"):
+        meta["section"] = chunk["section"]
+    if "char_start" in chunk:
+        meta["char_start"] = chunk["char_start"]
+        meta["char_end"] = chunk["char_end"]
+    if chunk.get("title"):
+        meta["document"] = chunk["title"]
+    return meta
+
+
+def index_unstructured(ticker: str, base_path: str):
+    """
+    Stream unstructured chunks through the embed/upsert pipeline.
+
+    Documents are read and chunked lazily, so memory stays bounded by a
+    few pipeline batches however many documents/PDFs a ticker has.
+
+    Chunks whose ID and metadata hash already match the ticker's manifest
+    are skipped, and manifest IDs that no longer occur are deleted from
+    the namespace. With DOCSTORE_ENABLED the chunk text goes to the local
+    docstore instead of Pinecone metadata.
+
+    Progress is journaled per acknowledged upsert request, so a run that
+    dies part-way resumes where it stopped.
+    """
+    manifest = VectorManifest.load(ticker, Path(base_path).parent)
+    journal = IndexJournal.open(ticker, "unstructured", Path(base_path).parent)
+    store = open_docstore(ticker, base_path)
+    current: dict[str, str] = {}
+    reused = 0
+
+    def fresh_chunks():
+        nonlocal reused
+        for chunk in iter_unstructured_chunks(ticker, base_path):
+            if chunk["id"] in current:
+                continue
+            meta = chunk_metadata(ticker, chunk)
+            if store is not None:
+                del meta["text"]
+            current[chunk["id"]] = vector_hash(chunk["text"], meta)
+            if (manifest.hash_of(chunk["id"]) == current[chunk["id"]]
+                    or journal.is_acked(chunk["id"], current[chunk["id"]])):
+                reused += 1
+                continue
+            if store is not None:
+                store.put(chunk["id"], chunk["text"])
+            yield chunk["id"], chunk["text"], meta
+
+    try:
+        upserted = pipelined_upsert(
+            get_index(), ticker, fresh_chunks(),
+            label="unstructured chunks", on_ack=journal_acks(journal, current)
+        ).vectors
+    finally:
+        if store is not None:
+            store.commit()
+
+    removed = (manifest.ids("unstructured") | journal.acked.keys()) - current.keys()
+    if removed:
+        print(f"  Deleting {len(removed)} superseded unstructured vectors...")
+        store = store or open_docstore(ticker, base_path, existing=True)
+        delete_ids(removed, ticker, store)
+
+    if store is not None:
+        store.close()
+    get_index().flush()
+    manifest.replace_component("unstructured", current)
+    manifest.save()
+    journal.complete()
+
+    if not current:
+        print("No valid unstructured text found.")
         return
 
-    print(f"Scanning structured directory: {struct_dir}")
-    grouped = {}
-    for fname in os.listdir(struct_dir):
-        if not fname.endswith(".json"):
-            continue
+    print(
+        f"Unstructured indexing complete: {len(current)} chunks, {reused} reused "
+        f"({reused / len(current):.1%}), {upserted} upserted, {len(removed)} deleted."
+    )
+
+
+#  U
+def structured_vectors(ticker: str, base_path: str, component: str):
+    """
+    Build (ids, texts, metas) for one structured component.
 
-        with open(os.path.join(struct_dir, fname), "r") as f:
-            records = json.load(f)
+    Records of structured/{component}.jsonl are grouped per fiscal date into
+    one narrated summary; vector IDs are {ticker}_{report_type}_{date}.
+    """
+    path = os.path.join(base_path, "structured", f"{component}.jsonl")
+    if not jsonl_exists(path):
+        print(f"Skipping {component}: File not found at {path}")
+        return [], [], []
 
-        for record in records:
-            meta = record["metadata"]
-            key = (meta["report_type"], meta["date"])
-            grouped.setdefault(key, []).append(record["text"])
+    grouped = {}
+    for record in iter_records(path):
+        meta = record["metadata"]
+        key = (meta["report_type"], meta["date"])
+        grouped.setdefault(key, []).append(record["text"])
 
     ids, texts, metas = [], [], []
     for (report_type, date), parts in grouped.items():
@@ -117,22 +244,93 @@ def index_narrated_financials(ticker: str, base_path: str):
             "data_category": "narrated_numeric"
         })
 
-    if not texts:
-        print("No valid structured records found.")
-        return
+    return ids, texts, metas
 
-    print(f"Generating embeddings for {len(texts)} financial summaries...")
-    vectors = embed_texts(texts)
 
-    print(f"Upserting {len(vectors)} financial vectors to Pinecone...")
-    for batch in batched(list(zip(ids, vectors, metas)), BATCH_SIZE):
-        index.upsert(vectors=batch, namespace=ticker)
+def index_structured_component(ticker: str, base_path: str, component: str):
+    """
+    Re-index one structured component (e.g. "price") and nothing else.
+
+    The fresh build is diffed against the ticker's manifest: only new or
+    changed vectors are embedded and upserted, and IDs the component no
+    longer produces (e.g. price days that rolled out of the window) are
+    deleted from the namespace.
+    """
+    ids, texts, metas = structured_vectors(ticker, base_path, component)
+    store = open_docstore(ticker, base_path, existing=True)
+    if DOCSTORE_ENABLED:
+        for meta in metas:
+            del meta["text"]
+
+    manifest = VectorManifest.load(ticker, Path(base_path).parent)
+    journal = IndexJournal.open(ticker, component, Path(base_path).parent)
+    entries = {vid: vector_hash(t, m) for vid, t, m in zip(ids, texts, metas)}
+    changed, removed = manifest.diff(component, entries)
+    changed = {vid for vid in changed if not journal.is_acked(vid, entries[vid])}
+    removed |= journal.acked.keys() - entries.keys()
+
+    rows = [(vid, t, m) for vid, t, m in zip(ids, texts, metas) if vid in changed]
+    if rows:
+        if DOCSTORE_ENABLED:
+            store.put_many((vid, t) for vid, t, _ in rows)
+            store.commit()
+        print(f"Embedding and upserting {len(rows)} of {len(ids)} {component} summaries...")
+        pipelined_upsert(
+            get_index(), ticker, rows,
+            label=f"{component} summaries", on_ack=journal_acks(journal, entries)
+        )
+    elif ids:
+        print(f"All {len(ids)} {component} vectors unchanged.")
+    else:
+        print(f"No valid {component} records found.")
+
+    if removed:
+        print(f"  Deleting {len(removed)} superseded {component} vectors...")
+        delete_ids(removed, ticker, store)
+
+    if store is not None:
+        store.close()
+    get_index().flush()
+    manifest.replace_component(component, entries)
+    manifest.save()
+    journal.complete()
+
+
+def remove_component(ticker: str, base_path: str, component: str):
+    """Delete every vector the manifest records for a component."""
+    manifest = VectorManifest.load(ticker, Path(base_path).parent)
+    removed = manifest.ids(component)
+    if removed:
+        print(f"  Deleting {len(removed)} orphaned {component} vectors...")
+        store = open_docstore(ticker, base_path, existing=True)
+        delete_ids(removed, ticker, store)
+        if store is not None:
+            store.close()
+    get_index().flush()
+    manifest.replace_component(component, {})
+    manifest.save()
+
+
+def index_narrated_financials(ticker: str, base_path: str):
+    struct_dir = os.path.join(base_path, "structured")
+    if not os.path.exists(struct_dir):
+        print(f"Skipping Structured: Directory not found at {struct_dir}")
+        return
+
+    print(f"Scanning structured directory: {struct_dir}")
+    on_disk = {os.path.splitext(fname)[0] for fname in os.listdir(struct_dir) if fname.endswith((".jsonl", ".json"))}
+    for component in sorted(on_disk):
+        index_structured_component(ticker, base_path, component)
+
+    # Components whose file disappeared from disk must not linger in the namespace
+    manifest = VectorManifest.load(ticker, Path(base_path).parent)
+    for component in sorted(manifest.components() - on_disk - {"unstructured"}):
+        remove_component(ticker, base_path, component)
     print("Structured indexing complete.")
 
 
 
 # Base data directory (resolved from this file's location)
-from pathlib import Path
 BASE_DATA_DIR = Path(__file__).resolve().parents[3] / "data"
 
 
@@ -151,6 +349,8 @@ def index_all_data(ticker: str, base_path: str = None):
     print(f"\nStarting full indexing for: {ticker}")
     print("=" * 40)
 
+    purge_outdated_namespace(ticker, base_path)
+
     index_unstructured(ticker, base_path)
     print("-" * 20)
     index_narrated_financials(ticker, base_path)
@@ -160,14 +360,12 @@ def index_all_data(ticker: str, base_path: str = None):
 
 #  Incremental upert
 
-def get_index():
-    return index
-
 def upsert_to_namespace(ids, vectors, metas, ticker):
-    """Upsert vectors to a specific namespace (ticker)."""
-    payload = list(zip(ids, vectors, metas))
-    for batch in batched(payload, BATCH_SIZE):
-        index.upsert(vectors=batch, namespace=ticker)
+    """Upsert vectors (float32 matrix from embed_texts) to a specific namespace (ticker)."""
+    pipeline = UpsertPipeline(get_index(), ticker)
+    pipeline.submit(ids, vectors, metas)
+    pipeline.close()
+    get_index().flush()
 
 
 
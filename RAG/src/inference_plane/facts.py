@@ -0,0 +1,335 @@
+"""
+Fact Index - Direct answers to exact metric lookups from the structured dataset.
+
+"What was the Net Income in 2024?" does not need an embedding and a vector
+search that hopes the right narrated row ranks in the top k: the number is
+a cell of the income statement. The index holds every statement line item,
+info field and derived metric (structured/derived.py) of the loaded tickers
+in a dict keyed by (ticker, metric, fiscal year), so answering is a phrase
+match over the query plus dictionary lookups.
+
+Metrics are matched by normalized name ("netIncome", "Net Income" and
+"net income" are the same metric) or by an alias ("revenue" -> Total
+Revenue, "capex" -> Capital Expenditure). The fiscal year of a statement
+row is the calendar year of its period end date; a query without a year
+gets the most recent period. Info fields have no period.
+
+Like the rest of the inference plane the index is read-only. Tickers are
+loaded on first use; the orchestrator drops a ticker after the control
+plane rewrites its structured data, and it is reloaded on the next query.
+"""
+
+import math
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+from src.structured.dataset import iter_ticker_frames, scan
+
+FACT_REPORT_TYPES = ["income_stmt", "balance_sheet", "cash_flow", "info", "derived"]
+
+# Alias -> metric (both normalized). Targets are yfinance line items / info keys.
+METRIC_ALIASES = {
+    "revenue": "total revenue",
+    "revenues": "total revenue",
+    "sales": "total revenue",
+    "net sales": "total revenue",
+    "turnover": "total revenue",
+    "top line": "total revenue",
+    "profit": "net income",
+    "net profit": "net income",
+    "earnings": "net income",
+    "bottom line": "net income",
+    "operating profit": "operating income",
+    "eps": "diluted eps",
+    "earnings per share": "diluted eps",
+    "capex": "capital expenditure",
+    "capital expenditures": "capital expenditure",
+    "fcf": "free cash flow",
+    "debt": "total debt",
+    "cash": "cash and cash equivalents",
+    "assets": "total assets",
+    "liabilities": "total liabilities net minority interest",
+    "total liabilities": "total liabilities net minority interest",
+    "equity": "stockholders equity",
+    "shareholders equity": "stockholders equity",
+    "market capitalization": "market cap",
+    "market value": "market cap",
+    "pe": "forward pe",
+    "p e": "forward pe",
+    "pe ratio": "forward pe",
+    "profit margin": "profit margins",
+    "dividend": "dividend yield",
+    "company name": "long name",
+    # structured/derived.py
+    "yoy revenue growth": "revenue growth",
+    "revenue growth yoy": "revenue growth",
+    "sales growth": "revenue growth",
+    "earnings growth": "net income growth",
+    "profit growth": "net income growth",
+    "roe": "return on equity",
+    "d e": "debt to equity",
+    "debt equity": "debt to equity",
+    "debt to equity ratio": "debt to equity",
+    "leverage": "debt to equity",
+    "fcf margin": "free cash flow margin",
+    "volatility": "price volatility",
+    "stock return": "price return",
+    "share price return": "price return",
+    "1 m price return": "price return 1 m",
+    "3 m price return": "price return 3 m",
+    "1 y price return": "price return 1 y",
+    "1 y volatility": "price volatility 1 y",
+}
+
+# Single-word aliases that are everyday words ("sales strategy", "cash position");
+# matched only when the query asks for a number (see _asks_for_number)
+GENERIC_ALIASES = {
+    "sales", "turnover", "profit", "earnings", "debt", "cash", "assets",
+    "liabilities", "equity", "dividend", "leverage", "volatility",
+}
+
+_NUMERIC_QUESTION = re.compile(
+    r"\b(how much|how many|what (?:was|were)|value of|amount of|figure for|number for)\b", re.IGNORECASE
+)
+_CAMEL = re.compile(r"(?<=[a-z0-9])(?=[A-Z])|(?<=[0-9])(?=[a-z])")
+_NON_WORD = re.compile(r"[^a-z0-9]+")
+_YEAR = re.compile(r"\b(?:fy\s*)?((?:19|20)\d{2})\b", re.IGNORECASE)
+
+
+def _asks_for_number(query: str) -> bool:
+    """True for "what was ... in 2024" / "how much ..." style questions."""
+    return bool(_YEAR.search(query) or _NUMERIC_QUESTION.search(query))
+
+
+def normalize_metric(name: str) -> str:
+    """Lowercase words of a metric name ("totalRevenue" / "Total Revenue" -> "total revenue")."""
+    return " ".join(_NON_WORD.split(_CAMEL.sub(" ", str(name)).lower())).strip()
+
+
+@dataclass
+class Fact:
+    """One value of one metric of one ticker."""
+    ticker: str
+    metric: str
+    period: Optional[int]
+    date: Optional[str]
+    value: object
+    report_type: str
+    fetched_at: Optional[str]
+
+    def __str__(self) -> str:
+        if isinstance(self.value, float) and abs(self.value) > 1_000_000:
+            value = f"{self.value:.0f}"
+        else:
+            value = str(self.value)
+        when = f"FY{self.period}, period ending {self.date}" if self.period is not None else "current"
+        return f"{self.ticker} {self.metric} ({when}): {value} [{self.report_type}]"
+
+    def to_dict(self) -> dict:
+        return {
+            "ticker": self.ticker,
+            "metric": self.metric,
+            "period": self.period,
+            "date": self.date,
+            "value": self.value,
+            "report_type": self.report_type,
+            "fetched_at": self.fetched_at
+        }
+
+
+def _python_value(val):
+    """Plain Python scalar, or None for missing values."""
+    if val is None:
+        return None
+    if hasattr(val, "item"):
+        val = val.item()
+    if isinstance(val, float) and math.isnan(val):
+        return None
+    return val
+
+
+class FactIndex:
+    """
+    In-memory (ticker, metric, fiscal year) -> Fact map over the structured dataset.
+
+    Args:
+        base_dir: Data directory (default BASE_DATA_DIR)
+    """
+
+    def __init__(self, base_dir: Optional[Path] = None):
+        self.base_dir = base_dir
+        self._facts: dict[tuple[str, str, Optional[int]], Fact] = {}
+        self._periods: dict[tuple[str, str], list[Optional[int]]] = {}
+        self._metrics: dict[str, set[str]] = {}
+        self._lock = threading.Lock()
+
+    def load(self, tickers: Optional[Iterable[str]] = None) -> int:
+        """
+        (Re)load tickers from the dataset, one scan per report type.
+
+        Args:
+            tickers: Tickers to load (default: every stored ticker)
+
+        Returns:
+            Number of facts loaded
+        """
+        tickers = [t.upper() for t in tickers] if tickers is not None else None
+        facts: list[Fact] = []
+        for report_type in FACT_REPORT_TYPES:
+            table = scan(report_type, tickers=tickers, base_dir=self.base_dir)
+            for ticker, df in iter_ticker_frames(table):
+                facts.extend(self._frame_facts(ticker, report_type, df))
+
+        with self._lock:
+            for ticker in tickers if tickers is not None else list(self._metrics):
+                self._drop(ticker)
+            for ticker in {f.ticker for f in facts} | set(tickers or []):
+                self._metrics.setdefault(ticker, set())
+            for fact in facts:
+                # A line item reported in several statements keeps its first (FACT_REPORT_TYPES order)
+                key = (fact.ticker, normalize_metric(fact.metric), fact.period)
+                if key not in self._facts:
+                    self._facts[key] = fact
+                    self._metrics[fact.ticker].add(key[1])
+                    self._periods.setdefault(key[:2], []).append(fact.period)
+            for key, periods in self._periods.items():
+                periods.sort(key=lambda p: -1 if p is None else p)
+        return len(facts)
+
+    @staticmethod
+    def _frame_facts(ticker: str, report_type: str, df) -> list[Fact]:
+        content = [c for c in df.columns if not str(c).startswith("_meta")]
+        fetched_at = str(df["_meta_fetched_at"].iloc[0]) if "_meta_fetched_at" in df.columns else None
+
+        if "Date" in df.columns:
+            dates = df["Date"]
+            periods = [None if d is None or d != d else d.year for d in dates.tolist()]
+            labels = [None if p is None else str(d.date()) for p, d in zip(periods, dates.tolist())]
+        else:
+            periods, labels = [None] * len(df), [None] * len(df)
+
+        facts = []
+        for col in content:
+            if col == "Date":
+                continue
+            for period, date, val in zip(periods, labels, df[col].tolist()):
+                val = _python_value(val)
+                if val is None:
+                    continue
+                facts.append(Fact(ticker, str(col), period, date, val, report_type, fetched_at))
+        return facts
+
+    def _drop(self, ticker: str) -> None:
+        for metric in self._metrics.pop(ticker, ()):
+            for period in self._periods.pop((ticker, metric), ()):
+                self._facts.pop((ticker, metric, period), None)
+
+    def invalidate(self, ticker: str) -> None:
+        """Forget a ticker; it is reloaded on its next lookup."""
+        with self._lock:
+            self._drop(ticker.upper())
+
+    def _ensure(self, ticker: str) -> None:
+        if ticker not in self._metrics:
+            self.load([ticker])
+
+    def _resolve(self, ticker: str, name: str) -> Optional[str]:
+        """A ticker's own metric name wins over an alias of the same words."""
+        known = self._metrics.get(ticker, set())
+        if name in known:
+            return name
+        alias = METRIC_ALIASES.get(name)
+        return alias if alias in known else None
+
+    def get(self, ticker: str, metric: str, period: Optional[int] = None) -> Optional[Fact]:
+        """
+        Value of one metric (name or alias) for a fiscal year, or the latest one.
+
+        Args:
+            ticker: Stock ticker
+            metric: e.g. "Net Income", "netIncome", "revenue"
+            period: Fiscal year (default: most recent period)
+
+        Returns:
+            Fact, or None if the ticker has no such metric / period
+        """
+        ticker = ticker.upper()
+        self._ensure(ticker)
+        name = self._resolve(ticker, normalize_metric(metric))
+
+        periods = self._periods.get((ticker, name))
+        if not periods:
+            return None
+        if period is None or periods[-1] is None:
+            period = periods[-1]
+        return self._facts.get((ticker, name, period))
+
+    def match_metrics(self, ticker: str, query: str) -> list[str]:
+        """
+        Metrics of a ticker named in a query, in query order.
+
+        Longest phrases win ("total assets" over "assets"), and a word is
+        used by at most one metric. GENERIC_ALIASES only count when the
+        query asks for a number (a year, "how much", "what was", ...).
+        """
+        ticker = ticker.upper()
+        self._ensure(ticker)
+        known = self._metrics.get(ticker, set())
+        numeric = _asks_for_number(query)
+        words = normalize_metric(query).split()
+        longest = max((len(m.split()) for m in [*known, *METRIC_ALIASES]), default=0)
+
+        found: list[tuple[int, str]] = []
+        used = [False] * len(words)
+        for n in range(min(longest, len(words)), 0, -1):
+            for i in range(len(words) - n + 1):
+                if any(used[i:i + n]):
+                    continue
+                phrase = " ".join(words[i:i + n])
+                if phrase in GENERIC_ALIASES and phrase not in known and not numeric:
+                    continue
+                metric = self._resolve(ticker, phrase)
+                if metric is not None:
+                    found.append((i, metric))
+                    used[i:i + n] = [True] * n
+        return [metric for _, metric in sorted(found)]
+
+    def answer(self, ticker: str, query: str) -> list[Fact]:
+        """
+        Facts for every metric and fiscal year a query asks about.
+
+        "What was the Net Income in 2024?" -> [Net Income, FY2024]. Without a
+        year the latest period is used; with several years, each one.
+
+        Returns:
+            Matching facts ([] if the query names no known metric)
+        """
+        metrics = self.match_metrics(ticker, query)
+        if not metrics:
+            return []
+
+        years = [int(y) for y in _YEAR.findall(query)] or [None]
+        facts = []
+        for metric in metrics:
+            for year in years:
+                fact = self.get(ticker, metric, year)
+                if fact is not None and fact not in facts:
+                    facts.append(fact)
+        return facts
+
+
+_index: Optional[FactIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_fact_index() -> FactIndex:
+    """Process-wide fact index over BASE_DATA_DIR, created on first call."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = FactIndex()
+    return _index
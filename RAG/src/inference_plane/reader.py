@@ -1,5 +1,5 @@
 """
-Inference Reader - Read-only retrieval from Pinecone.
+Inference Reader - Read-only retrieval from the vector store (Pinecone by default).
 
 This layer is completely read-only and NEVER:
 - Fetches data from external sources
@@ -10,14 +10,14 @@ This layer is completely read-only and NEVER:
 Query Flow:
 1. Convert user query to embedding
 2. Query Pinecone using ticker namespace
-3. Return top-k relevant chunks
+3. Fill in chunk text kept in the local docstore (DOCSTORE_ENABLED)
+4. Return top-k relevant chunks
 """
 
-import os
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Union
 
 from dotenv import load_dotenv
 
@@ -26,10 +26,10 @@ load_dotenv()
 # Add parent path for imports
 sys.path.insert(0, str(Path(__file__).resolve().parents[2]))
 
-from pinecone import Pinecone
-
 from src.embeddings.embedding_provider import embed_query
-from src.control_plane.config import PINECONE_INDEX_NAME
+from src.control_plane.config import TEN_K_SECTIONS
+from src.indexing.docstore import DocStore
+from src.vector_store import VectorStore, get_vector_store
 
 
 @dataclass
@@ -82,46 +82,86 @@ class RetrievalResult:
         return "\n\n---\n\n".join(texts)
 
 
+def _with_section_filter(
+    filter_dict: Optional[dict],
+    section: Optional[Union[str, list[str]]]
+) -> Optional[dict]:
+    """Merge a section restriction into a Pinecone metadata filter."""
+    if not section:
+        return filter_dict
+
+    sections = [section] if isinstance(section, str) else list(section)
+    unknown = [s for s in sections if s not in TEN_K_SECTIONS]
+    if unknown:
+        raise ValueError(f"Unknown section(s) {unknown}. Expected one of {list(TEN_K_SECTIONS)}")
+
+    section_filter = {"section": {"$in": sections}}
+    if not filter_dict:
+        return section_filter
+    return {"$and": [filter_dict, section_filter]}
+
+
+def _fill_text_from_docstore(ticker: str, matches: list[RetrievalMatch]) -> None:
+    """Set text for matches indexed without it, in one bulk docstore read."""
+    missing = [m.id for m in matches if not m.text]
+    if not missing:
+        return
+    store = DocStore.for_ticker(ticker, readonly=True)
+    if store is None:
+        return
+    with store:
+        texts = store.get_many(missing)
+    for m in matches:
+        if not m.text:
+            m.text = texts.get(m.id, "")
+
+
 class InferenceReader:
     """
     Read-only retrieval layer.
 
-    NEVER modifies data - only queries Pinecone.
-    """
+    NEVER modifies data - only queries the vector store.
+
+    Readers are cheap to create: by default they all use the process-wide
+    store from get_vector_store(), whose client connects on first query.
 
-    def __init__(self):
-        api_key = os.getenv("PINECONE_API_KEY")
-        if not api_key:
-            raise ValueError("PINECONE_API_KEY environment variable not set")
+    Args:
+        store: Vector store to query (default: the shared store for
+            VECTOR_STORE_BACKEND)
+    """
 
-        self.pc = Pinecone(api_key=api_key)
-        self.index = self.pc.Index(PINECONE_INDEX_NAME)
+    def __init__(self, store: Optional[VectorStore] = None):
+        self.index = store or get_vector_store()
 
     def retrieve(
         self,
         query: str,
         ticker: str,
         top_k: int = 5,
-        filter_dict: Optional[dict] = None
+        filter_dict: Optional[dict] = None,
+        section: Optional[Union[str, list[str]]] = None
     ) -> RetrievalResult:
         """
-        Query Pinecone for relevant chunks.
+        Query the vector store for relevant chunks.
 
         Args:
             query: User's query text
             ticker: Stock ticker (used as Pinecone namespace)
             top_k: Number of results to return
             filter_dict: Optional metadata filters
+            section: Optional 10-K section name(s) to search within
+                (keys of TEN_K_SECTIONS, e.g. "risk_factors")
 
         Returns:
             RetrievalResult with matching documents
         """
         ticker = ticker.upper()
+        filter_dict = _with_section_filter(filter_dict, section)
 
         # Step 1: Embed the query
         query_vector = embed_query(query)
 
-        # Step 2: Query Pinecone
+        # Step 2: Query the vector store
         query_params = {
             "vector": query_vector,
             "top_k": top_k,
@@ -144,6 +184,7 @@ class InferenceReader:
                 text=metadata.get("text", ""),
                 metadata=metadata
             ))
+        _fill_text_from_docstore(ticker, matches)
 
         return RetrievalResult(
             query=query,
@@ -152,6 +193,27 @@ class InferenceReader:
             total_matches=len(matches)
         )
 
+    def retrieve_by_section(
+        self,
+        query: str,
+        ticker: str,
+        section: Union[str, list[str]],
+        top_k: int = 5
+    ) -> RetrievalResult:
+        """
+        Query only chunks from the given 10-K section(s).
+
+        Args:
+            query: User's query text
+            ticker: Stock ticker
+            section: Section name or list of names (keys of TEN_K_SECTIONS)
+            top_k: Number of results
+
+        Returns:
+            RetrievalResult with matching documents
+        """
+        return self.retrieve(query=query, ticker=ticker, top_k=top_k, section=section)
+
     def retrieve_by_category(
         self,
         query: str,
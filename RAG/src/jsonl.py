@@ -0,0 +1,118 @@
+"""
+JSON Lines files with a header line - serialized documents and filing bundles.
+
+Layout:
+    {"ticker": "AAPL", "report_type": "price", "fetched_at": "...", "count": 63}   # header
+    {"id": "...", "text": "...", "metadata": {...}}                               # one record per line
+
+Writers produce compact lines (no indentation) and replace the file
+atomically. Readers parse lazily: read_header() reads only the first line,
+so e.g. a freshness check never parses a 10-K body, and iter_records()
+yields one record at a time.
+
+Files from before this format ({name}.json holding a list of records or a
+single bundle dict) are still read when the .jsonl file does not exist;
+writers delete them.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Iterable, Iterator, Union
+
+PathLike = Union[str, Path]
+
+
+def legacy_path(path: PathLike) -> Path:
+    return Path(path).with_suffix(".json")
+
+
+def exists(path: PathLike) -> bool:
+    """True if the .jsonl file or its legacy .json counterpart is on disk."""
+    return Path(path).exists() or legacy_path(path).exists()
+
+
+def write_jsonl(path: PathLike, header: dict, records: Iterable[dict]) -> int:
+    """
+    Atomically write a header line followed by one line per record.
+
+    Returns:
+        Number of records written
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    count = 0
+
+    with open(tmp, "w", encoding="utf-8") as f:
+        f.write(json.dumps(header, ensure_ascii=False, separators=(",", ":")) + "\n")
+        for record in records:
+            f.write(json.dumps(record, ensure_ascii=False, separators=(",", ":")) + "\n")
+            count += 1
+    os.replace(tmp, path)
+
+    legacy = legacy_path(path)
+    if legacy.exists():
+        os.unlink(legacy)
+    return count
+
+
+def _load_legacy(path: PathLike):
+    with open(legacy_path(path), "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def read_header(path: PathLike) -> dict:
+    """The header line only ({} if the file is missing or empty)."""
+    path = Path(path)
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            line = f.readline()
+        return json.loads(line) if line.strip() else {}
+
+    if legacy_path(path).exists():
+        data = _load_legacy(path)
+        if isinstance(data, dict):
+            return {k: v for k, v in data.items() if k != "text"}
+        if data:
+            return dict(data[0].get("metadata", {}))
+    return {}
+
+
+def iter_records(path: PathLike) -> Iterator[dict]:
+    """Yield the records after the header, one line at a time."""
+    path = Path(path)
+    if path.exists():
+        with open(path, "r", encoding="utf-8") as f:
+            f.readline()
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        return
+
+    if legacy_path(path).exists():
+        data = _load_legacy(path)
+        yield from (data if isinstance(data, list) else [data])
+
+
+def write_bundle(path: PathLike, bundle: dict, body_keys: tuple = ("text",)) -> None:
+    """
+    Store a single large document (e.g. a 10-K) as header + one body line.
+
+    Keys in body_keys go to the body line; everything else is the header.
+    """
+    header = {k: v for k, v in bundle.items() if k not in body_keys}
+    body = {k: bundle[k] for k in body_keys if k in bundle}
+    write_jsonl(path, header, [body])
+
+
+def read_bundle(path: PathLike) -> dict:
+    """Header fields merged with the body line (inverse of write_bundle)."""
+    path = Path(path)
+    if not path.exists() and legacy_path(path).exists():
+        return _load_legacy(path)
+
+    bundle = read_header(path)
+    for record in iter_records(path):
+        bundle.update(record)
+    return bundle
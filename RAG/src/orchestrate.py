@@ -31,9 +31,10 @@ from dataclasses import dataclass
 # Add src to path for imports
 sys.path.insert(0, str(Path(__file__).resolve().parent))
 
-from control_plane.config import Jurisdiction
+from control_plane.config import Jurisdiction, STRUCTURED_COMPONENTS, TEN_K_SECTIONS
 from control_plane.manager import ControlPlaneManager, DataChecklist, ControlPlaneResult
 from inference_plane.reader import InferenceReader, RetrievalResult
+from inference_plane.facts import get_fact_index
 
 
 @dataclass
@@ -54,6 +55,9 @@ class OrchestrateResult:
     retrieval_matches: list[dict]
     retrieval_context: str
 
+    # Exact metric lookups answered from the structured dataset
+    structured_answers: list[dict]
+
     @property
     def success(self) -> bool:
         """True if we have some results to return."""
@@ -76,7 +80,8 @@ class OrchestrateResult:
                 "num_matches": len(self.retrieval_matches),
                 "matches": self.retrieval_matches,
                 "context": self.retrieval_context
-            }
+            },
+            "structured_answers": self.structured_answers
         }
 
 
@@ -87,7 +92,8 @@ def orchestrate(
     cik: Optional[str] = None,
     scrip_code: Optional[str] = None,
     force_refresh: bool = False,
-    top_k: int = 5
+    top_k: int = 5,
+    section: Optional[str] = None
 ) -> OrchestrateResult:
     """
     Full pipeline: Control Plane → Inference Plane.
@@ -103,6 +109,7 @@ def orchestrate(
         scrip_code: Scrip code for Indian companies (if not in registry)
         force_refresh: Force refetch regardless of freshness
         top_k: Number of retrieval results to return
+        section: Optional 10-K section to search within (e.g. "risk_factors")
 
     Returns:
         OrchestrateResult with control plane and retrieval results
@@ -131,7 +138,19 @@ def orchestrate(
     jurisdiction_str = control_result.jurisdiction.value if control_result.jurisdiction else None
 
     # ===== INFERENCE PLANE =====
-    print("\n[2/2] Inference Plane: Querying Pinecone...")
+    print("\n[2/2] Inference Plane: Structured lookup, then Pinecone...")
+    structured_answers = []
+    try:
+        facts = get_fact_index()
+        if any(c in STRUCTURED_COMPONENTS for c in control_result.components_updated):
+            facts.invalidate(ticker)
+        for fact in facts.answer(ticker, query):
+            print(f"  Direct answer: {fact}")
+            structured_answers.append(fact.to_dict())
+    except Exception as e:
+        control_result.errors.append(f"Structured lookup error: {str(e)}")
+        print(f"  Structured lookup error: {e}")
+
     retrieval_matches = []
     retrieval_context = ""
 
@@ -140,7 +159,8 @@ def orchestrate(
         retrieval_result: RetrievalResult = reader.retrieve(
             query=query,
             ticker=ticker,
-            top_k=top_k
+            top_k=top_k,
+            section=section
         )
 
         retrieval_matches = [
@@ -176,7 +196,8 @@ def orchestrate(
         components_indexed=control_result.components_indexed,
         control_plane_errors=control_result.errors,
         retrieval_matches=retrieval_matches,
-        retrieval_context=retrieval_context
+        retrieval_context=retrieval_context,
+        structured_answers=structured_answers
     )
 
 
@@ -216,7 +237,8 @@ def control_only(
 def retrieve_only(
     ticker: str,
     query: str,
-    top_k: int = 5
+    top_k: int = 5,
+    section: Optional[str] = None
 ) -> RetrievalResult:
     """
     Run only the Inference Plane (no data management).
@@ -228,12 +250,13 @@ def retrieve_only(
         ticker: Stock ticker symbol
         query: User's query
         top_k: Number of results
+        section: Optional 10-K section to search within
 
     Returns:
         RetrievalResult with matching documents
     """
     reader = InferenceReader()
-    return reader.retrieve(query=query, ticker=ticker, top_k=top_k)
+    return reader.retrieve(query=query, ticker=ticker, top_k=top_k, section=section)
 
 
 # CLI entry point
@@ -249,6 +272,11 @@ if __name__ == "__main__":
     parser.add_argument("--scrip", help="BSE scrip code for Indian companies")
     parser.add_argument("--force", action="store_true", help="Force refresh data")
     parser.add_argument("--top-k", type=int, default=5, help="Number of results")
+    parser.add_argument(
+        "--section",
+        choices=list(TEN_K_SECTIONS),
+        help="Search only this 10-K section"
+    )
 
     args = parser.parse_args()
 
@@ -258,7 +286,8 @@ if __name__ == "__main__":
         cik=args.cik,
         scrip_code=args.scrip,
         force_refresh=args.force,
-        top_k=args.top_k
+        top_k=args.top_k,
+        section=args.section
     )
 
     print("\n--- RESULT ---")
@@ -266,6 +295,9 @@ if __name__ == "__main__":
     print(f"Components Updated: {result.components_updated}")
     print(f"Matches Found: {len(result.retrieval_matches)}")
 
+    for answer in result.structured_answers:
+        print(f"Direct Answer: {answer['metric']} ({answer['period'] or 'current'}) = {answer['value']}")
+
     if result.control_plane_errors:
         print(f"Errors: {result.control_plane_errors}")
 
@@ -1,12 +1,10 @@
 from dotenv import load_dotenv
 load_dotenv()
-import os
-from pinecone import Pinecone
-
 from src.embeddings.embedding_provider import embed_query
+from src.vector_store import get_vector_store
+from src.indexing.docstore import DocStore
 
 
-INDEX_NAME = "financial-rag"
 TICKER = "MSFT"
 
 QUERIES = ["What are the recent risk factors mentioned in the 10-K and how do they relate to Microsoft's total assets and net income in 2024?", "What was the Net Income in 2024?"]
@@ -17,15 +15,13 @@ def run_test(QUERY: str):
     print("="*50)
 
    
-    api_key = os.getenv("PINECONE_API_KEY")
-    if not api_key:
-        print("ERROR: PINECONE_API_KEY not found.")
+    print("Connecting to vector store...")
+    try:
+        index = get_vector_store()
+    except ValueError as e:
+        print(f"ERROR: {e}")
         return
 
-    print(f"Connecting to Pinecone index: {INDEX_NAME}...")
-    pc = Pinecone(api_key=api_key)
-    index = pc.Index(INDEX_NAME)
-
  
     print(f"Embedding query: '{QUERY}'...")
     try:
@@ -44,13 +40,20 @@ def run_test(QUERY: str):
             include_metadata=True
         )
     except Exception as e:
-        print(f"Pinecone Query Error: {e}")
+        print(f"Vector Store Query Error: {e}")
         return
 
 
     matches = res.get("matches", [])
     print(f"📊 Found {len(matches)} relevant matches.\n")
 
+    # Text lives in the local docstore when indexed with DOCSTORE_ENABLED=1
+    stored = {}
+    store = DocStore.for_ticker(TICKER, readonly=True)
+    if store is not None:
+        with store:
+            stored = store.get_many([m.get("id") for m in matches])
+
     for i, match in enumerate(matches, 1):
         metadata = match.get("metadata", {})
         category = metadata.get("data_category", "unknown")
@@ -65,7 +68,7 @@ def run_test(QUERY: str):
             print(f"Report: {metadata.get('report_type')} | Date: {metadata.get('fiscal_date')}")
         
         
-        text = metadata.get("text", "No text available")
+        text = metadata.get("text") or stored.get(match.get("id"), "No text available")
         print(f"Content: {text[:200]}...")
         print("-" * 30 + "\n")
 
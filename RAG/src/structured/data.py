@@ -1,23 +1,182 @@
 import yfinance as yf
 import pandas as pd
 import os
+from contextlib import nullcontext
 from datetime import datetime, timezone
-from typing import Literal, cast
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, ContextManager, Literal, Optional
 from pathlib import Path
-import json
 
 # Import serialization from same package
 try:
-    from .data_serialization import seralize_paraquet
+    from .data_serialization import serialize_frame
+    from .dataset import latest_part, read_ticker, write_report
+    from .price_history import PriceHistory
+    from .derived import derive_for_ticker
 except ImportError:
-    from data_serialization import seralize_paraquet
+    from data_serialization import serialize_frame
+    from dataset import latest_part, read_ticker, write_report
+    from price_history import PriceHistory
+    from derived import derive_for_ticker
+
+from src.control_plane.config import PRICE_HISTORY_YEARS, PRICE_WINDOW_MONTHS
+from src.jsonl import iter_records, write_jsonl
 
 # Base data directory (resolved from this file's location)
 BASE_DIR = Path(__file__).resolve().parents[3] / "data"
 
+ReportType = Literal["price", "income_stmt", "balance_sheet", "cash_flow", "info", "derived"]
+REPORT_TYPES: list[str] = ["price", "income_stmt", "balance_sheet", "cash_flow", "info", "derived"]
+
+
+def _fetch_frame(stock: yf.Ticker, ticker: str, report_type: str) -> pd.DataFrame:
+    """Download one report (other than price) from an existing yfinance handle."""
+    df = pd.DataFrame()
+
+    if report_type == "income_stmt":
+        df = stock.financials.T
+        df.reset_index(inplace=True)
+        df.rename(columns={"index": "Date"}, inplace=True)
+
+    elif report_type == "balance_sheet":
+        df = stock.balance_sheet.T
+        df.reset_index(inplace=True)
+        df.rename(columns={"index": "Date"}, inplace=True)
+
+    elif report_type == "cash_flow":
+        df = stock.cashflow.T
+        df.reset_index(inplace=True)
+        df.rename(columns={"index": "Date"}, inplace=True)
+
+    elif report_type == "info":
+        info_dict = stock.info
+        keys_to_keep = [
+            "longName", "sector", "industry", "marketCap",
+            "forwardPE", "dividendYield", "profitMargins", "totalRevenue"
+        ]
+        filtered_info = {k: [info_dict.get(k)] for k in keys_to_keep}
+        df = pd.DataFrame(filtered_info)
+
+    else:
+        raise ValueError(f"Invalid report_type: {report_type}")
+
+    return df
+
+
+def _stamp_meta(df: pd.DataFrame, ticker: str, report_type: str, fetched_at: str) -> None:
+    df["_meta_ticker"] = ticker
+    df["_meta_report_type"] = report_type
+    df["_meta_source"] = "yfinance"
+    df["_meta_fetched_at"] = fetched_at
+    df["_meta_data_version"] = "v1.0"
+
+
+def _write_docs(path: Path, ticker: str, report_type: str, fetched_at: str, docs: list[dict]) -> None:
+    """Write serialized documents as JSON Lines behind a header line."""
+    header = {"ticker": ticker, "report_type": report_type, "fetched_at": fetched_at, "count": len(docs)}
+    write_jsonl(path, header, docs)
+
+
+def _structured_dir(ticker: str, report_type: str) -> Path:
+    """data/{TICKER}/structured, minus the per-ticker parquet the dataset replaced."""
+    out_dir = BASE_DIR / ticker / "structured"
+    out_dir.mkdir(parents=True, exist_ok=True)
+    legacy = out_dir / f"{report_type}.parquet"
+    if legacy.exists():
+        os.unlink(legacy)
+    return out_dir
+
+
+def _store_frame(df: pd.DataFrame, ticker: str, report_type: str) -> str:
+    """Stamp _meta columns, write the ticker's dataset partition and its serialized documents."""
+    fetched_at = datetime.now(timezone.utc).isoformat()
+    _stamp_meta(df, ticker, report_type, fetched_at)
+
+    parquet_path = write_report(df, report_type, ticker, BASE_DIR)
+
+    out_dir = _structured_dir(ticker, report_type)
+    docs = serialize_frame(read_ticker(report_type, ticker, BASE_DIR))
+    _write_docs(out_dir / f"{report_type}.jsonl", ticker, report_type, fetched_at, docs)
+
+    print(f"Stored structured data for {ticker} ({report_type}) → {parquet_path.parent}")
+    return str(parquet_path)
+
+
+def _update_price(stock: yf.Ticker, ticker: str) -> str:
+    """
+    Append new price sessions to the history and refresh the indexed window.
+
+    Only sessions from the last stored date onward are fetched (the last
+    one again, since it may have been captured mid-session); a ticker with
+    no history is backfilled with PRICE_HISTORY_YEARS of sessions.
+    price.jsonl holds the trailing PRICE_WINDOW_MONTHS, and only the sessions
+    that were fetched (or have no document yet) are serialized.
+    """
+    history = PriceHistory(ticker, BASE_DIR)
+    last = history.last_date()
+
+    if last is None:
+        df = stock.history(period=f"{PRICE_HISTORY_YEARS}y", interval="1d")
+        if df.empty:
+            raise ValueError(f"No price data found for {ticker}")
+    else:
+        df = stock.history(start=last.strftime("%Y-%m-%d"), interval="1d")
+    df.reset_index(inplace=True)
+
+    fetched_at = datetime.now(timezone.utc).isoformat()
+    if not df.empty:
+        _stamp_meta(df, ticker, "price", fetched_at)
+        history.append(df)
+        history.prune()
+
+    window = history.read(start=history.last_date() - pd.DateOffset(months=PRICE_WINDOW_MONTHS))
+    out_dir = _structured_dir(ticker, "price")
+
+    # Reuse documents of sessions that were not refetched; serialize the rest
+    docs_path = out_dir / "price.jsonl"
+    position = {str(d): i for i, d in enumerate(window["Date"].tolist())}
+    fetched = {str(d) for d in df["Date"].tolist()} if not df.empty else set()
+    docs: dict[str, dict] = {}
+    for doc in iter_records(docs_path):
+        date = doc["metadata"]["date"]
+        if date in position and date not in fetched:
+            docs[date] = doc
+
+    missing = [i for d, i in position.items() if d not in docs]
+    for doc in serialize_frame(window.iloc[missing]):
+        docs[doc["metadata"]["date"]] = doc
+
+    ordered = sorted(docs.values(), key=lambda doc: position[doc["metadata"]["date"]])
+    for i, doc in enumerate(ordered):
+        doc["id"] = f"{ticker}_price_{i}"
+    _write_docs(docs_path, ticker, "price", fetched_at, ordered)
+
+    print(
+        f"Stored structured data for {ticker} (price) → {out_dir}: "
+        f"{len(df)} sessions fetched, {len(missing)} serialized, {len(window)} in window"
+    )
+    return str(latest_part("price", ticker, BASE_DIR))
+
+
+def _store_derived(ticker: str) -> str:
+    """Compute derived metrics from the stored statements and price history (no download)."""
+    df = derive_for_ticker(ticker, BASE_DIR)
+    if df.empty:
+        raise ValueError(f"No statements or prices stored to derive metrics for {ticker}")
+    return _store_frame(df, ticker, "derived")
+
+
+def _fetch_and_store(stock: yf.Ticker, ticker: str, report_type: str) -> str:
+    if report_type == "price":
+        return _update_price(stock, ticker)
+    if report_type == "derived":
+        return _store_derived(ticker)
+    return _store_frame(_fetch_frame(stock, ticker, report_type), ticker, report_type)
+
+
 def fetch_and_store_stock_data(
     ticker: str,
-    report_type: Literal["price", "income_stmt", "balance_sheet", "cash_flow", "info"] = "price"
+    report_type: ReportType = "price"
 ) -> str:
 
     print(f"Fetching {report_type} for {ticker}...")
@@ -26,75 +185,75 @@ def fetch_and_store_stock_data(
     stock = yf.Ticker(ticker)
 
     try:
-        df = pd.DataFrame()
+        return _fetch_and_store(stock, ticker, report_type)
 
-        if report_type == "price":
-            df = stock.history(period="3mo", interval="1d")
-            if df.empty:
-                raise ValueError(f"No price data found for {ticker}")
-            df.reset_index(inplace=True)
-
-        elif report_type == "income_stmt":
-            df = stock.financials.T
-            df.reset_index(inplace=True)
-            df.rename(columns={"index": "Date"}, inplace=True)
-
-        elif report_type == "balance_sheet":
-            df = stock.balance_sheet.T
-            df.reset_index(inplace=True)
-            df.rename(columns={"index": "Date"}, inplace=True)
+    except Exception as e:
+        print(f"Error processing {ticker} ({report_type}): {e}")
+        return ""
 
-        elif report_type == "cash_flow":
-            df = stock.cashflow.T
-            df.reset_index(inplace=True)
-            df.rename(columns={"index": "Date"}, inplace=True)
 
-        elif report_type == "info":
-            info_dict = stock.info
-            keys_to_keep = [
-                "longName", "sector", "industry", "marketCap",
-                "forwardPE", "dividendYield", "profitMargins", "totalRevenue"
-            ]
-            filtered_info = {k: [info_dict.get(k)] for k in keys_to_keep}
-            df = pd.DataFrame(filtered_info)
+def fetch_and_store_components(
+    ticker: str,
+    report_types: Optional[list[str]] = None,
+    slot: Optional[Callable[[], ContextManager]] = None
+) -> tuple[dict[str, str], dict[str, str]]:
+    """
+    Fetch several reports for one ticker through a single yfinance handle.
 
-        else:
-            raise ValueError(f"Invalid report_type: {report_type}")
+    The reports are requested concurrently (one thread each) and every
+    successful one is written exactly as fetch_and_store_stock_data would
+    (price incrementally, see _update_price). "derived" is computed last,
+    from what is stored once the downloads have finished.
 
-        fetched_at = datetime.now(timezone.utc)
+    Args:
+        ticker: Stock ticker symbol
+        report_types: Reports to fetch (default: all, including "derived")
+        slot: Context manager factory entered around each report request,
+            e.g. to cap concurrent yfinance requests across processes
 
-        df["_meta_ticker"] = ticker
-        df["_meta_report_type"] = report_type
-        df["_meta_source"] = "yfinance"
-        df["_meta_fetched_at"] = fetched_at.isoformat()
-        df["_meta_data_version"] = "v1.0"
+    Returns:
+        (report_type → parquet path for stored reports,
+         report_type → error message for reports that failed)
+    """
+    ticker = ticker.strip().upper()
+    report_types = list(dict.fromkeys(report_types or REPORT_TYPES))
+    if not report_types:
+        return {}, {}
 
-        out_dir = BASE_DIR / ticker / "structured"
-        out_dir.mkdir(parents=True, exist_ok=True)
+    print(f"Fetching {', '.join(report_types)} for {ticker}...")
+    stock = yf.Ticker(ticker)
 
-        parquet_path = out_dir / f"{report_type}.parquet"
-        df.to_parquet(parquet_path, index=False)
+    downloads = [rt for rt in report_types if rt != "derived"]
+    slot = slot or nullcontext
 
-        docs = seralize_paraquet(str(parquet_path))
+    def fetch(report_type: str) -> str:
+        with slot():
+            return _fetch_and_store(stock, ticker, report_type)
 
-        json_path = out_dir / f"{report_type}.json"
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump(docs, f, indent=2)
+    paths: dict[str, str] = {}
+    failures: dict[str, str] = {}
+    if downloads:
+        with ThreadPoolExecutor(max_workers=len(downloads)) as pool:
+            futures = {pool.submit(fetch, rt): rt for rt in downloads}
+            for future in as_completed(futures):
+                report_type = futures[future]
+                try:
+                    paths[report_type] = future.result()
+                except Exception as e:
+                    print(f"Error processing {ticker} ({report_type}): {e}")
+                    failures[report_type] = str(e)
 
-        print(f"Stored structured data for {ticker} ({report_type}) → {out_dir}")
-        return str(parquet_path)
+    if "derived" in report_types:
+        try:
+            paths["derived"] = _store_derived(ticker)
+        except Exception as e:
+            print(f"Error processing {ticker} (derived): {e}")
+            failures["derived"] = str(e)
 
-    except Exception as e:
-        print(f"Error processing {ticker} ({report_type}): {e}")
-        return ""
+    return paths, failures
 
 if __name__ == "__main__":
     watchlist = ["AAPL", "MSFT"]
-    required_reports = ["price", "income_stmt", "balance_sheet", "cash_flow", "info"]
 
     for symbol in watchlist:
-        for report in required_reports:
-            fetch_and_store_stock_data(
-                symbol,
-                cast(Literal["price", "income_stmt", "balance_sheet", "cash_flow", "info"], report)
-            )
+        fetch_and_store_components(symbol, REPORT_TYPES)
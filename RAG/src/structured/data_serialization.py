@@ -1,47 +1,71 @@
 import pandas as pd
+import numpy as np
 import os
 import json
+import pyarrow.parquet as pq
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 
-def seralize_paraquet(path):
-    try:
-        df = pd.read_parquet(path)
-    except Exception as e:
-        print(f"Error reading {path} ; {e}")
-        return []
+from src.control_plane.config import PRICE_WINDOW_MONTHS
+from src.structured.dataset import iter_ticker_frames, scan, to_ticker_frame
 
-    docs = []
+META_PREFIX = "_meta"
+NO_DATE = "As of fetch time"
 
-    ticker = df["_meta_ticker"].iloc[0]
-    report_type = df["_meta_report_type"].iloc[0]
-    source = df["_meta_source"].iloc[0]
-    fetched_at = df["_meta_fetched_at"].iloc[0]
 
-    for index, row in df.iterrows():
-        content_data = row.drop([c for c in row.index if c.startswith("_meta")])
+def _format_value(val) -> str:
+    if isinstance(val, (int, float)) and abs(val) > 1_000_000:
+        return f"{val:.0f}"
+    return str(val)
+
 
-        if "Date" in row and pd.notna(row["Date"]):
-            date_str = str(row["Date"])
-        else:
-            date_str = "As of fetch time"
+def _column_lines(name: str, values: list, missing: np.ndarray) -> np.ndarray:
+    """One "\\n- {name}: {value}" string per row ("" where the value is missing)."""
+    prefix = f"\n- {name}: "
+    return np.array(
+        ["" if skip else prefix + _format_value(val) for val, skip in zip(values, missing)],
+        dtype=object
+    )
 
-        text_parts = [
-            f"Financial Report for {ticker} ({report_type}) on {date_str}:"
-        ]
 
-        for col, val in content_data.items():
-            if pd.isna(val):
-                continue
+def serialize_frame(df: pd.DataFrame) -> list[dict]:
+    """
+    Narrate every row of a structured-data frame as a document.
+
+    Text is built column by column: each content column is formatted once
+    and the per-row strings are concatenated across columns, instead of
+    materializing a Series per row.
+
+    Args:
+        df: Frame as written by fetch_and_store_stock_data (content + _meta columns)
+
+    Returns:
+        List of {"id", "text", "metadata"} dicts, one per row
+    """
+    if df.empty:
+        return []
+
+    ticker = df["_meta_ticker"].iloc[0]
+    report_type = df["_meta_report_type"].iloc[0]
+    source = df["_meta_source"].iloc[0]
+    fetched_at = df["_meta_fetched_at"].iloc[0]
 
-            if isinstance(val, (int, float)) and abs(val) > 1_000_000:
-                val_str = f"{val:.0f}"
-            else:
-                val_str = str(val)
+    if "Date" in df.columns:
+        missing = df["Date"].isna().to_numpy()
+        dates = [NO_DATE if skip else str(val) for val, skip in zip(df["Date"].tolist(), missing)]
+    else:
+        dates = [NO_DATE] * len(df)
 
-            text_parts.append(f"- {col}: {val_str}")
+    texts = np.array([f"Financial Report for {ticker} ({report_type}) on {d}:" for d in dates], dtype=object)
+    content = df[[c for c in df.columns if not c.startswith(META_PREFIX)]]
+    missing = content.isna().to_numpy()
+    for j, (col, values) in enumerate(content.items()):
+        texts = texts + _column_lines(col, values.tolist(), missing[:, j])
 
-        docs.append({
+    return [
+        {
             "id": f"{ticker}_{report_type}_{index}",
-            "text": "\n".join(text_parts),
+            "text": text,
             "metadata": {
                 "ticker": ticker,
                 "report_type": report_type,
@@ -49,6 +73,69 @@ def seralize_paraquet(path):
                 "source": source,
                 "fetched_at": fetched_at
             }
-        })
+        }
+        for index, text, date_str in zip(df.index.tolist(), texts.tolist(), dates)
+    ]
+
+
+def seralize_paraquet(path):
+    try:
+        df = to_ticker_frame(pq.read_table(path))
+    except Exception as e:
+        print(f"Error reading {path} ; {e}")
+        return []
+
+    return serialize_frame(df)
+
+
+def serialize_many(paths, max_workers: int = 8) -> dict[str, list[dict]]:
+    """
+    Serialize many parquet files (e.g. every component of a watchlist) in one call.
+
+    Files are read and serialized on a thread pool, so parquet decoding
+    (which releases the GIL) overlaps with narrating the previous file.
+
+    Args:
+        paths: Parquet file paths
+        max_workers: Concurrent file reads
+
+    Returns:
+        {path: documents}; unreadable files map to []
+    """
+    paths = [str(p) for p in paths]
+    if not paths:
+        return {}
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(paths)))) as pool:
+        return dict(zip(paths, pool.map(seralize_paraquet, paths)))
+
+
+def serialize_dataset(
+    report_type: str,
+    tickers: Optional[list[str]] = None,
+    filter=None,
+    base_dir=None
+) -> dict[str, list[dict]]:
+    """
+    Serialize one report type for many tickers from a single dataset scan.
+
+    Args:
+        report_type: e.g. "income_stmt"
+        tickers: Restrict to these tickers (default: every stored ticker)
+        filter: Optional pyarrow dataset expression, e.g. a Date range for price
+        base_dir: Data directory (default BASE_DATA_DIR)
+
+    Price is narrated over each ticker's trailing PRICE_WINDOW_MONTHS, like
+    price.jsonl, not its whole history.
 
+    Returns:
+        {ticker: documents}
+    """
+    table = scan(report_type, tickers=tickers, filter=filter, base_dir=base_dir)
+    docs = {}
+    for ticker, df in iter_ticker_frames(table):
+        if report_type == "price" and not df.empty:
+            start = df["Date"].max() - pd.DateOffset(months=PRICE_WINDOW_MONTHS)
+            df = df[df["Date"] >= start].reset_index(drop=True)
+        docs[ticker] = serialize_frame(df)
     return docs
@@ -0,0 +1,267 @@
+"""
+Structured Dataset - One hive-partitioned parquet dataset for every ticker.
+
+Layout:
+    data/_structured/
+        report_type=income_stmt/ticker=AAPL/part-20240628T210000123456.parquet
+        report_type=price/ticker=AAPL/year=2024/part-...parquet     # see price_history.py
+        ...
+
+A scan over a report type (optionally restricted to some tickers, columns
+and a row predicate) is one pyarrow dataset read with partition pruning
+and predicate pushdown, instead of one file open per ticker. Price scans
+keep only the newest copy of a session that was stored more than once.
+
+So that different tickers' files share a schema:
+- tz-aware columns are stored in UTC; the original zone is kept in _meta_tz
+- _meta_columns records the frame's own column order, which the merged
+  (union) schema of a scan does not preserve
+- _meta_dtypes records integer columns, which the union schema widens to
+  double when another ticker stores the same column as float
+read_ticker()/to_ticker_frame() undo all three, giving back the frame as fetched.
+"""
+
+import json
+import os
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from src.control_plane.config import BASE_DATA_DIR
+
+PARTITION_COLUMNS = ["report_type", "ticker", "year"]
+_STORAGE_META = ("_meta_columns", "_meta_tz", "_meta_dtypes")
+
+
+def dataset_root(base_dir: Optional[Path] = None) -> Path:
+    return Path(base_dir or BASE_DATA_DIR) / "_structured"
+
+
+def partition_dir(report_type: str, ticker: str, base_dir: Optional[Path] = None) -> Path:
+    return dataset_root(base_dir) / f"report_type={report_type}" / f"ticker={ticker.upper()}"
+
+
+def part_name() -> str:
+    """New part file name; names sort in write order."""
+    return f"part-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%S%f')}.parquet"
+
+
+def to_dataset_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """Normalize a fetched frame for storage (UTC timestamps, recorded column order and dtypes)."""
+    df = df.copy()
+    content = [c for c in df.columns if not str(c).startswith("_meta")]
+    df["_meta_columns"] = json.dumps([str(c) for c in content])
+
+    zones = {}
+    for col in content:
+        if isinstance(df[col].dtype, pd.DatetimeTZDtype):
+            zones[str(col)] = str(df[col].dt.tz)
+            df[col] = df[col].dt.tz_convert("UTC")
+    df["_meta_tz"] = json.dumps(zones)
+
+    integers = {str(col): str(df[col].dtype) for col in content if pd.api.types.is_integer_dtype(df[col].dtype)}
+    df["_meta_dtypes"] = json.dumps(integers)
+
+    df.columns = [str(c) for c in df.columns]
+    return df
+
+
+def to_ticker_table(table: pa.Table) -> pa.Table:
+    """Inverse of to_dataset_frame for one ticker's rows (drops partition columns)."""
+    table = table.drop_columns([c for c in PARTITION_COLUMNS if c in table.column_names])
+    if table.num_rows == 0:
+        return table
+
+    if "_meta_tz" in table.column_names:
+        zones = json.loads(table.column("_meta_tz")[0].as_py())
+        for col, zone in zones.items():
+            unit = table.schema.field(col).type.unit
+            table = table.set_column(
+                table.column_names.index(col), col, table.column(col).cast(pa.timestamp(unit, tz=zone))
+            )
+        if zones:
+            # The stored pandas metadata would convert these columns back to UTC
+            table = table.replace_schema_metadata(None)
+
+    if "_meta_dtypes" in table.column_names:
+        for col, dtype in json.loads(table.column("_meta_dtypes")[0].as_py()).items():
+            target = pa.from_numpy_dtype(np.dtype(dtype))
+            if col not in table.column_names or table.schema.field(col).type == target:
+                continue
+            column = table.column(col)
+            if column.null_count:
+                continue
+            try:
+                column = column.cast(target)    # safe cast: fails unless every value is integral
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                continue
+            table = table.set_column(table.column_names.index(col), col, column)
+
+    if "_meta_columns" in table.column_names:
+        content = json.loads(table.column("_meta_columns")[0].as_py())
+        meta = [c for c in table.column_names if c.startswith("_meta") and c not in _STORAGE_META]
+        table = table.select(content + meta)
+
+    return table.drop_columns([c for c in _STORAGE_META if c in table.column_names])
+
+
+def to_ticker_frame(table: pa.Table) -> pd.DataFrame:
+    """One ticker's rows as the DataFrame that was fetched."""
+    return to_ticker_table(table).to_pandas()
+
+
+def write_part(
+    df: pd.DataFrame,
+    directory: Path,
+    replace: bool = False
+) -> Path:
+    """
+    Write a normalized frame as a new part file in a partition directory.
+
+    Args:
+        df: Frame from to_dataset_frame
+        directory: Partition directory (created if missing)
+        replace: Remove the directory's other part files once the new one is in place
+
+    Returns:
+        Path of the new part file
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / part_name()
+    tmp = directory / f".{path.name}.tmp"
+    df.to_parquet(tmp, index=False)
+    os.replace(tmp, path)
+
+    if replace:
+        for old in directory.glob("part-*.parquet"):
+            if old != path:
+                os.unlink(old)
+    return path
+
+
+def write_report(df: pd.DataFrame, report_type: str, ticker: str, base_dir: Optional[Path] = None) -> Path:
+    """Replace a ticker's partition of a (non-price) report with one file."""
+    return write_part(to_dataset_frame(df), partition_dir(report_type, ticker, base_dir), replace=True)
+
+
+def latest_part(report_type: str, ticker: str, base_dir: Optional[Path] = None) -> Optional[Path]:
+    """The most recently written part of a ticker's partition, or None."""
+    directory = partition_dir(report_type, ticker, base_dir)
+    if not directory.exists():
+        return None
+    parts = list(directory.rglob("part-*.parquet"))
+    return max(parts, key=lambda p: p.name) if parts else None
+
+
+def open_dataset(report_type: str, base_dir: Optional[Path] = None) -> Optional[ds.Dataset]:
+    """
+    Dataset over every ticker of one report type, or None if nothing is stored.
+
+    The schema is the permissive union of all part files (e.g. an int64
+    column in one ticker and double in another becomes double; a column
+    only some tickers have is null for the rest).
+    """
+    root = dataset_root(base_dir) / f"report_type={report_type}"
+    if not root.exists():
+        return None
+
+    factory = ds.FileSystemDatasetFactory(
+        pa.fs.LocalFileSystem(),
+        pa.fs.FileSelector(str(root), recursive=True),
+        ds.ParquetFileFormat(),
+        ds.FileSystemFactoryOptions(
+            partition_base_dir=str(root),
+            partitioning=ds.HivePartitioning.discover(infer_dictionary=False),
+            selector_ignore_prefixes=[".", "_"]
+        )
+    )
+    schema = factory.inspect(promote_options="permissive", fragments=None)
+    if not schema.names:
+        return None
+    return factory.finish(schema)
+
+
+def scan(
+    report_type: str,
+    tickers: Optional[Iterable[str]] = None,
+    columns: Optional[list[str]] = None,
+    filter: Optional[ds.Expression] = None,
+    base_dir: Optional[Path] = None
+) -> pa.Table:
+    """
+    Read one report type across tickers in a single scan.
+
+    Args:
+        report_type: e.g. "income_stmt"
+        tickers: Restrict to these tickers (partition pruning)
+        columns: Columns to read (projection); "ticker" is always included
+        filter: Extra row predicate, e.g. ds.field("Date") >= pd.Timestamp("2024-01-01", tz="UTC")
+        base_dir: Data directory (default BASE_DATA_DIR)
+
+    Returns:
+        pyarrow Table (empty if nothing matches)
+    """
+    dataset = open_dataset(report_type, base_dir)
+    if dataset is None:
+        return pa.table({})
+
+    expression = filter
+    if tickers is not None:
+        wanted = ds.field("ticker").isin([t.upper() for t in tickers])
+        expression = wanted if expression is None else expression & wanted
+
+    if columns is not None:
+        columns = [c for c in columns if c in dataset.schema.names]
+        if "ticker" not in columns:
+            columns.append("ticker")
+        # Needed by to_ticker_table to restore zones and integer dtypes
+        columns += [c for c in ("_meta_tz", "_meta_dtypes") if c in dataset.schema.names and c not in columns]
+
+    if report_type == "price":
+        return _latest_sessions(dataset, columns, expression)
+    return dataset.to_table(columns=columns, filter=expression)
+
+
+def _latest_sessions(dataset: ds.Dataset, columns: Optional[list[str]], expression) -> pa.Table:
+    """
+    Price rows with one copy per (ticker, Date): the one from the newest part.
+
+    A refetched session is stored in more than one part file (see
+    price_history.py); part names sort in write order.
+    """
+    names = list(columns if columns is not None else dataset.schema.names)
+    projection = list(dict.fromkeys(names + ["Date", "__filename"]))
+
+    table = dataset.to_table(columns=projection, filter=expression)
+    table = table.sort_by([("ticker", "ascending"), ("Date", "ascending"), ("__filename", "ascending")])
+    keys = table.select(["ticker", "Date"]).to_pandas()
+    newest = ~keys.duplicated(keep="last").to_numpy()
+    return table.filter(pa.array(newest)).select(names)
+
+
+def read_ticker(report_type: str, ticker: str, base_dir: Optional[Path] = None) -> pd.DataFrame:
+    """One ticker's frame of a (non-price) report, as it was fetched."""
+    directory = partition_dir(report_type, ticker, base_dir)
+    parts = sorted(directory.glob("part-*.parquet")) if directory.exists() else []
+    if not parts:
+        return pd.DataFrame()
+    return to_ticker_frame(pq.read_table(parts[-1]))
+
+
+def iter_ticker_frames(table: pa.Table) -> Iterable[tuple[str, pd.DataFrame]]:
+    """Split a scan result into (ticker, frame as fetched) pairs, in ticker order."""
+    if table.num_rows == 0:
+        return
+    table = table.sort_by("ticker")
+    offset = 0
+    for item in pc.value_counts(table.column("ticker")):
+        count = item["counts"].as_py()
+        yield item["values"].as_py(), to_ticker_frame(table.slice(offset, count))
+        offset += count
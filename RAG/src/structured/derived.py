@@ -0,0 +1,186 @@
+"""
+Derived Metrics - Ratios and growth rates materialized at ingest.
+
+Margins, growth rates, leverage and price statistics are computed once,
+after the statements and price history are stored, and kept as their own
+structured component ("derived"). It is written, serialized and indexed like
+any report, so "What was the operating margin in 2023?" is one lookup
+instead of several retrievals plus arithmetic in the LLM.
+
+Rows:
+- one per fiscal period of the statements: margins, YoY growth, ROE,
+  debt/equity, current ratio, free cash flow, and the price return and
+  annualized volatility over the fiscal year ending on that date
+- one dated on the last stored session: trailing 1M/3M/1Y returns and
+  1Y volatility
+
+Every column is computed with whole-Series / NumPy array operations;
+there is no per-period Python loop. Ratios are fractions (0.25 = 25%);
+metrics whose inputs are missing or zero are left empty.
+"""
+
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+from src.structured.dataset import read_ticker
+from src.structured.price_history import PriceHistory
+
+STATEMENT_TYPES = ["income_stmt", "balance_sheet", "cash_flow"]
+
+# Input -> (statement, yfinance line items in order of preference)
+LINE_ITEMS: dict[str, tuple[str, list[str]]] = {
+    "revenue": ("income_stmt", ["Total Revenue", "Operating Revenue", "Revenue"]),
+    "gross_profit": ("income_stmt", ["Gross Profit"]),
+    "operating_income": ("income_stmt", ["Operating Income", "EBIT"]),
+    "net_income": ("income_stmt", ["Net Income", "Net Income Common Stockholders"]),
+    "ebitda": ("income_stmt", ["EBITDA", "Normalized EBITDA"]),
+    "total_debt": ("balance_sheet", ["Total Debt"]),
+    "equity": ("balance_sheet", ["Stockholders Equity", "Common Stock Equity"]),
+    "current_assets": ("balance_sheet", ["Current Assets"]),
+    "current_liabilities": ("balance_sheet", ["Current Liabilities"]),
+    "operating_cash_flow": ("cash_flow", ["Operating Cash Flow"]),
+    "capex": ("cash_flow", ["Capital Expenditure"]),
+    "free_cash_flow": ("cash_flow", ["Free Cash Flow"]),
+}
+
+TRADING_DAYS = 252
+TRAILING_WINDOWS = {"1M": pd.DateOffset(months=1), "3M": pd.DateOffset(months=3), "1Y": pd.DateOffset(years=1)}
+
+
+def _line_items(statements: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """Inputs of LINE_ITEMS as numeric columns indexed by period end date (oldest first)."""
+    columns = {}
+    for name, (report_type, candidates) in LINE_ITEMS.items():
+        df = statements.get(report_type)
+        if df is None or df.empty or "Date" not in df.columns:
+            continue
+        item = next((c for c in candidates if c in df.columns), None)
+        if item is not None:
+            columns[name] = pd.Series(pd.to_numeric(df[item], errors="coerce").to_numpy(), index=df["Date"])
+
+    items = pd.DataFrame(columns).reindex(columns=list(LINE_ITEMS))
+    items = items[items.index.notna()]
+    return items.groupby(level=0).last().sort_index()
+
+
+def statement_ratios(statements: dict[str, pd.DataFrame]) -> pd.DataFrame:
+    """
+    Per-period ratios from the income statement, balance sheet and cash flow.
+
+    Args:
+        statements: {report_type: frame as fetched (Date + line item columns)}
+
+    Returns:
+        Frame indexed by period end date (empty if no statement has dates)
+    """
+    x = _line_items(statements)
+    if x.empty:
+        return pd.DataFrame()
+
+    free_cash_flow = x["free_cash_flow"].fillna(x["operating_cash_flow"] + x["capex"])
+    revenue = x["revenue"].where(x["revenue"] != 0)
+    equity = x["equity"].where(x["equity"] != 0)
+
+    ratios = pd.DataFrame({
+        "Revenue Growth": x["revenue"].pct_change(fill_method=None),
+        "Net Income Growth": x["net_income"].pct_change(fill_method=None),
+        "Gross Margin": x["gross_profit"] / revenue,
+        "Operating Margin": x["operating_income"] / revenue,
+        "Net Margin": x["net_income"] / revenue,
+        "EBITDA Margin": x["ebitda"] / revenue,
+        "Return On Equity": x["net_income"] / equity,
+        "Debt To Equity": x["total_debt"] / equity,
+        "Current Ratio": x["current_assets"] / x["current_liabilities"].where(x["current_liabilities"] != 0),
+        "Free Cash Flow": free_cash_flow,
+        "Free Cash Flow Margin": free_cash_flow / revenue,
+    }, index=x.index)
+    return ratios.replace([np.inf, -np.inf], np.nan)
+
+
+def window_stats(price: pd.DataFrame, ends: pd.DatetimeIndex, offset: pd.DateOffset) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Price return and annualized volatility over (end - offset, end] for many windows.
+
+    Window bounds are located with searchsorted and the sums of daily log
+    returns (and their squares) come from prefix sums, so every window costs
+    O(1) after one pass over the history. Windows the history does not fully
+    cover are NaN.
+
+    Args:
+        price: Frame with Date and Close columns
+        ends: Window end dates (naive, exchange local time)
+        offset: Window length
+
+    Returns:
+        (returns, volatilities), one value per end date
+    """
+    nan = np.full(len(ends), np.nan)
+    if price.empty or len(ends) == 0:
+        return nan, nan.copy()
+
+    price = price.sort_values("Date")
+    dates = price["Date"].dt.tz_localize(None).to_numpy() if price["Date"].dt.tz else price["Date"].to_numpy()
+    close = price["Close"].to_numpy(dtype=float)
+
+    log_returns = np.diff(np.log(close))
+    cum = np.concatenate([[0.0], np.cumsum(log_returns)])
+    cum_sq = np.concatenate([[0.0], np.cumsum(log_returns ** 2)])
+
+    end = np.searchsorted(dates, ends.to_numpy(), side="right") - 1
+    start = np.searchsorted(dates, (ends - offset).to_numpy(), side="right") - 1
+    n = end - start
+    valid = (start >= 0) & (n >= 2)
+    start, end, n = np.where(valid, start, 0), np.where(valid, end, 0), np.where(valid, n, 2)
+
+    returns = close[end] / close[start] - 1
+    total, total_sq = cum[end] - cum[start], cum_sq[end] - cum_sq[start]
+    variance = np.clip((total_sq - total ** 2 / n) / (n - 1), 0, None)
+    volatility = np.sqrt(variance * TRADING_DAYS)
+    return np.where(valid, returns, np.nan), np.where(valid, volatility, np.nan)
+
+
+def compute_derived(statements: dict[str, pd.DataFrame], price: pd.DataFrame) -> pd.DataFrame:
+    """
+    Derived metrics frame: one row per fiscal period plus one for the last session.
+
+    Args:
+        statements: {report_type: frame as fetched} for STATEMENT_TYPES
+        price: Daily price history (Date + Close), e.g. PriceHistory.read()
+
+    Returns:
+        Frame with a Date column and one column per metric (empty if there
+        are neither statements nor prices)
+    """
+    periods = statement_ratios(statements)
+    if not periods.empty:
+        returns, volatility = window_stats(price, pd.DatetimeIndex(periods.index), pd.DateOffset(years=1))
+        periods["Price Return"] = returns
+        periods["Price Volatility"] = volatility
+
+    frames = [periods] if not periods.empty else []
+    if not price.empty:
+        last = price["Date"].max()
+        last = pd.DatetimeIndex([last.tz_localize(None) if last.tzinfo else last])
+        trailing = {}
+        for label, offset in TRAILING_WINDOWS.items():
+            returns, volatility = window_stats(price, last, offset)
+            trailing[f"Price Return {label}"] = returns
+            if label == "1Y":
+                trailing[f"Price Volatility {label}"] = volatility
+        frames.append(pd.DataFrame(trailing, index=last))
+
+    if not frames:
+        return pd.DataFrame()
+
+    derived = pd.concat(frames).dropna(how="all").round(6)
+    derived.index.name = "Date"
+    return derived.reset_index()
+
+
+def derive_for_ticker(ticker: str, base_dir: Optional[Path] = None) -> pd.DataFrame:
+    """compute_derived over a ticker's stored statements and price history."""
+    statements = {rt: read_ticker(rt, ticker, base_dir) for rt in STATEMENT_TYPES}
+    return compute_derived(statements, PriceHistory(ticker, base_dir).read())
@@ -0,0 +1,116 @@
+"""
+Price History - Append-only, year-partitioned store of daily price sessions.
+
+Layout (the price partition of the structured dataset, see dataset.py):
+    data/_structured/report_type=price/ticker={TICKER}/
+        year=2024/part-20240628T210000123456.parquet
+        year=2025/part-...parquet
+
+Every update writes only the sessions it fetched as a new part file, so the
+daily cost does not depend on how many years are retained. Part names sort
+in write order; when a session appears in more than one part (the last
+stored session is refetched because it may have been partial), readers keep
+the most recent copy. A year with PRICE_COMPACT_PARTS parts is merged into
+one file, and years older than PRICE_HISTORY_YEARS are dropped.
+"""
+
+import os
+import shutil
+from pathlib import Path
+from typing import Optional
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.control_plane.config import PRICE_COMPACT_PARTS, PRICE_HISTORY_YEARS
+from src.structured.dataset import partition_dir, to_dataset_frame, to_ticker_frame, write_part
+
+
+class PriceHistory:
+    """Daily price sessions of one ticker."""
+
+    def __init__(self, ticker: str, base_dir: Path):
+        self.ticker = ticker.upper()
+        self.root = partition_dir("price", self.ticker, base_dir)
+
+    def _year_dirs(self) -> list[tuple[int, Path]]:
+        if not self.root.exists():
+            return []
+        years = []
+        for path in self.root.glob("year=*"):
+            try:
+                years.append((int(path.name.split("=", 1)[1]), path))
+            except ValueError:
+                continue
+        return sorted(years)
+
+    @staticmethod
+    def _read_parts(year_dir: Path, columns: Optional[list[str]] = None) -> pd.DataFrame:
+        parts = sorted(year_dir.glob("part-*.parquet"))
+        if not parts:
+            return pd.DataFrame()
+        table = pa.concat_tables(
+            [pq.read_table(p, columns=columns) for p in parts], promote_options="permissive"
+        )
+        return to_ticker_frame(table).drop_duplicates(subset="Date", keep="last")
+
+    def last_date(self) -> Optional[pd.Timestamp]:
+        """Most recent stored session (reads the Date column of the latest year only)."""
+        for _, year_dir in reversed(self._year_dirs()):
+            dates = self._read_parts(year_dir, columns=["Date", "_meta_tz"])
+            if not dates.empty:
+                return dates["Date"].max()
+        return None
+
+    def read(self, start: Optional[pd.Timestamp] = None) -> pd.DataFrame:
+        """
+        Sessions on or after `start` (all retained sessions by default), oldest first.
+
+        Only the year partitions that can contain such sessions are opened.
+        """
+        frames = [
+            self._read_parts(year_dir)
+            for year, year_dir in self._year_dirs()
+            if start is None or year >= start.year
+        ]
+        frames = [f for f in frames if not f.empty]
+        if not frames:
+            return pd.DataFrame()
+
+        df = pd.concat(frames, ignore_index=True)
+        if start is not None:
+            df = df[df["Date"] >= start]
+        return df.sort_values("Date").reset_index(drop=True)
+
+    def append(self, df: pd.DataFrame) -> None:
+        """Write fetched sessions (a frame with a Date column) as one new part per year."""
+        if df.empty:
+            return
+
+        for year, rows in df.groupby(df["Date"].dt.year):
+            year_dir = self.root / f"year={year}"
+            write_part(to_dataset_frame(rows), year_dir)
+
+            if len(list(year_dir.glob("part-*.parquet"))) >= PRICE_COMPACT_PARTS:
+                self._compact(year_dir)
+
+    def _compact(self, year_dir: Path) -> None:
+        parts = sorted(year_dir.glob("part-*.parquet"))
+        merged = self._read_parts(year_dir).sort_values("Date")
+        tmp = year_dir / ".compact.tmp"
+        to_dataset_frame(merged).to_parquet(tmp, index=False)
+        os.replace(tmp, parts[-1])     # keeps the newest name, so write order is preserved
+        for part in parts[:-1]:
+            os.unlink(part)
+        print(f"[PriceHistory] Compacted {len(parts)} parts of {self.ticker}/{year_dir.name}")
+
+    def prune(self, keep_years: int = PRICE_HISTORY_YEARS) -> None:
+        """Drop year partitions older than the retention window."""
+        years = self._year_dirs()
+        if not years:
+            return
+        oldest_kept = years[-1][0] - keep_years + 1
+        for year, year_dir in years:
+            if year < oldest_kept:
+                shutil.rmtree(year_dir)
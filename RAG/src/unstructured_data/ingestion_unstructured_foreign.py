@@ -21,17 +21,16 @@ the script is expected to FAIL FAST to prevent RAG corruption.
 Output contract (MANDATORY, DO NOT CHANGE):
 data/
   └── {COMPANY}/
-      ├── structured/
-      │   └── data.json
       └── unstructured/
-          └── data.json
+          └── data.jsonl
 
-The output file contains BOTH content and metadata.
+The output file contains BOTH content and metadata: a header line with
+the metadata (fetched_at, sections, ...) and one body line with the text
+(see src/jsonl.py).
 This script always fetches the latest available 10-K at runtime.
 """
 
 import os
-import json
 import requests
 import re
 import time
@@ -41,6 +40,8 @@ from bs4 import XMLParsedAsHTMLWarning
 from pathlib import Path
 import warnings
 
+from src.jsonl import write_bundle
+
 warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
 
 # Base data directory (resolved from this file's location)
@@ -179,8 +180,14 @@ def normalize_html_to_text(html: str) -> str:
     return text
 
 
-def extract_high_signal_text(text: str) -> str:
-    """Extract key sections from 10-K text."""
+def extract_sections(text: str) -> list[dict]:
+    """
+    Extract key 10-K sections, keeping their labels.
+
+    Returns:
+        List of {"section": name, "text": section_text} in filing order,
+        where name is a key of TEN_K_SECTIONS. Empty if no section was found.
+    """
     def between(start, end):
         s = re.search(start, text, re.I | re.S)
         e = re.search(end, text, re.I | re.S)
@@ -188,41 +195,53 @@ def extract_high_signal_text(text: str) -> str:
             return text[s.start():e.start()]
         return None
 
-    sections = []
+    candidates = [
+        ("business", between(r"Item\s+1\b.*?Business", r"Item\s+1A\b")),
+        ("risk_factors", between(r"Item\s+1A\b", r"Item\s+1B\b")),
+        ("mdna", between(r"Item\s+7\b.*?Management", r"Item\s+7A\b")),
+        ("market_risk", between(r"Item\s+7A\b", r"Item\s+8\b")),
+    ]
 
-    business = between(
-        r"Item\s+1\b.*?Business",
-        r"Item\s+1A\b",
-    )
+    return [
+        {"section": name, "text": sec.strip()}
+        for name, sec in candidates
+        if sec and len(sec) > 5_000
+    ]
 
-    risk = between(
-        r"Item\s+1A\b",
-        r"Item\s+1B\b",
-    )
-
-    mdna = between(
-        r"Item\s+7\b.*?Management",
-        r"Item\s+7A\b",
-    )
 
-    market_risk = between(
-        r"Item\s+7A\b",
-        r"Item\s+8\b",
-    )
+def join_sections(sections: list[dict]) -> tuple[str, list[dict]]:
+    """
+    Join sections into one text capped at MAX_OUTPUT_CHARS.
 
-    for sec in (business, risk, mdna, market_risk):
-        if sec and len(sec) > 5_000:
-            sections.append(sec.strip())
+    Returns:
+        (text, spans) where spans are {"section", "start", "end"} character
+        offsets into text.
+    """
+    parts = []
+    spans = []
+    offset = 0
 
-    if not sections:
-        return text[:MAX_OUTPUT_CHARS]
+    for sec in sections:
+        if offset:
+            parts.append("\n\n")
+            offset += 2
+        remaining = MAX_OUTPUT_CHARS - offset
+        if remaining <= 0:
+            break
+        body = sec["text"][:remaining]
+        parts.append(body)
+        spans.append({"section": sec["section"], "start": offset, "end": offset + len(body)})
+        offset += len(body)
 
-    final = "\n\n".join(sections)
+    return "".join(parts)[:MAX_OUTPUT_CHARS], spans
 
-    if len(final) > MAX_OUTPUT_CHARS:
-        final = final[:MAX_OUTPUT_CHARS]
 
-    return final
+def extract_high_signal_text(text: str) -> str:
+    """Extract key sections from 10-K text."""
+    sections = extract_sections(text)
+    if not sections:
+        return text[:MAX_OUTPUT_CHARS]
+    return join_sections(sections)[0]
 
 
 def ingest_sec_unstructured(*, ticker: str, cik: str) -> dict:
@@ -258,7 +277,11 @@ def ingest_sec_unstructured(*, ticker: str, cik: str) -> dict:
     }
     html = requests.get(filing_url, headers=sec_headers, timeout=60).text
     full_text = normalize_html_to_text(html)
-    signal_text = extract_high_signal_text(full_text)
+    sections = extract_sections(full_text)
+    if sections:
+        signal_text, section_spans = join_sections(sections)
+    else:
+        signal_text, section_spans = full_text[:MAX_OUTPUT_CHARS], []
 
     record = {
         "company": ticker,
@@ -269,17 +292,17 @@ def ingest_sec_unstructured(*, ticker: str, cik: str) -> dict:
         "filing_date": meta["filing_date"],
         "accession": meta["accession"],
         "fetched_at": datetime.now(timezone.utc).isoformat(),
-        "data_version": "v5.0",
+        "data_version": "v5.1",
         "text": signal_text,
+        "sections": section_spans,
     }
 
     # Save to disk using pathlib
     out_dir = BASE_DIR / ticker / "unstructured"
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    out_path = out_dir / "data.json"
-    with open(out_path, "w", encoding="utf-8") as f:
-        json.dump(record, f, indent=2)
+    out_path = out_dir / "data.jsonl"
+    write_bundle(out_path, record)
 
     print(f"[SEC] Saved {len(signal_text)} chars to {out_path}")
     return record
@@ -8,11 +8,13 @@ Note: BSE has rate limiting in place. This script includes delays between reques
 """
 
 import os
+import hashlib
 import requests
 import time
 import json
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
+from typing import Iterator
 
 
 # Base data directory (resolved from this file's location)
@@ -244,6 +246,59 @@ def process_company(ticker: str, scrip_code: str) -> dict:
     return metadata
 
 
+def extract_pdf_text(pdf_path: Path) -> str:
+    """Extract plain text from a filing PDF, page by page."""
+    import fitz  # pymupdf
+
+    with fitz.open(pdf_path) as pdf:
+        return "\n".join(page.get_text() for page in pdf)
+
+
+def iter_pdf_documents(ticker: str, base_dir: Path = BASE_OUTPUT_DIR) -> Iterator[dict]:
+    """
+    Lazily yield one chunkable document per downloaded BSE PDF.
+
+    Only one PDF's text is held in memory at a time.
+
+    Args:
+        ticker: Stock ticker symbol
+        base_dir: Base data directory
+
+    Yields:
+        Dict with doc_id, ticker, text, source, jurisdiction, fetched_at, title
+    """
+    ticker = ticker.upper()
+    unstructured_dir = Path(base_dir) / ticker / "unstructured"
+    raw_dir = unstructured_dir / "raw"
+    if not raw_dir.exists():
+        return
+
+    fetched_at = None
+    metadata_path = unstructured_dir / "metadata.json"
+    if metadata_path.exists():
+        with open(metadata_path, "r", encoding="utf-8") as f:
+            fetched_at = json.load(f).get("fetched_at")
+
+    for pdf_path in sorted(raw_dir.glob("*.pdf")):
+        try:
+            text = extract_pdf_text(pdf_path)
+        except Exception as e:
+            print(f"  [!] Could not read {pdf_path.name}: {e}")
+            continue
+
+        file_hash = hashlib.sha1(pdf_path.name.encode("utf-8")).hexdigest()[:8]
+        yield {
+            "doc_id": f"{ticker}_bse_{file_hash}",
+            "ticker": ticker,
+            "text": text,
+            "source": "BSE India",
+            "jurisdiction": "INDIA",
+            "fetched_at": fetched_at or datetime.fromtimestamp(
+                pdf_path.stat().st_mtime, tz=timezone.utc
+            ).isoformat(),
+            "title": pdf_path.stem,
+        }
+
 
 if __name__ == "__main__":
     targets = [
@@ -0,0 +1,18 @@
+"""
+Vector Store - Backend-neutral vector index.
+
+Backends:
+- pinecone: managed Pinecone index (default)
+- local: in-process index persisted under data/_vector_store
+  (exact search, or HNSW for large namespaces when hnswlib is installed)
+"""
+
+from .base import VectorStore, matches_filter
+from .factory import VECTOR_STORE_BACKENDS, get_vector_store
+
+__all__ = [
+    "VectorStore",
+    "matches_filter",
+    "VECTOR_STORE_BACKENDS",
+    "get_vector_store",
+]
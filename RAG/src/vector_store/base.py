@@ -0,0 +1,100 @@
+"""
+VectorStore - Backend-neutral interface for the vector index.
+
+Method names and keyword arguments follow the Pinecone Index API
+(upsert(vectors=..., namespace=...), query(vector=..., top_k=...)) so call
+sites stay the same whichever backend is configured. Query results are
+dicts shaped like Pinecone responses: {"matches": [{"id", "score", "metadata"}]}.
+"""
+
+import operator
+from abc import ABC, abstractmethod
+from typing import Iterable, Optional
+
+_COMPARISONS = {"$gt": operator.gt, "$gte": operator.ge, "$lt": operator.lt, "$lte": operator.le}
+
+
+class VectorStore(ABC):
+    """One vector index partitioned into namespaces (one per ticker)."""
+
+    # True when a returned upsert() is already durable (False: only after flush())
+    durable_upserts: bool = True
+
+    @abstractmethod
+    def upsert(self, vectors: list[tuple], namespace: str) -> None:
+        """Insert or overwrite (id, values, metadata) tuples."""
+
+    @abstractmethod
+    def query(
+        self,
+        vector: list[float],
+        top_k: int,
+        namespace: str,
+        filter: Optional[dict] = None,
+        include_metadata: bool = True
+    ) -> dict:
+        """Nearest neighbours by cosine similarity, best first."""
+
+    @abstractmethod
+    def delete(self, ids: list[str], namespace: str) -> None:
+        """Remove vectors by ID (unknown IDs are ignored)."""
+
+    @abstractmethod
+    def list_ids(self, namespace: str) -> Iterable[str]:
+        """Every vector ID in a namespace."""
+
+    @abstractmethod
+    def describe_index_stats(self) -> dict:
+        """{"namespaces": {namespace: {"vector_count": n}}, ...}"""
+
+    def namespace_stats(self, namespace: str) -> dict:
+        """Stats for one namespace ({"vector_count": 0} when empty)."""
+        return self.describe_index_stats().get("namespaces", {}).get(namespace, {"vector_count": 0})
+
+    def flush(self) -> None:
+        """Persist pending writes (no-op for remote backends)."""
+
+
+def matches_filter(metadata: dict, flt: Optional[dict]) -> bool:
+    """
+    Evaluate a Pinecone-style metadata filter against one vector's metadata.
+
+    Supports implicit equality, $eq, $ne, $in, $nin, $gt, $gte, $lt, $lte,
+    $exists, $and and $or.
+    """
+    if not flt:
+        return True
+
+    for key, cond in flt.items():
+        if key == "$and":
+            if not all(matches_filter(metadata, sub) for sub in cond):
+                return False
+            continue
+        if key == "$or":
+            if not any(matches_filter(metadata, sub) for sub in cond):
+                return False
+            continue
+
+        value = metadata.get(key)
+        if not isinstance(cond, dict):
+            cond = {"$eq": cond}
+
+        for op, arg in cond.items():
+            if op == "$eq":
+                ok = value == arg
+            elif op == "$ne":
+                ok = value != arg
+            elif op == "$in":
+                ok = value in arg
+            elif op == "$nin":
+                ok = value not in arg
+            elif op == "$exists":
+                ok = (key in metadata) == bool(arg)
+            elif op in _COMPARISONS:
+                ok = value is not None and _COMPARISONS[op](value, arg)
+            else:
+                raise ValueError(f"Unsupported filter operator: {op}")
+            if not ok:
+                return False
+
+    return True
@@ -0,0 +1,51 @@
+"""
+Vector store factory: one shared store per backend (VECTOR_STORE_BACKEND).
+"""
+
+import threading
+from typing import Optional
+
+from src.control_plane.config import VECTOR_STORE_BACKEND
+from src.vector_store.base import VectorStore
+
+VECTOR_STORE_BACKENDS = ("pinecone", "local")
+
+_stores: dict[str, VectorStore] = {}
+_lock = threading.Lock()
+
+
+def _build(backend: str) -> VectorStore:
+    if backend == "pinecone":
+        from src.vector_store.pinecone_store import PineconeVectorStore
+        return PineconeVectorStore()
+
+    if backend == "local":
+        from src.vector_store.local_store import LocalVectorStore
+        return LocalVectorStore()
+
+    raise ValueError(f"Unknown vector store backend: {backend}. Expected one of {VECTOR_STORE_BACKENDS}")
+
+
+def get_vector_store(backend: Optional[str] = None) -> VectorStore:
+    """
+    Process-wide vector store for a backend, created on first call.
+
+    The control plane (indexing) and the inference plane (InferenceReader)
+    share this instance, and with it one Pinecone client and connection
+    pool. Creating the store does no network I/O; Pinecone connects on the
+    first request.
+
+    Args:
+        backend: "pinecone" or "local" (default: VECTOR_STORE_BACKEND)
+
+    Returns:
+        VectorStore instance
+    """
+    backend = backend or VECTOR_STORE_BACKEND
+    store = _stores.get(backend)
+    if store is None:
+        with _lock:
+            store = _stores.get(backend)
+            if store is None:
+                store = _stores[backend] = _build(backend)
+    return store
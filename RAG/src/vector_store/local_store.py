@@ -0,0 +1,273 @@
+"""
+Local backend for VectorStore - in-process, persisted under data/_vector_store.
+
+Each namespace keeps a float32 matrix of L2-normalized vectors, so cosine
+similarity is a single matrix-vector product. Namespaces with at least
+LOCAL_HNSW_MIN_VECTORS vectors are searched through an HNSW graph
+(hnswlib, optional dependency) when it is installed; smaller ones, and
+every filtered query, use exact brute force.
+
+On-disk layout per namespace:
+    {root}/{namespace}/vectors.npy   # (n, dim) float32
+    {root}/{namespace}/records.json  # {"ids": [...], "metadata": [...]}
+    {root}/{namespace}/hnsw.bin      # saved HNSW graph (large namespaces only)
+
+Writes stay in memory until flush() (also run at interpreter exit).
+"""
+
+import atexit
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+
+from src.control_plane.config import LOCAL_HNSW_MIN_VECTORS, LOCAL_VECTOR_STORE_DIR
+from src.vector_store.base import VectorStore, matches_filter
+
+HNSW_M = 16
+HNSW_EF_CONSTRUCTION = 200
+HNSW_EF_SEARCH = 64
+
+
+def _hnswlib():
+    try:
+        import hnswlib
+        return hnswlib
+    except ImportError:
+        return None
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    return matrix / np.maximum(norms, 1e-12)
+
+
+class _Namespace:
+    """Vectors, IDs and metadata of one namespace (rows 0..size-1 are live)."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.ids: list[str] = []
+        self.metas: list[dict] = []
+        self.rows: dict[str, int] = {}
+        self.matrix = np.empty((0, 0), dtype=np.float32)
+        self.dirty = False
+        self.ann = None            # hnswlib.Index over the current rows, or None
+        self.ann_stale = True
+
+        records = path / "records.json"
+        if records.exists():
+            with open(records, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            self.ids = data["ids"]
+            self.metas = data["metadata"]
+            self.rows = {vid: i for i, vid in enumerate(self.ids)}
+            self.matrix = np.load(path / "vectors.npy")
+            self._load_ann(data.get("hnsw_count"))
+
+    @property
+    def size(self) -> int:
+        return len(self.ids)
+
+    @property
+    def dim(self) -> int:
+        return self.matrix.shape[1] if self.matrix.ndim == 2 else 0
+
+    def vectors(self) -> np.ndarray:
+        return self.matrix[:self.size]
+
+    def _load_ann(self, count: Optional[int]) -> None:
+        hnswlib = _hnswlib()
+        ann_path = self.path / "hnsw.bin"
+        if hnswlib is None or count != self.size or not ann_path.exists():
+            return
+        ann = hnswlib.Index(space="cosine", dim=self.dim)
+        ann.load_index(str(ann_path), max_elements=self.size)
+        self.ann, self.ann_stale = ann, False
+
+    def upsert(self, vectors: list[tuple]) -> None:
+        ids = [v[0] for v in vectors]
+        values = _normalize(np.asarray([v[1] for v in vectors], dtype=np.float32))
+        if self.dim and values.shape[1] != self.dim:
+            raise ValueError(f"Vector dimension {values.shape[1]} does not match namespace dimension {self.dim}")
+
+        new = [vid for vid in dict.fromkeys(ids) if vid not in self.rows]
+        needed = self.size + len(new)
+        if needed > self.matrix.shape[0]:
+            grown = np.empty((max(needed, 2 * self.matrix.shape[0], 1024), values.shape[1]), dtype=np.float32)
+            if self.size:
+                grown[:self.size] = self.vectors()
+            self.matrix = grown
+
+        for vid in new:
+            self.rows[vid] = len(self.ids)
+            self.ids.append(vid)
+            self.metas.append({})
+        for i, (vid, _, *meta) in enumerate(vectors):
+            row = self.rows[vid]
+            self.matrix[row] = values[i]
+            self.metas[row] = meta[0] if meta else {}
+
+        self.dirty = True
+        self.ann_stale = True
+
+    def delete(self, ids: list[str]) -> None:
+        for vid in ids:
+            row = self.rows.pop(vid, None)
+            if row is None:
+                continue
+            last = self.size - 1
+            if row != last:
+                # Move the last row into the hole
+                moved = self.ids[last]
+                self.ids[row] = moved
+                self.metas[row] = self.metas[last]
+                self.matrix[row] = self.matrix[last]
+                self.rows[moved] = row
+            self.ids.pop()
+            self.metas.pop()
+            self.dirty = True
+            self.ann_stale = True
+
+    def search(self, query: np.ndarray, top_k: int, flt: Optional[dict]) -> list[tuple[int, float]]:
+        """(row, cosine score) pairs, best first."""
+        if self.size == 0 or top_k <= 0:
+            return []
+
+        if flt:
+            candidates = np.array([i for i, m in enumerate(self.metas) if matches_filter(m, flt)], dtype=np.int64)
+            if candidates.size == 0:
+                return []
+            return self._top_k(self.matrix[candidates] @ query, top_k, candidates)
+
+        if self.size >= LOCAL_HNSW_MIN_VECTORS and self._ensure_ann():
+            k = min(top_k, self.size)
+            self.ann.set_ef(max(HNSW_EF_SEARCH, 2 * k))
+            labels, distances = self.ann.knn_query(query, k=k)
+            return [(int(r), 1.0 - float(d)) for r, d in zip(labels[0], distances[0])]
+
+        return self._top_k(self.vectors() @ query, top_k)
+
+    @staticmethod
+    def _top_k(scores: np.ndarray, top_k: int, rows: Optional[np.ndarray] = None) -> list[tuple[int, float]]:
+        k = min(top_k, scores.shape[0])
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(int(rows[i] if rows is not None else i), float(scores[i])) for i in best]
+
+    def _ensure_ann(self) -> bool:
+        """Build the HNSW graph if it is missing or out of date; False without hnswlib."""
+        if not self.ann_stale:
+            return self.ann is not None
+        hnswlib = _hnswlib()
+        if hnswlib is None:
+            return False
+        ann = hnswlib.Index(space="cosine", dim=self.dim)
+        ann.init_index(max_elements=self.size, ef_construction=HNSW_EF_CONSTRUCTION, M=HNSW_M)
+        ann.add_items(self.vectors(), np.arange(self.size))
+        self.ann, self.ann_stale = ann, False
+        self.dirty = True   # persist the new graph on the next flush
+        return True
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        with open(self.path / "vectors.tmp", "wb") as f:
+            np.save(f, self.vectors())
+        os.replace(self.path / "vectors.tmp", self.path / "vectors.npy")
+
+        hnsw_count = None
+        if self.ann is not None and not self.ann_stale:
+            self.ann.save_index(str(self.path / "hnsw.bin"))
+            hnsw_count = self.size
+        elif (self.path / "hnsw.bin").exists():
+            os.unlink(self.path / "hnsw.bin")
+
+        with open(self.path / "records.tmp", "w", encoding="utf-8") as f:
+            json.dump({"ids": self.ids, "metadata": self.metas, "hnsw_count": hnsw_count}, f)
+        os.replace(self.path / "records.tmp", self.path / "records.json")
+        self.dirty = False
+
+
+class LocalVectorStore(VectorStore):
+    """
+    In-process vector store with on-disk persistence.
+
+    Args:
+        root: Directory holding one subdirectory per namespace
+    """
+
+    durable_upserts = False
+
+    def __init__(self, root: Path = LOCAL_VECTOR_STORE_DIR):
+        self.root = Path(root)
+        self._namespaces: dict[str, _Namespace] = {}
+        self._lock = threading.RLock()
+        atexit.register(self.flush)
+
+    def _ns(self, namespace: str) -> _Namespace:
+        ns = self._namespaces.get(namespace)
+        if ns is None:
+            ns = self._namespaces[namespace] = _Namespace(self.root / namespace)
+        return ns
+
+    def upsert(self, vectors: list[tuple], namespace: str) -> None:
+        if not vectors:
+            return
+        with self._lock:
+            self._ns(namespace).upsert(vectors)
+
+    def query(
+        self,
+        vector: list[float],
+        top_k: int,
+        namespace: str,
+        filter: Optional[dict] = None,
+        include_metadata: bool = True
+    ) -> dict:
+        query = _normalize(np.asarray(vector, dtype=np.float32))
+        with self._lock:
+            ns = self._ns(namespace)
+            matches = []
+            for row, score in ns.search(query, top_k, filter):
+                match = {"id": ns.ids[row], "score": score}
+                if include_metadata:
+                    match["metadata"] = dict(ns.metas[row])
+                matches.append(match)
+        return {"matches": matches, "namespace": namespace}
+
+    def delete(self, ids: list[str], namespace: str) -> None:
+        with self._lock:
+            self._ns(namespace).delete(ids)
+
+    def list_ids(self, namespace: str) -> Iterable[str]:
+        with self._lock:
+            return list(self._ns(namespace).ids)
+
+    def describe_index_stats(self) -> dict:
+        with self._lock:
+            names = set(self._namespaces)
+            if self.root.exists():
+                names.update(p.name for p in self.root.iterdir() if (p / "records.json").exists())
+            namespaces = {}
+            dimension = 0
+            for name in sorted(names):
+                ns = self._ns(name)
+                if ns.size:
+                    namespaces[name] = {"vector_count": ns.size}
+                    dimension = dimension or ns.dim
+        return {
+            "namespaces": namespaces,
+            "dimension": dimension,
+            "total_vector_count": sum(n["vector_count"] for n in namespaces.values()),
+        }
+
+    def flush(self) -> None:
+        with self._lock:
+            for ns in self._namespaces.values():
+                ns.save()
@@ -0,0 +1,85 @@
+"""
+Pinecone backend for VectorStore.
+
+The client and Index handle are built lazily on the first request, so
+constructing the store (and importing modules that hold one) never touches
+the network or fails for a missing API key until Pinecone is actually used.
+"""
+
+import os
+import threading
+from typing import Iterable, Optional
+
+from src.control_plane.config import PINECONE_INDEX_NAME, PINECONE_POOL_THREADS
+from src.vector_store.base import VectorStore
+
+
+class PineconeVectorStore(VectorStore):
+    """
+    Thin wrapper over a Pinecone Index.
+
+    Args:
+        index_name: Pinecone index to use
+        api_key: Defaults to the PINECONE_API_KEY environment variable
+        pool_threads: Size of the client's request thread/connection pool
+    """
+
+    def __init__(
+        self,
+        index_name: str = PINECONE_INDEX_NAME,
+        api_key: Optional[str] = None,
+        pool_threads: int = PINECONE_POOL_THREADS
+    ):
+        self.index_name = index_name
+        self.pool_threads = pool_threads
+        self._api_key = api_key
+        self._index = None
+        self._lock = threading.Lock()
+
+    @property
+    def index(self):
+        """The Pinecone Index handle (connects on first access)."""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    from pinecone import Pinecone
+
+                    api_key = self._api_key or os.getenv("PINECONE_API_KEY")
+                    if not api_key:
+                        raise ValueError("PINECONE_API_KEY environment variable not set")
+
+                    pc = Pinecone(api_key=api_key, pool_threads=self.pool_threads)
+                    self._index = pc.Index(self.index_name, pool_threads=self.pool_threads)
+        return self._index
+
+    def upsert(self, vectors: list[tuple], namespace: str) -> None:
+        self.index.upsert(vectors=vectors, namespace=namespace)
+
+    def query(
+        self,
+        vector: list[float],
+        top_k: int,
+        namespace: str,
+        filter: Optional[dict] = None,
+        include_metadata: bool = True
+    ) -> dict:
+        params = {
+            "vector": vector,
+            "top_k": top_k,
+            "namespace": namespace,
+            "include_metadata": include_metadata
+        }
+        if filter:
+            params["filter"] = filter
+        return self.index.query(**params)
+
+    def delete(self, ids: list[str], namespace: str) -> None:
+        self.index.delete(ids=ids, namespace=namespace)
+
+    def list_ids(self, namespace: str) -> Iterable[str]:
+        # index.list() pages through IDs (serverless indexes only)
+        for page in self.index.list(namespace=namespace):
+            yield from page
+
+    def describe_index_stats(self) -> dict:
+        return self.index.describe_index_stats()